@@ -0,0 +1,122 @@
+"""
+Size and bandwidth benchmark of the text and binary value codecs.
+
+Catalog-like records are written with Mapper.map_to_db to an in-process
+fakeredis server, once per codec, then read back with
+Mapper.unmap_from_db. Stored bytes count every value, hash field and
+member held by Redis, keys excluded. Needs fakeredis.
+
+    python benchmarks/binary_codec.py [--records 1000] [--threshold 256]
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import django
+import fakeredis
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+# Importing the cache package builds the "default" cache, which is never
+# connected to here.
+settings.configure(CACHES={"default": {
+    "BACKEND": "django_redis.cache.RedisCache",
+    "LOCATION": "redis://127.0.0.1:6379/0"}})
+django.setup()
+
+from py_redis_client import codec  # noqa: E402
+from py_redis_client.cache.mapper import Mapper  # noqa: E402
+from py_redis_client.conversions import Conversions  # noqa: E402
+
+
+def sample_records(count: int) -> dict:
+    start = datetime.datetime(2024, 1, 1, 9, 0, 0)
+    return {"product:{}".format(idx): {
+        "name": "Organic whole wheat flour, {} kg pack".format(idx % 10 + 1),
+        "description": "Stone ground from whole grains, rich in fibre. "
+                       "Store in a cool and dry place. " * 6,
+        "price": 40 + idx % 500,
+        "rating": round(3 + (idx % 20) / 10, 1),
+        "in_stock": idx % 3 != 0,
+        "listed_on": (start + datetime.timedelta(days=idx)).date(),
+        "updated_at": start + datetime.timedelta(minutes=idx),
+        "stock": idx * 13 % 10000,
+        "tags": ["grocery", "staples", "flour", "brand{}".format(idx % 40)],
+    } for idx in range(count)}
+
+
+def stored_bytes(redis_conn) -> int:
+    total = 0
+    for key in redis_conn.scan_iter():
+        kind = redis_conn.type(key)
+        if kind == b"string":
+            total += redis_conn.strlen(key)
+        elif kind == b"hash":
+            total += sum(len(field) + len(value) for field, value in
+                         redis_conn.hgetall(key).items())
+        elif kind == b"list":
+            total += sum(map(len, redis_conn.lrange(key, 0, -1)))
+        elif kind == b"set":
+            total += sum(map(len, redis_conn.smembers(key)))
+    return total
+
+
+def run(label: str, conv, records: dict) -> int:
+    redis_conn = fakeredis.FakeRedis()
+    redis_conn.flushall()
+    started = time.perf_counter()
+    for key, value in records.items():
+        Mapper.map_to_db(redis_conn, {key: value}, conv=conv)
+    written = time.perf_counter() - started
+    size = stored_bytes(redis_conn)
+    started = time.perf_counter()
+    found = {}
+    for keys in Mapper.chunks(records, 100):
+        found.update(Mapper.unmap_from_db(redis_conn, *keys))
+    read = time.perf_counter() - started
+    assert found == records
+    print("  {:<8} {:>9,} B stored  write {:>6,.0f} rec/s  "
+          "read {:>6,.0f} rec/s".format(
+              label, size, len(records) / written, len(records) / read))
+    return size
+
+
+def value_sizes() -> None:
+    binary = codec.binary_encoder()
+    samples = {
+        "int": 1234567,
+        "float": 3.75,
+        "bool": True,
+        "date": datetime.date(2024, 5, 17),
+        "time": datetime.time(10, 30, 15),
+        "datetime": datetime.datetime(2024, 5, 17, 10, 30, 15),
+        "str": "flour",
+    }
+    print("single values, bytes text -> binary")
+    for name, value in samples.items():
+        print("  {:<8} {:>3} -> {:>3}".format(
+            name, len(codec.encode(value).encode("utf-8")),
+            len(binary(value))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--threshold", type=int, default=256)
+    args = parser.parse_args()
+
+    value_sizes()
+    records = sample_records(args.records)
+    print("{} records".format(len(records)))
+    text = run("text", None, records)
+    binary = run("binary", Conversions.from_options({
+        "CODEC": "binary", "COMPRESS_THRESHOLD": args.threshold}), records)
+    print("  binary stores {:.0%} less".format(1 - binary / text))
+
+
+if __name__ == "__main__":
+    main()
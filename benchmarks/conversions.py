@@ -0,0 +1,134 @@
+"""
+Microbenchmark of value conversions: the getattr dispatch Conversions used
+before the codec tables, against Conversions as it is now.
+
+Both sides run on the same mixed values and their outputs are checked equal
+before timing.
+
+    python benchmarks/conversions.py [--count 20000] [--repeat 5]
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from py_redis_client.constants import CONVERT, UNCONVERT  # noqa: E402
+from py_redis_client.conversions import Conversions  # noqa: E402
+
+
+class LegacyConversions:
+    """
+    Conversions before the codec tables, method found by name per value.
+    """
+    types_allowed = [
+        "str", "int", "bool", "float",
+        "datetime", "date", "time"]
+
+    def __init__(self, conv: str, decode: bool = True) -> None:
+        self.kl_typ = conv
+        self.decode = decode
+
+    def __direct_convert(self, klass, value):
+        return (klass.__name__ + str(value) if
+                self.kl_typ == CONVERT else klass(value[
+                    len(klass.__name__):]))
+
+    def __str(self, value):
+        return self.__direct_convert(str, value)
+
+    def __int(self, value):
+        return self.__direct_convert(int, value)
+
+    def __float(self, value):
+        return self.__direct_convert(float, value)
+
+    def __bool(self, value):
+        return ("bool" + str(value) if self.kl_typ == CONVERT
+                else True if value[4:] == "True" else False)
+
+    def __datetime(self, value):
+        return ("datetime" + value.isoformat() if
+                self.kl_typ == CONVERT else
+                datetime.datetime.fromisoformat(value[8:]))
+
+    def __date(self, value):
+        return ("date" + value.strftime("%Y-%m-%d") if
+                self.kl_typ == CONVERT else datetime.datetime.strptime(
+                    value[4:], "%Y-%m-%d").date())
+
+    def __time(self, value):
+        return ("time" + value.strftime("%H:%M:%S") if
+                self.kl_typ == CONVERT else datetime.datetime.strptime(
+                    value[4:], "%H:%M:%S").time())
+
+    def final_value(self, value):
+        method_name = "_{}__".format(self.__class__.__name__)
+        if self.kl_typ == CONVERT:
+            method_name += type(value).__name__
+        else:
+            if self.decode:
+                value = value.decode("utf-8")
+            for k in self.types_allowed:
+                if value.startswith(k):
+                    method_name += k
+                    break
+        return getattr(self, method_name)(value)
+
+
+def sample_values(count: int) -> list:
+    now = datetime.datetime(2024, 5, 17, 10, 30, 15)
+    makers = (
+        lambda i: "product-{}".format(i),
+        lambda i: i * 37,
+        lambda i: i / 7,
+        lambda i: i % 2 == 0,
+        lambda i: now + datetime.timedelta(minutes=i),
+        lambda i: now.date() + datetime.timedelta(days=i % 1000),
+        lambda i: datetime.time(i % 24, i % 60, i % 60),
+    )
+    return [makers[i % len(makers)](i) for i in range(count)]
+
+
+def run(label: str, convert, values: list, repeat: int) -> float:
+    best = min(timeit.repeat(
+        lambda: [convert(value) for value in values],
+        number=1, repeat=repeat))
+    rate = len(values) / best
+    print("  {:<8} {:>10,.0f} values/s".format(label, rate))
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    values = sample_values(args.count)
+    legacy_encode = LegacyConversions(CONVERT).final_value
+    legacy_decode = LegacyConversions(UNCONVERT).final_value
+    encode = Conversions(CONVERT).final_value
+    decode = Conversions(UNCONVERT).final_value
+
+    encoded = [encode(value).encode("utf-8") for value in values]
+    assert encoded == [legacy_encode(value).encode("utf-8")
+                       for value in values]
+    assert [decode(value) for value in encoded] == [
+        legacy_decode(value) for value in encoded] == values
+
+    print("encode, {} values".format(len(values)))
+    before = run("before", legacy_encode, values, args.repeat)
+    after = run("after", encode, values, args.repeat)
+    print("  speedup  {:.1f}x".format(after / before))
+    print("decode, {} values".format(len(values)))
+    before = run("before", legacy_decode, encoded, args.repeat)
+    after = run("after", decode, encoded, args.repeat)
+    print("  speedup  {:.1f}x".format(after / before))
+
+
+if __name__ == "__main__":
+    main()
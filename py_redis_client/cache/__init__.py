@@ -1,6 +1,10 @@
 from django.conf import settings
 
 from py_redis_client.cache.cache import Cache
+from py_redis_client.cache.async_cache import AsyncCache
+from py_redis_client.cache.lock import Lock
+from py_redis_client.cache.namespace import Namespace
+from py_redis_client.cache.sharded import ShardedCache, HashRing
 
 
 # Dictionary-like object for multiple Cache instances
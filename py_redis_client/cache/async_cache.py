@@ -0,0 +1,274 @@
+import datetime
+from redis import asyncio as redis_asyncio
+from typing import Union, Any, AsyncIterator, Iterable
+
+from django.conf import settings
+
+from py_redis_client.cache.async_mapper import AsyncMapper
+from py_redis_client.cache.layout import PackLayout
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.constants import (
+    CacheDataType, PIPELINE_ENGINE, SCRIPT_ENGINE, DEFAULT_CHUNK_SIZE)
+from py_redis_client.conversions import Conversions
+from py_redis_client.db.base import _RedisDB
+from py_redis_client.exceptions import InvalidFormatError
+
+
+class AsyncCache:
+    """
+    An asyncio counterpart of Cache, running on redis.asyncio.
+
+    The values are encoded exactly as Cache encodes them, so both classes can
+    read and write the same keys. All the operations of a call are sent in a
+    single async pipeline, and every coroutine shares one connection pool.
+
+    Attributes:
+        redis_conn (redis.asyncio.Redis): Async Redis client instance for
+            interacting with the cache.
+        read_engine (str): Engine used to resolve reads, see Cache.
+        chunk_size (int): Most keys sent in one pipeline, see Cache.
+        value_conv (Conversions | None): Conversion values are written with,
+            see Cache.
+        layout (PackLayout | None): Layout small values are packed with, see
+            Cache.
+
+    Usage:
+        Initialize the AsyncCache class with a valid Django cache name:
+
+            cache = AsyncCache("default")
+
+        Perform operations such as:
+
+            await cache.set("key", "value", timeout=3600)
+            value = await cache.get("key")
+            await cache.delete("key")
+
+    Note:
+        The connection is created from the "LOCATION" of the cache, with the
+        "CONNECTION_POOL_KWARGS" option passed to the connection pool.
+    """
+
+    def __init__(self, cache_name: str = "default",
+                 redis_conn: redis_asyncio.Redis = None,
+                 read_engine: str = None) -> None:
+        """
+        Initializes the AsyncCache instance with the specified Django cache name.
+
+        Args:
+            cache_name (str): The name of the cache defined in Django settings.
+            redis_conn (redis.asyncio.Redis, optional): Client to use instead of
+                one created from the cache location. Defaults to None.
+            read_engine (str, optional): Engine used to resolve reads, either
+                "pipeline" or "script". Defaults to the "READ_ENGINE" option
+                of the cache, or "pipeline" if not set.
+
+        Raises:
+            InvalidFormatError: If the cache name is not defined in settings, has
+            no location, or the given client is not a redis.asyncio client.
+        """
+        if cache_name not in settings.CACHES:
+            raise InvalidFormatError(
+                f"Cache '{cache_name}' is not defined in the Django settings."
+            )
+
+        config = settings.CACHES[cache_name]
+        options = config.get("OPTIONS", {})
+        if redis_conn is None:
+            location = config.get("LOCATION")
+            if isinstance(location, (list, tuple)):
+                location = location[0] if location else None
+            if not location:
+                raise InvalidFormatError(
+                    f"Cache '{cache_name}' has no location configured."
+                )
+            redis_conn = redis_asyncio.from_url(
+                location, **options.get("CONNECTION_POOL_KWARGS", {}))
+        if not isinstance(redis_conn, redis_asyncio.Redis):
+            raise InvalidFormatError(
+                f"Cache '{cache_name}' is not configured with an async "
+                f"Redis client."
+            )
+        self.redis_conn = redis_conn
+        self.read_engine = read_engine or options.get(
+            "READ_ENGINE", PIPELINE_ENGINE)
+        if self.read_engine not in (PIPELINE_ENGINE, SCRIPT_ENGINE):
+            raise InvalidFormatError(
+                f"Invalid read engine '{self.read_engine}' for cache "
+                f"'{cache_name}'."
+            )
+        self.chunk_size = options.get("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+        Mapper.validate_chunk_size(self.chunk_size)
+        self.value_conv = Conversions.from_options(options)
+        self.layout = PackLayout.from_options(options.get("PACK"))
+
+    async def delete(self, *keys: str) -> bool:
+        """
+        Deletes the specified keys from the cache.
+
+        Args:
+            *keys (str): Keys to be deleted from the cache.
+
+        Returns:
+            bool: True if the operation is successful.
+        """
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            await AsyncMapper.delete_from_db(self.redis_conn, *chunk)
+        return True
+
+    async def exists(self, *keys: str) -> bool:
+        """
+        Checks if all specified keys exist in the cache.
+
+        Args:
+            *keys (str): Keys to be checked in the cache.
+
+        Returns:
+            bool: True if all keys exist, False otherwise.
+        """
+        res = 0
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            res += await AsyncMapper.count_in_db(self.redis_conn, *chunk)
+        return True if res == len(keys) else False
+
+    async def expire(self, expiry: int, *keys: str) -> bool:
+        """
+        Sets an expiration time for the specified keys.
+
+        Args:
+            expiry (int): Expiration time in seconds.
+            *keys (str): Keys to set the expiration for.
+
+        Returns:
+            bool: True if all keys were found.
+
+        Raises:
+            InvalidFormatError: If the expiry is not an integer.
+        """
+        if not isinstance(expiry, int):
+            raise InvalidFormatError(
+                f"Cache expire format wrong. Expected int, got {type(expiry)}."
+            )
+        expiry = datetime.timedelta(seconds=expiry)
+        res = 0
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            res += await AsyncMapper.expire_in_db(
+                self.redis_conn, expiry, *chunk)
+        return res == len(keys)
+
+    async def flush(self) -> bool:
+        """
+        Clears all data from the cache.
+
+        Returns:
+            bool: True if the operation is successful.
+        """
+        return await _RedisDB(self.redis_conn).flush()
+
+    async def __set(self, data: dict[str, Any], timeout: int = None, separator: str = "") -> None:
+        """
+        Internal method to set data in the cache.
+
+        Args:
+            data (dict): Data to store in the cache.
+            timeout (int, optional): Expiration time in seconds. Defaults to None.
+            separator (str, optional): Separator for nested keys. Defaults to "".
+
+        Raises:
+            InvalidFormatError: If timeout is not an integer.
+        """
+        if timeout is not None and not isinstance(timeout, int):
+            raise InvalidFormatError(
+                f"Cache set expiry wrong. Expected int, got {type(timeout)}."
+            )
+        timeout = datetime.timedelta(seconds=timeout) if timeout else None
+        separator = str(separator) if separator else None
+        for keys in Mapper.chunks(data, self.chunk_size):
+            await AsyncMapper.map_to_db(
+                self.redis_conn, {key: data[key] for key in keys}, timeout,
+                separator, self.value_conv, self.layout)
+
+    async def set(self, key: str, value: CacheDataType, timeout: int = None, separator: str = "") -> None:
+        """
+        Stores a single key-value pair in the cache.
+
+        Args:
+            key (str): The key to store.
+            value (CacheDataType): The value to store.
+            timeout (int, optional): Expiration time in seconds. Defaults to None.
+            separator (str, optional): Separator for nested keys. Defaults to "".
+
+        Note:
+            Will not set any value if it is None.
+        """
+        await self.__set({key: value}, timeout, separator)
+
+    async def set_many(self, data: dict[str, CacheDataType], timeout: int = None, separator: str = "") -> None:
+        """
+        Stores multiple key-value pairs in the cache.
+
+        Args:
+            data (dict): Dictionary of key-value pairs to store.
+            timeout (int, optional): Expiration time in seconds. Defaults to None.
+            separator (str, optional): Separator for nested keys. Defaults to "".
+
+        Raises:
+            InvalidFormatError: If data is not a dictionary.
+
+        Note:
+            None values are skipped. Empty dicts, lists and sets are stored
+            packed in a single key.
+        """
+        if not isinstance(data, dict):
+            raise InvalidFormatError(
+                f"Cache set format wrong. Expected dict, got {type(data)}."
+            )
+        await self.__set(data, timeout, separator)
+
+    async def get(self, key: str) -> Union[CacheDataType, None]:
+        """
+        Retrieves a value for a given key from the cache.
+
+        Args:
+            key (str): The key to retrieve.
+
+        Returns:
+            CacheDataType | None: The value associated with the key, or None if not found.
+        """
+        return (await AsyncMapper.unmap_from_db(
+            self.redis_conn, key, read_engine=self.read_engine)).get(key)
+
+    async def get_many(self, *keys: str) -> dict[str, CacheDataType]:
+        """
+        Retrieves values for multiple keys from the cache.
+
+        Args:
+            *keys (str): Keys to retrieve.
+
+        Returns:
+            dict: A dictionary with keys and their corresponding values.
+        """
+        res = {}
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            res.update(await AsyncMapper.unmap_from_db(
+                self.redis_conn, *chunk, read_engine=self.read_engine))
+        return res
+
+    async def iter_many(self, keys: Iterable[str], chunk_size: int = None
+                        ) -> AsyncIterator[tuple[str, CacheDataType]]:
+        """
+        Retrieves values for many keys, chunk by chunk, see Cache.iter_many.
+
+        Usage:
+
+            async for key, value in cache.iter_many(keys):
+                ...
+        """
+        if chunk_size is None:
+            chunk_size = self.chunk_size
+        Mapper.validate_chunk_size(chunk_size)
+        for chunk in Mapper.chunks(keys, chunk_size):
+            found = await AsyncMapper.unmap_from_db(
+                self.redis_conn, *chunk, read_engine=self.read_engine)
+            for key in chunk:
+                if key in found:
+                    yield key, found[key]
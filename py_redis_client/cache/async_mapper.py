@@ -0,0 +1,94 @@
+from redis.asyncio import client as asyncio_client
+from typing import Union
+
+from py_redis_client.cache.layout import PackLayout
+from py_redis_client.cache.mapper import (
+    DBExecutions, Mapper, FAMILY_DELETE, FAMILY_EXPIRE, FAMILY_EXISTS)
+from py_redis_client.constants import (
+    ExpiryType, CacheDataType, PIPELINE_ENGINE, SCRIPT_ENGINE)
+from py_redis_client.conversions import Conversions
+from py_redis_client.db import RedisNative
+from py_redis_client.scripts import RESOLVE_GET, KEY_FAMILY
+
+
+class AsyncDBExecutions(DBExecutions):
+    async def set_in_db(
+            self, data: dict,
+            expiry: ExpiryType = None,
+            conv: Conversions = None,
+            layout: PackLayout = None) -> None:
+        self.queue_set(data, expiry, conv=conv, layout=layout)
+        await self.batch.execute_async(self.redis)
+
+    async def get_from_db(self, *keys):
+        get_address = self.address_keys(*keys)
+        address_map = RedisNative(self.redis).format_get_many(
+            get_address, await self.redis.mget(get_address))
+        hm_iterables, native_keys = self.queue_get(
+            address_map, *keys)
+        result = await self.batch.execute_async(self.redis)
+        return self.format_values(
+            self.group_results(result), address_map,
+            hm_iterables, native_keys)
+
+    async def get_from_db_script(self, *keys):
+        if not keys:
+            return {}
+        response = await RESOLVE_GET(
+            self.redis, keys=list(keys), args=self.script_args())
+        return self.format_script_response(keys, response)
+
+
+class AsyncMapper:
+    @staticmethod
+    async def map_to_db(
+        redis_conn: asyncio_client.Redis,
+        data: dict, expiry: ExpiryType = None,
+        separator: Union[str, None] = None,
+        conv: Conversions = None,
+        layout: PackLayout = None) -> None:
+        await AsyncDBExecutions(redis_conn).set_in_db(
+            Mapper.format_to_db(data, separator), expiry, conv, layout)
+
+    @staticmethod
+    async def unmap_from_db(
+        redis_conn: asyncio_client.Redis,
+        *keys, read_engine: str = PIPELINE_ENGINE
+        ) -> dict[str: CacheDataType]:
+        Mapper.validate_keys(*keys)
+        Mapper.validate_read_engine(read_engine)
+        if read_engine == SCRIPT_ENGINE:
+            result = await AsyncDBExecutions(
+                redis_conn).get_from_db_script(*keys)
+        else:
+            result = await AsyncDBExecutions(
+                redis_conn).get_from_db(*keys)
+        return Mapper.format_from_db(result)
+
+    @staticmethod
+    async def delete_from_db(
+        redis_conn: asyncio_client.Redis, *keys: str) -> int:
+        Mapper.validate_keys(*keys)
+        if not keys:
+            return 0
+        return await KEY_FAMILY(redis_conn, keys=list(keys),
+                                args=DBExecutions.family_args(FAMILY_DELETE))
+
+    @staticmethod
+    async def expire_in_db(
+        redis_conn: asyncio_client.Redis, expiry: ExpiryType,
+            *keys: str) -> int:
+        Mapper.validate_keys(*keys)
+        if not keys:
+            return 0
+        return await KEY_FAMILY(redis_conn, keys=list(keys), args=(
+            DBExecutions.family_args(FAMILY_EXPIRE, expiry)))
+
+    @staticmethod
+    async def count_in_db(
+        redis_conn: asyncio_client.Redis, *keys: str) -> int:
+        Mapper.validate_keys(*keys)
+        if not keys:
+            return 0
+        return await KEY_FAMILY(redis_conn, keys=list(keys),
+                                args=DBExecutions.family_args(FAMILY_EXISTS))
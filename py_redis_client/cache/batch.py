@@ -0,0 +1,222 @@
+import datetime
+import redis
+from typing import Union, Any, Callable, Iterable, List
+
+from py_redis_client.cache.layout import PackLayout
+from py_redis_client.cache.mapper import (
+    DBExecutions, Mapper, FAMILY_DELETE, FAMILY_EXPIRE, FAMILY_EXISTS)
+from py_redis_client.constants import CacheDataType
+from py_redis_client.conversions import Conversions
+from py_redis_client.exceptions import InvalidFormatError
+from py_redis_client.scripts import RESOLVE_GET
+
+
+_PENDING = object()
+
+
+class BatchResult:
+    """
+    Lazily resolved result of an operation queued on a CacheBatch.
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(self) -> None:
+        self._value = _PENDING
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not _PENDING
+
+    @property
+    def value(self) -> Any:
+        if self._value is _PENDING:
+            raise InvalidFormatError(
+                "Batch result read before the batch was executed."
+            )
+        return self._value
+
+
+class _QueuedOperation:
+    __slots__ = ("queue", "finish", "result", "start", "end")
+
+    def __init__(self, queue: Callable, finish: Callable) -> None:
+        self.queue = queue
+        self.finish = finish
+        self.result = BatchResult()
+        self.start = self.end = 0
+
+
+class CacheBatch:
+    """
+    Mixed cache operations sent to Redis in a single pipeline.
+
+    Operations are encoded with the Mapper exactly as the Cache methods
+    encode them and run in the order they were queued. Reads are resolved
+    server-side with the Lua read script, so the whole batch costs one round
+    trip. With transaction set, the pipeline is wrapped in MULTI/EXEC.
+
+    Usage:
+
+        with cache.batch() as b:
+            b.set("cart", items, timeout=600)
+            user = b.get("user")
+            b.expire(600, "session")
+        user.value
+    """
+
+    def __init__(self, redis_conn: redis.Redis,
+                 invalidate: Callable[..., None] = None,
+                 transaction: bool = False,
+                 value_conv: Conversions = None,
+                 layout: PackLayout = None,
+                 redis_key: Callable[[str], str] = None) -> None:
+        self.redis_conn = redis_conn
+        self.transaction = transaction
+        self.value_conv = value_conv
+        self.layout = layout
+        self.__invalidate = invalidate
+        self.__redis_key = redis_key or (lambda key: key)
+        self.__operations: List[_QueuedOperation] = []
+        self.__written: List[tuple] = []
+        self.executed = False
+
+    def __add(self, queue: Callable, finish: Callable) -> BatchResult:
+        if self.executed:
+            raise InvalidFormatError(
+                "Operation queued on an already executed batch."
+            )
+        operation = _QueuedOperation(queue, finish)
+        self.__operations.append(operation)
+        return operation.result
+
+    @staticmethod
+    def __validate_timeout(timeout: Union[int, None]) -> None:
+        if timeout is not None and not isinstance(timeout, int):
+            raise InvalidFormatError(
+                f"Cache set expiry wrong. Expected int, got {type(timeout)}."
+            )
+
+    def set_many(self, data: dict[str, CacheDataType], timeout: int = None,
+                 separator: str = "",
+                 tags: Iterable[str] = None) -> BatchResult:
+        if not isinstance(data, dict):
+            raise InvalidFormatError(
+                f"Cache set format wrong. Expected dict, got {type(data)}."
+            )
+        self.__validate_timeout(timeout)
+        if isinstance(tags, str):
+            raise InvalidFormatError(
+                "Cache set tags wrong. Expected iterable of str, got str."
+            )
+        tags = list(tags) if tags else None
+        if tags:
+            Mapper.validate_keys(*tags)
+        expiry = datetime.timedelta(seconds=timeout) if timeout else None
+        to_map = Mapper.format_to_db(
+            {self.__redis_key(k): v for k, v in data.items()},
+            str(separator) if separator else None)
+        executions = DBExecutions(self.redis_conn)
+        executions.queue_set(
+            to_map, expiry, multi=False, conv=self.value_conv,
+            layout=self.layout, tags=tags)
+        self.__written.append((list(data.keys()), timeout))
+        return self.__add(
+            lambda pipe: executions.batch.queue_on(pipe),
+            lambda results: None)
+
+    def set(self, key: str, value: CacheDataType, timeout: int = None,
+            separator: str = "", tags: Iterable[str] = None) -> BatchResult:
+        return self.set_many({key: value}, timeout, separator, tags)
+
+    def __queue_get(self, *keys: str) -> tuple:
+        Mapper.validate_keys(*keys)
+        redis_keys = {self.__redis_key(key): key for key in keys}
+        executions = DBExecutions(self.redis_conn)
+        groups = executions.slot_groups(redis_keys)
+
+        def queue(pipe):
+            for group in groups:
+                RESOLVE_GET.eval_on(
+                    pipe, keys=group, args=DBExecutions.script_args())
+
+        def finish(results):
+            res = Mapper.format_from_db(executions.format_script_response(
+                [key for group in groups for key in group],
+                [value for response in results for value in response]))
+            return {redis_keys[k]: v for k, v in res.items()}
+        return queue, finish
+
+    def get_many(self, *keys: str) -> BatchResult:
+        if not keys:
+            return self.__add(lambda pipe: None, lambda results: {})
+        return self.__add(*self.__queue_get(*keys))
+
+    def get(self, key: str) -> BatchResult:
+        queue, finish = self.__queue_get(key)
+        return self.__add(queue, lambda results: finish(results).get(key))
+
+    def delete(self, *keys: str) -> BatchResult:
+        self.__written.append((list(keys), None))
+        redis_keys = [self.__redis_key(key) for key in keys]
+        return self.__add(
+            lambda pipe: DBExecutions(pipe).queue_family(
+                FAMILY_DELETE, *redis_keys),
+            lambda results: True)
+
+    def exists(self, *keys: str) -> BatchResult:
+        redis_keys = [self.__redis_key(key) for key in keys]
+        return self.__add(
+            lambda pipe: DBExecutions(pipe).queue_family(
+                FAMILY_EXISTS, *redis_keys),
+            lambda results: sum(results) == len(keys))
+
+    def expire(self, expiry: int, *keys: str) -> BatchResult:
+        if not isinstance(expiry, int):
+            raise InvalidFormatError(
+                f"Cache expire format wrong. Expected int, got {type(expiry)}."
+            )
+        self.__written.append((list(keys), expiry))
+        redis_keys = [self.__redis_key(key) for key in keys]
+        return self.__add(
+            lambda pipe: DBExecutions(pipe).queue_family(
+                FAMILY_EXPIRE, *redis_keys,
+                expiry=datetime.timedelta(seconds=expiry)),
+            lambda results: sum(results) == len(keys))
+
+    def execute(self) -> List[Any]:
+        """
+        Sends every queued operation in one pipeline.
+
+        Returns:
+            list: The result of each operation, in the order queued.
+        """
+        if self.executed:
+            raise InvalidFormatError("Batch already executed.")
+        self.executed = True
+        try:
+            with self.redis_conn.pipeline(
+                    transaction=self.transaction) as pipe:
+                for operation in self.__operations:
+                    operation.start = len(pipe)
+                    operation.queue(pipe)
+                    operation.end = len(pipe)
+                results = pipe.execute() if len(pipe) else []
+        finally:
+            # Writes queued before a failing command may have been applied,
+            # so their keys are invalidated even if the pipeline raised.
+            if self.__invalidate is not None:
+                for keys, timeout in self.__written:
+                    self.__invalidate(*keys, timeout=timeout)
+        for operation in self.__operations:
+            operation.result._value = operation.finish(
+                results[operation.start:operation.end])
+        return [operation.result.value
+                for operation in self.__operations]
+
+    def __enter__(self) -> "CacheBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None and not self.executed:
+            self.execute()
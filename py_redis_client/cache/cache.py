@@ -1,14 +1,39 @@
 import datetime
+import math
+import random
+import time
+import uuid
 import redis
-from typing import Union, Any
+from redis.cluster import RedisCluster
+from contextlib import contextmanager
+from typing import Union, Any, Callable, Iterable, Iterator, Sequence
 
 from django.core.cache import caches
 from django.conf import settings
 
+from py_redis_client.cache.batch import CacheBatch
+from py_redis_client.cache.flight import SingleFlight
+from py_redis_client.cache.layout import PackLayout
+from py_redis_client.cache.loader import (
+    Deferred, RequestLoader, batching_scope, current_loader)
+from py_redis_client.cache.local import LocalCache
+from py_redis_client.cache.lock import Lock
 from py_redis_client.cache.mapper import Mapper
-from py_redis_client.constants import CacheDataType
+from py_redis_client.cache.members import Members
+from py_redis_client.cache.memoize import Memoized, MEMOIZE_PREFIX
+from py_redis_client.cache.mutation import (
+    Mutation, LIST_PUSH, SET_ADD, SET_REMOVE, FIELD_DELETE)
+from py_redis_client.cache.namespace import Namespace
+from py_redis_client.cache.replicas import ReplicaRouter
+from py_redis_client.cache.tracking import InvalidationListener
+from py_redis_client.constants import (
+    CacheDataType, PIPELINE_ENGINE, SCRIPT_ENGINE,
+    LIST_SEP, SET_SEP, LEASE, DELTA, LOCK, DEFAULT_CHUNK_SIZE)
+from py_redis_client.conversions import Conversions
+from py_redis_client.db import RedisNative
 from py_redis_client.db.base import _RedisDB
 from py_redis_client.exceptions import InvalidFormatError
+from py_redis_client.scripts import RELEASE_LEASE
 
 
 class Cache:
@@ -21,6 +46,40 @@ class Cache:
 
     Attributes:
         redis_conn (redis.Redis): Redis client instance for interacting with the cache.
+        read_engine (str): Engine used to resolve reads. "pipeline" fetches the
+            address keys and the values in two round trips, "script" resolves
+            both server-side with a Lua script in a single round trip.
+        local_cache (LocalCache | None): In-process cache of decoded values
+            served before Redis, configured by the "LOCAL_CACHE" option.
+        tracking (InvalidationListener | None): Listener invalidating the local
+            cache on Redis CLIENT TRACKING notifications, enabled by the
+            "TRACKING" ("default" or "bcast") and "TRACKING_PREFIXES" keys of
+            the "LOCAL_CACHE" option.
+        chunk_size (int): Most keys sent in one pipeline by set_many,
+            get_many and iter_many, configured by the "CHUNK_SIZE" option.
+            Defaults to 1000.
+        value_conv (Conversions | None): Conversion values are written with,
+            configured by the "CODEC" ("text" or "binary"),
+            "COMPRESS_THRESHOLD" and "COMPRESS_LEVEL" options. None writes
+            the default text format. Both formats are always readable.
+        layout (PackLayout | None): Layout packing small lists, sets and
+            dicts into a single key, configured by the "MAX_ELEMENTS" and
+            "MAX_BYTES" keys of the "PACK" option. None stores every value
+            in the native layout.
+        cluster (bool): Whether the cache runs on Redis Cluster, enabled by the
+            "CLUSTER" option or a cluster client. Keys are then stored hash
+            tagged, as "{key}", so all the Redis keys of a value share its
+            slot, and multi-key commands are sent once per slot in a pipeline
+            reaching every node at once.
+        replicas (ReplicaRouter | None): Router sending get, get_many,
+            iter_many, exists and the range, length, member and path reads to
+            replicas, configured by the "REPLICAS" option with the
+            "LOCATIONS", "SELECTION" ("round_robin" or "least_latency"),
+            "MAX_STALENESS", "CHECK_INTERVAL" and "CONNECTION_POOL_KWARGS"
+            keys. None reads from the primary.
+        maintenance_rate (float | None): Most Redis keys a second removed by
+            delete_pattern, flush(async_=True) and Namespace.reap,
+            configured by the "MAINTENANCE_RATE" option. None for no limit.
 
     Usage:
         Initialize the Cache class with a valid Django cache name:
@@ -37,65 +96,213 @@ class Cache:
         Ensure the cache is configured in Django settings with a Redis backend.
     """
 
-    def __init__(self, cache_name: str = "default") -> None:
+    def __init__(self, cache_name: str = "default",
+                 read_engine: str = None) -> None:
         """
         Initializes the Cache instance with the specified Django cache name.
 
         Args:
             cache_name (str): The name of the cache defined in Django settings.
+            read_engine (str, optional): Engine used to resolve reads, either
+                "pipeline" or "script". Defaults to the "READ_ENGINE" option
+                of the cache, or "pipeline" if not set.
 
         Raises:
             InvalidFormatError: If the cache name is not defined in settings or
             is not configured with a Redis backend.
+
+        Note:
+            With the "CLUSTER" option set, a RedisCluster client is created
+            from the "LOCATION" of the cache, with the
+            "CONNECTION_POOL_KWARGS" option passed to it.
         """
         if cache_name not in settings.CACHES:
             raise InvalidFormatError(
                 f"Cache '{cache_name}' is not defined in the Django settings."
             )
 
-        cache = caches[cache_name]
-        if not isinstance(cache.client.get_client(), redis.Redis):
+        config = settings.CACHES[cache_name]
+        options = config.get("OPTIONS", {})
+        if options.get("CLUSTER"):
+            location = config.get("LOCATION")
+            if isinstance(location, (list, tuple)):
+                location = location[0] if location else None
+            if not location:
+                raise InvalidFormatError(
+                    f"Cache '{cache_name}' has no location configured."
+                )
+            self.redis_conn = RedisCluster.from_url(
+                location, **options.get("CONNECTION_POOL_KWARGS", {}))
+        else:
+            self.redis_conn = caches[cache_name].client.get_client()
+            if not isinstance(self.redis_conn, (redis.Redis, RedisCluster)):
+                raise InvalidFormatError(
+                    f"Cache '{cache_name}' is not configured with a Redis "
+                    f"backend."
+                )
+        self.cluster = isinstance(self.redis_conn, RedisCluster)
+        self.read_engine = read_engine or options.get(
+            "READ_ENGINE", PIPELINE_ENGINE)
+        if self.read_engine not in (PIPELINE_ENGINE, SCRIPT_ENGINE):
+            raise InvalidFormatError(
+                f"Invalid read engine '{self.read_engine}' for cache "
+                f"'{cache_name}'."
+            )
+        self.chunk_size = options.get("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+        Mapper.validate_chunk_size(self.chunk_size)
+        self.maintenance_rate = options.get("MAINTENANCE_RATE")
+        Mapper.validate_rate(self.maintenance_rate)
+        self.value_conv = Conversions.from_options(options)
+        self.layout = PackLayout.from_options(options.get("PACK"))
+        local_options = options.get("LOCAL_CACHE") or {}
+        self.local_cache = LocalCache.from_options(local_options)
+        self.tracking = None
+        if self.local_cache is not None and local_options.get("TRACKING"):
+            if self.cluster:
+                raise InvalidFormatError(
+                    f"Cache '{cache_name}' cannot track keys on Redis Cluster."
+                )
+            self.tracking = InvalidationListener(
+                self.redis_conn, self.local_cache,
+                local_options["TRACKING"],
+                local_options.get("TRACKING_PREFIXES"))
+        self.replicas = ReplicaRouter.from_options(
+            self.redis_conn, options.get("REPLICAS"))
+        if self.replicas is not None and self.cluster:
             raise InvalidFormatError(
-                f"Cache '{cache_name}' is not configured with a Redis backend."
+                f"Cache '{cache_name}' cannot route reads to replicas on Redis "
+                f"Cluster, use the read_from_replicas client option instead."
             )
-        self.redis_conn = cache.client.get_client()
+        self.__flight = SingleFlight()
+
+    def __redis_key(self, key: str) -> str:
+        """
+        Internal method returning the Redis key a cache key is stored under.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The key, hash tagged on Redis Cluster.
+        """
+        return Mapper.hash_tag(key) if self.cluster else key
+
+    def __cache_key(self, redis_key: str) -> str:
+        """
+        Internal method returning the cache key stored under a Redis key.
+
+        Args:
+            redis_key (str): The Redis key, as returned by __redis_key.
+
+        Returns:
+            str: The key, without its hash tag on Redis Cluster.
+        """
+        return redis_key[1:-1] if self.cluster else redis_key
+
+    def __route(self, read: Callable[[redis.Redis], Any]) -> Any:
+        """
+        Internal method running a read on a replica, if configured.
+
+        Args:
+            read (Callable): Function reading with the client it is given.
+
+        Returns:
+            Any: The result of the read.
+        """
+        if self.replicas is None:
+            return read(self.redis_conn)
+        return self.replicas.read(read)
+
+    def __read(self, *keys: str, redis_conn: redis.Redis = None) -> dict[
+            str, CacheDataType]:
+        """
+        Internal method reading keys from Redis with the read engine.
+
+        Args:
+            *keys (str): Keys to retrieve.
+            redis_conn (redis.Redis, optional): Connection to read with.
+                Defaults to None, for a replica or the primary.
+
+        Returns:
+            dict: A dictionary with the found keys and their values.
+        """
+        if redis_conn is None:
+            return self.__route(
+                lambda conn: self.__read(*keys, redis_conn=conn))
+        if not self.cluster:
+            return Mapper.unmap_from_db(
+                redis_conn, *keys, read_engine=self.read_engine)
+        redis_keys = {self.__redis_key(key): key for key in keys}
+        return {redis_keys[k]: v for k, v in Mapper.unmap_from_db(
+            redis_conn, *redis_keys, read_engine=self.read_engine).items()}
+
+    def __invalidate(self, *keys: str, timeout: int = None) -> None:
+        """
+        Internal method dropping the in-process copies of written keys.
+
+        Args:
+            *keys (str): Keys written or deleted.
+            timeout (int, optional): Expiration time in seconds the keys were
+                written with. Defaults to None.
+        """
+        if self.local_cache is not None:
+            self.local_cache.invalidate(*keys, timeout=timeout)
+        loader = current_loader(self)
+        if loader is not None:
+            loader.forget(*keys)
 
     def delete(self, *keys: str) -> bool:
         """
         Deletes the specified keys from the cache.
 
+        Every Redis key of a value is removed with UNLINK, including the
+        metadata and the sub-keys of nested lists and sets, in one script
+        call per chunk of keys.
+
         Args:
             *keys (str): Keys to be deleted from the cache.
 
         Returns:
             bool: True if the operation is successful.
         """
-        Mapper.delete_from_db(self.redis_conn, *keys)
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            Mapper.delete_from_db(
+                self.redis_conn, *[self.__redis_key(key) for key in chunk])
+        self.__invalidate(*keys)
         return True
 
     def exists(self, *keys: str) -> bool:
         """
         Checks if all specified keys exist in the cache.
 
+        A key exists if any part of its value is stored, in any layout.
+
         Args:
             *keys (str): Keys to be checked in the cache.
 
         Returns:
             bool: True if all keys exist, False otherwise.
         """
-        res = _RedisDB(self.redis_conn).exists(*keys)
+        redis_keys = [self.__redis_key(key) for key in keys]
+        res = sum(self.__route(lambda conn: Mapper.count_in_db(
+            conn, *chunk)) for chunk in Mapper.chunks(
+                redis_keys, self.chunk_size))
         return True if res == len(keys) else False
 
     def expire(self, expiry: int, *keys: str) -> bool:
         """
         Sets an expiration time for the specified keys.
 
+        Every Redis key of a value gets the expiry, including the metadata
+        and the sub-keys of nested lists and sets, in one script call per
+        chunk of keys.
+
         Args:
             expiry (int): Expiration time in seconds.
             *keys (str): Keys to set the expiration for.
 
         Returns:
-            bool: True if the operation is successful.
+            bool: True if all keys were found.
 
         Raises:
             InvalidFormatError: If the expiry is not an integer.
@@ -104,19 +311,97 @@ class Cache:
             raise InvalidFormatError(
                 f"Cache expire format wrong. Expected int, got {type(expiry)}."
             )
-        expiry = datetime.timedelta(seconds=expiry)
-        return _RedisDB(self.redis_conn).expire(expiry, *keys)
+        res = 0
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            res += Mapper.expire_in_db(
+                self.redis_conn, datetime.timedelta(seconds=expiry),
+                *[self.__redis_key(key) for key in chunk])
+        self.__invalidate(*keys, timeout=expiry)
+        return res == len(keys)
+
+    def delete_pattern(self, pattern: str, rate: float = None,
+                       progress: Callable[[int], None] = None) -> int:
+        """
+        Deletes the keys matching a glob-style pattern, without blocking Redis.
 
-    def flush(self) -> bool:
+        The keyspace is walked with SCAN, chunk_size keys per step, and the
+        values found are deleted with all their Redis keys, as in delete, one
+        chunk at a time, so maintenance can run while Redis serves traffic.
+
+        Args:
+            pattern (str): Pattern of the keys, as in Redis SCAN MATCH.
+            rate (float, optional): Most Redis keys a second scanned for
+                deletion. Defaults to maintenance_rate.
+            progress (Callable, optional): Function called after each chunk
+                with the number of keys deleted so far. Defaults to None.
+
+        Returns:
+            int: The number of keys deleted.
+
+        Usage:
+
+            cache.delete_pattern("price:*", rate=5000)
+        """
+        Mapper.validate_keys(pattern)
+        Mapper.validate_rate(rate)
+        pattern = self.__redis_key(pattern)
+        separated = ("|" + LIST_SEP + "|", "|" + SET_SEP + "|")
+        res = 0
+        for chunk in Mapper.throttle(Mapper.scan_chunks(
+                self.redis_conn, pattern, pattern + "$*",
+                *[prefix + pattern for prefix in separated],
+                count=self.chunk_size,
+                # Tag sets, leases and other internal keys are not values.
+                accept=lambda key: not key.startswith("|") or key.startswith(
+                    separated)), rate or self.maintenance_rate):
+            redis_keys = list(dict.fromkeys(
+                Mapper.logical_key(key) for key in chunk))
+            res += Mapper.delete_from_db(self.redis_conn, *redis_keys)
+            self.__invalidate(*[
+                self.__cache_key(key) for key in redis_keys])
+            if progress is not None:
+                progress(res)
+        return res
+
+    def flush(self, async_: bool = False, rate: float = None,
+              progress: Callable[[int], None] = None) -> bool:
         """
         Clears all data from the cache.
 
+        Args:
+            async_ (bool, optional): Remove the keys with SCAN and UNLINK,
+                chunk_size keys per step, rather than with FLUSHDB, which
+                blocks Redis until the whole database is freed. Defaults to
+                False.
+            rate (float, optional): Most Redis keys a second removed with
+                async_ set. Defaults to maintenance_rate.
+            progress (Callable, optional): Function called with async_ set
+                after each chunk with the number of Redis keys removed so far.
+                Defaults to None.
+
         Returns:
             bool: True if the operation is successful.
+
+        Note:
+            With async_ set, keys written during the flush may be kept.
         """
-        return _RedisDB(self.redis_conn).flush()
+        if async_:
+            Mapper.validate_rate(rate)
+            Mapper.unlink_matching(
+                self.redis_conn, "*", count=self.chunk_size,
+                rate=rate or self.maintenance_rate, progress=progress)
+            res = True
+        else:
+            res = _RedisDB(self.redis_conn).flush()
+        if self.local_cache is not None:
+            self.local_cache.clear()
+        loader = current_loader(self)
+        if loader is not None:
+            loader.clear()
+        return res
 
-    def __set(self, data: dict[str, Any], timeout: int = None, separator: str = "") -> None:
+    def __set(self, data: dict[str, Any], timeout: int = None, separator: str = "",
+              tags: Iterable[str] = None) -> None:
         """
         Internal method to set data in the cache.
 
@@ -124,19 +409,35 @@ class Cache:
             data (dict): Data to store in the cache.
             timeout (int, optional): Expiration time in seconds. Defaults to None.
             separator (str, optional): Separator for nested keys. Defaults to "".
+            tags (Iterable[str], optional): Tags to index the keys under.
+                Defaults to None.
 
         Raises:
-            InvalidFormatError: If timeout is not an integer.
+            InvalidFormatError: If timeout is not an integer, or tags is a
+            string.
         """
         if timeout is not None and not isinstance(timeout, int):
             raise InvalidFormatError(
                 f"Cache set expiry wrong. Expected int, got {type(timeout)}."
             )
-        timeout = datetime.timedelta(seconds=timeout) if timeout else None
+        if isinstance(tags, str):
+            raise InvalidFormatError(
+                "Cache set tags wrong. Expected iterable of str, got str."
+            )
+        tags = list(tags) if tags else None
+        if tags:
+            Mapper.validate_keys(*tags)
+        expiry = datetime.timedelta(seconds=timeout) if timeout else None
         separator = str(separator) if separator else None
-        Mapper.map_to_db(self.redis_conn, data, timeout, separator)
+        for keys in Mapper.chunks(data, self.chunk_size):
+            Mapper.map_to_db(
+                self.redis_conn,
+                {self.__redis_key(key): data[key] for key in keys}, expiry,
+                separator, self.value_conv, self.layout, tags)
+            self.__invalidate(*keys, timeout=timeout)
 
-    def set(self, key: str, value: CacheDataType, timeout: int = None, separator: str = "") -> None:
+    def set(self, key: str, value: CacheDataType, timeout: int = None, separator: str = "",
+            tags: Iterable[str] = None) -> None:
         """
         Stores a single key-value pair in the cache.
 
@@ -145,13 +446,16 @@ class Cache:
             value (CacheDataType): The value to store.
             timeout (int, optional): Expiration time in seconds. Defaults to None.
             separator (str, optional): Separator for nested keys. Defaults to "".
+            tags (Iterable[str], optional): Tags to index the key under, see
+                invalidate_tags. Defaults to None.
 
         Note:
             Will not set any value if it is None.
         """
-        self.__set({key: value}, timeout, separator)
+        self.__set({key: value}, timeout, separator, tags)
 
-    def set_many(self, data: dict[str, CacheDataType], timeout: int = None, separator: str = "") -> None:
+    def set_many(self, data: dict[str, CacheDataType], timeout: int = None, separator: str = "",
+                 tags: Iterable[str] = None) -> None:
         """
         Stores multiple key-value pairs in the cache.
 
@@ -159,18 +463,181 @@ class Cache:
             data (dict): Dictionary of key-value pairs to store.
             timeout (int, optional): Expiration time in seconds. Defaults to None.
             separator (str, optional): Separator for nested keys. Defaults to "".
+            tags (Iterable[str], optional): Tags to index the keys under, see
+                invalidate_tags. Defaults to None.
 
         Raises:
             InvalidFormatError: If data is not a dictionary.
 
         Note:
-            None or empty dicts/lists/sets are skipped.
+            None values are skipped. Empty dicts, lists and sets are stored
+            packed in a single key.
         """
         if not isinstance(data, dict):
             raise InvalidFormatError(
                 f"Cache set format wrong. Expected dict, got {type(data)}."
             )
-        self.__set(data, timeout, separator)
+        self.__set(data, timeout, separator, tags)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Deletes every key indexed under the specified tags.
+
+        Keys are indexed under their tags by set, in a Redis set per tag
+        written in the same pipeline as the value. The indexed keys are popped
+        chunk_size at a time with SPOP and deleted with all their Redis keys,
+        as in delete, in one script call per chunk.
+
+        Args:
+            *tags (str): Tags to invalidate.
+
+        Returns:
+            int: The number of keys deleted.
+
+        Note:
+            A tag set expires with the longest lived of its keys, and keys
+            deleted or expired meanwhile are dropped from it when the tag is
+            invalidated. Keys set again without a tag stay indexed under it
+            until then.
+
+        Usage:
+
+            cache.set("price:sku123", price, timeout=600, tags=["sku:123"])
+            cache.invalidate_tags("sku:123")
+        """
+        Mapper.validate_keys(*tags)
+        res = 0
+        for tag in tags:
+            while True:
+                redis_keys = Mapper.pop_tagged(
+                    self.redis_conn, tag, self.chunk_size)
+                if not redis_keys:
+                    break
+                res += Mapper.delete_from_db(self.redis_conn, *redis_keys)
+                self.__invalidate(*[
+                    self.__cache_key(key) for key in redis_keys])
+        return res
+
+    def __fetch(self, *keys: str) -> dict[str, CacheDataType]:
+        """
+        Internal method to get data in chunks of at most chunk_size keys.
+
+        Args:
+            *keys (str): Keys to retrieve.
+
+        Returns:
+            dict: A dictionary with the found keys and their values.
+        """
+        if len(keys) <= self.chunk_size:
+            return self.__fetch_chunk(*keys)
+        res = {}
+        for chunk in Mapper.chunks(keys, self.chunk_size):
+            res.update(self.__fetch_chunk(*chunk))
+        return res
+
+    def __fetch_chunk(self, *keys: str) -> dict[str, CacheDataType]:
+        """
+        Internal method to get data from the local cache, falling back to Redis.
+
+        Args:
+            *keys (str): Keys to retrieve.
+
+        Returns:
+            dict: A dictionary with the found keys and their values.
+        """
+        read_conn = None
+        if self.tracking is not None:
+            self.tracking.ensure_running()
+            if self.tracking.active:
+                read_conn = self.tracking.redis_conn
+            else:
+                return self.__read(*keys)
+        if self.local_cache is None:
+            return self.__read(*keys)
+        res = self.local_cache.get_many(*keys)
+        missing = [key for key in keys if key not in res]
+        if missing:
+            generation = self.local_cache.generation
+            fetched = self.__read(*missing, redis_conn=read_conn)
+            self.local_cache.set_many(fetched, generation)
+            res.update(fetched)
+        return res
+
+    def __get(self, *keys: str) -> dict[str, CacheDataType]:
+        """
+        Internal method to get data through the active batching scope, if any.
+
+        Args:
+            *keys (str): Keys to retrieve.
+
+        Returns:
+            dict: A dictionary with the found keys and their values.
+        """
+        loader = current_loader(self, self.__fetch)
+        if loader is not None:
+            return loader.get_many(*keys)
+        return self.__fetch(*keys)
+
+    @contextmanager
+    def batching(self) -> Iterator[RequestLoader]:
+        """
+        Batches and deduplicates the reads issued within the block.
+
+        Keys queued with load() are fetched together with the next read, in a
+        single get_many, and each key is fetched at most once in the block.
+        Writes through this cache make the written keys be read again.
+
+        Yields:
+            RequestLoader: The loader of this cache in the scope.
+
+        Usage:
+
+            with cache.batching():
+                name, price = cache.load("name"), cache.load("price")
+                render(name.value, price.value)
+        """
+        with batching_scope():
+            yield current_loader(self, self.__fetch)
+
+    def batch(self, transaction: bool = False) -> CacheBatch:
+        """
+        Creates a batch of mixed operations sent in a single pipeline.
+
+        Args:
+            transaction (bool, optional): Wrap the pipeline in MULTI/EXEC.
+                Defaults to False.
+
+        Returns:
+            CacheBatch: Batch executed when its with block exits, or on
+            execute(). Its methods mirror set/set_many/get/get_many/delete/
+            exists/expire and return BatchResult handles.
+
+        Usage:
+
+            with cache.batch() as b:
+                b.set("cart", items, timeout=600)
+                user = b.get("user")
+                b.delete("checkout")
+            user.value
+        """
+        return CacheBatch(
+            self.redis_conn, self.__invalidate, transaction,
+            self.value_conv, self.layout, self.__redis_key)
+
+    def load(self, key: str) -> Deferred:
+        """
+        Queues a key to be fetched with the next read of the batching scope.
+
+        Args:
+            key (str): The key to retrieve.
+
+        Returns:
+            Deferred: Handle whose value attribute resolves the queued keys.
+            Outside of a batching scope the key is fetched on its own.
+        """
+        loader = current_loader(self, self.__fetch) or RequestLoader(
+            self.__fetch)
+        return loader.load(key)
 
     def get(self, key: str) -> Union[CacheDataType, None]:
         """
@@ -182,7 +649,7 @@ class Cache:
         Returns:
             CacheDataType | None: The value associated with the key, or None if not found.
         """
-        return Mapper.unmap_from_db(self.redis_conn, key).get(key)
+        return self.__get(key).get(key)
 
     def get_many(self, *keys: str) -> dict[str, CacheDataType]:
         """
@@ -194,4 +661,636 @@ class Cache:
         Returns:
             dict: A dictionary with keys and their corresponding values.
         """
-        return Mapper.unmap_from_db(self.redis_conn, *keys)
+        return self.__get(*keys)
+
+    def iter_many(self, keys: Iterable[str], chunk_size: int = None) -> Iterator[
+            tuple[str, CacheDataType]]:
+        """
+        Retrieves values for many keys, chunk by chunk.
+
+        Keys are fetched chunk_size at a time, each chunk in its own round
+        trip, and its values yielded before the next chunk is requested. Memory
+        stays bounded by the chunk, and other clients are served between
+        chunks. The keys can be any iterable, including a generator.
+
+        Args:
+            keys (Iterable[str]): Keys to retrieve.
+            chunk_size (int, optional): Keys per round trip. Defaults to the
+                chunk_size of the cache.
+
+        Yields:
+            tuple: The found keys and their values, in the order of keys.
+        """
+        if chunk_size is None:
+            chunk_size = self.chunk_size
+        Mapper.validate_chunk_size(chunk_size)
+        for chunk in Mapper.chunks(keys, chunk_size):
+            found = self.__fetch_chunk(*chunk)
+            for key in chunk:
+                if key in found:
+                    yield key, found[key]
+
+    def __mutate(self, key: str, operations: list) -> int:
+        """
+        Internal method applying in-place updates to a stored value.
+
+        Args:
+            key (str): The key holding the value.
+            operations (list): (operation, path, values) records.
+
+        Returns:
+            int: The result of the last list or set operation.
+        """
+        res = Mutation.update_in_db(
+            self.redis_conn, self.__redis_key(key), operations,
+            self.value_conv, self.layout)
+        self.__invalidate(key)
+        return res
+
+    @staticmethod
+    def __path(path: Union[str, Sequence, None]) -> list:
+        return Mapper.path_field(path)[0] if path is not None else []
+
+    def extend(self, key: str, values: Iterable,
+               path: Union[str, Sequence] = None) -> int:
+        """
+        Appends values to a stored list with RPUSH, without rewriting it.
+
+        Args:
+            key (str): The key holding the list, or the dict holding it.
+            values (Iterable): Values to append.
+            path (str | Sequence, optional): Path of the list in the dict,
+                see get_path. Defaults to None, for the value itself.
+
+        Returns:
+            int: The length of the list.
+
+        Raises:
+            InvalidFormatError: If the value at the path is not a list.
+
+        Note:
+            Missing lists are created, and new keys get the remaining expiry
+            of the value.
+        """
+        values = list(values)
+        if not values:
+            return 0
+        return self.__mutate(
+            key, [(LIST_PUSH, self.__path(path), values)])
+
+    def append(self, key: str, *values,
+               path: Union[str, Sequence] = None) -> int:
+        """
+        Appends values to a stored list, see extend.
+        """
+        return self.extend(key, values, path)
+
+    def add_members(self, key: str, *members,
+                    path: Union[str, Sequence] = None) -> int:
+        """
+        Adds members to a stored set with SADD, without rewriting it.
+
+        Args:
+            key (str): The key holding the set, or the dict holding it.
+            *members: Members to add.
+            path (str | Sequence, optional): Path of the set in the dict,
+                see get_path. Defaults to None, for the value itself.
+
+        Returns:
+            int: The number of members added.
+
+        Raises:
+            InvalidFormatError: If the value at the path is not a set.
+        """
+        if not members:
+            return 0
+        return self.__mutate(
+            key, [(SET_ADD, self.__path(path), list(members))])
+
+    def remove_members(self, key: str, *members,
+                       path: Union[str, Sequence] = None) -> int:
+        """
+        Removes members from a stored set with SREM, without rewriting it.
+
+        Args:
+            key (str): The key holding the set, or the dict holding it.
+            *members: Members to remove.
+            path (str | Sequence, optional): Path of the set in the dict,
+                see get_path. Defaults to None, for the value itself.
+
+        Returns:
+            int: The number of members removed. Sets left empty are deleted.
+
+        Raises:
+            InvalidFormatError: If the value at the path is not a set.
+        """
+        if not members:
+            return 0
+        return self.__mutate(
+            key, [(SET_REMOVE, self.__path(path), list(members))])
+
+    def update_fields(self, key: str, fields: dict) -> None:
+        """
+        Updates fields of a stored dict with HSET, without rewriting it.
+
+        Nested dicts are merged field by field, other values replace the
+        value at their path. None values and empty lists and sets are
+        skipped, as in set.
+
+        Args:
+            key (str): The key holding the dict.
+            fields (dict): Fields to update.
+
+        Raises:
+            InvalidFormatError: If fields is not a dict, or the key holds a
+            value other than a dict.
+
+        Usage:
+
+            cache.update_fields("store", {"inventory": {"sku123": 4}})
+        """
+        if not isinstance(fields, dict):
+            raise InvalidFormatError(
+                f"Cache update format wrong. Expected dict, got {type(fields)}."
+            )
+        self.__mutate(key, Mutation.operations_from_fields(fields))
+
+    def delete_fields(self, key: str, *paths: Union[str, Sequence]) -> None:
+        """
+        Deletes fields of a stored dict with HDEL, without rewriting it.
+
+        Args:
+            key (str): The key holding the dict.
+            *paths (str | Sequence): Paths of the fields, see get_path. The
+                whole subtree under each path is deleted.
+
+        Raises:
+            InvalidFormatError: If the key holds a value other than a dict.
+        """
+        self.__mutate(key, [
+            (FIELD_DELETE, self.__path(path), []) for path in paths])
+
+    def __increment(self, counters: list) -> list:
+        """
+        Internal method incrementing counters server-side.
+
+        Args:
+            counters (list): (key, path, amount) records.
+
+        Returns:
+            list: The new value of each counter.
+        """
+        res = Mutation.increment_in_db(
+            self.redis_conn, [
+                (self.__redis_key(key), path, amount)
+                for key, path, amount in counters],
+            self.value_conv, self.layout)
+        self.__invalidate(*dict.fromkeys(key for key, _, _ in counters))
+        return res
+
+    def incr_many(self, counters: dict[str, Union[int, float]]) -> dict[
+            str, Union[int, float]]:
+        """
+        Increments multiple counters atomically, in a single round trip.
+
+        Args:
+            counters (dict): Keys and the amounts to add to them.
+
+        Returns:
+            dict: The keys and their new values.
+
+        Raises:
+            InvalidFormatError: If an amount or a stored value is not a
+            number.
+
+        Note:
+            Missing counters start from 0. Expiry times are kept. Integer
+            counters are added exactly as decimal strings in the script and
+            stored tagged like any other int.
+        """
+        if not isinstance(counters, dict):
+            raise InvalidFormatError(
+                f"Cache incr format wrong. Expected dict, got {type(counters)}."
+            )
+        return dict(zip(counters, self.__increment([
+            (key, None, amount) for key, amount in counters.items()])))
+
+    def incr(self, key: str, amount: Union[int, float] = 1) -> Union[
+            int, float]:
+        """
+        Increments a counter atomically, see incr_many.
+
+        Returns:
+            int | float: The new value.
+        """
+        return self.__increment([(key, None, amount)])[0]
+
+    def decr(self, key: str, amount: Union[int, float] = 1) -> Union[
+            int, float]:
+        """
+        Decrements a counter atomically, see incr_many.
+
+        Returns:
+            int | float: The new value.
+        """
+        return self.incr(key, -amount)
+
+    def incr_fields(self, key: str, fields: dict[Union[
+            str, tuple], Union[int, float]]) -> dict[
+            Union[str, tuple], Union[int, float]]:
+        """
+        Increments counters in a stored dict atomically, in the hash fields.
+
+        Args:
+            key (str): The key holding the dict.
+            fields (dict): Paths of the counters, see get_path, and the
+                amounts to add to them.
+
+        Returns:
+            dict: The paths and the new values of the counters.
+
+        Raises:
+            InvalidFormatError: If the key holds a value other than a dict, or
+            an amount or a counter is not a number.
+        """
+        if not isinstance(fields, dict):
+            raise InvalidFormatError(
+                f"Cache incr format wrong. Expected dict, got {type(fields)}."
+            )
+        return dict(zip(fields, self.__increment([
+            (key, self.__path(path), amount)
+            for path, amount in fields.items()])))
+
+    def incr_field(self, key: str, path: Union[str, Sequence],
+                   amount: Union[int, float] = 1) -> Union[int, float]:
+        """
+        Increments a counter in a stored dict atomically, see incr_fields.
+
+        Usage:
+
+            cache.incr_field("store", "inventory|sku123", -1)
+        """
+        return self.__increment([(key, self.__path(path), amount)])[0]
+
+    def get_range(self, key: str, start: int = 0, stop: int = None,
+                  path: Union[str, Sequence] = None) -> list:
+        """
+        Retrieves a slice of a stored list with LRANGE.
+
+        Args:
+            key (str): The key holding the list, or the dict holding it.
+            start (int, optional): First index, negative from the end.
+                Defaults to 0.
+            stop (int, optional): Index to stop before, negative from the end,
+                as in list slicing. Defaults to None, for the end of the list.
+            path (str | Sequence, optional): Path of the list in the dict,
+                see get_path. Defaults to None, for the value itself.
+
+        Returns:
+            list: The values in the slice, empty if the list is not found.
+
+        Raises:
+            InvalidFormatError: If the value is not a list.
+        """
+        key = self.__redis_key(key)
+        return self.__route(lambda conn: Members.get_range(
+            conn, key, start, stop, path))
+
+    def len(self, key: str, path: Union[str, Sequence] = None) -> int:
+        """
+        Returns the length of a stored list or set, with LLEN or SCARD.
+
+        Args:
+            key (str): The key holding the list or set, or the dict holding it.
+            path (str | Sequence, optional): Path of the list or set in the
+                dict, see get_path. Defaults to None, for the value itself.
+
+        Returns:
+            int: The length, 0 if not found.
+
+        Raises:
+            InvalidFormatError: If the value is not a list or set.
+        """
+        key = self.__redis_key(key)
+        return self.__route(lambda conn: Members.length(conn, key, path))
+
+    def iter_members(self, key: str, chunk_size: int = None,
+                     path: Union[str, Sequence] = None) -> Iterator[Any]:
+        """
+        Iterates over a stored list or set without loading it whole.
+
+        Lists are read in windows of LRANGE and sets with SSCAN, chunk_size
+        members per round trip, each chunk decoded only when reached. With
+        replicas configured, each chunk is read through the replica router,
+        so a replica failing midway is replaced by the primary.
+
+        Args:
+            key (str): The key holding the list or set, or the dict holding it.
+            chunk_size (int, optional): Members read per round trip. Defaults
+                to the chunk_size of the cache.
+            path (str | Sequence, optional): Path of the list or set in the
+                dict, see get_path. Defaults to None, for the value itself.
+
+        Yields:
+            The members, lists in order.
+
+        Raises:
+            InvalidFormatError: If the value is not a list or set, or the
+            chunk size is not a positive int.
+
+        Note:
+            Members added or removed during the iteration may be missed or
+            seen twice, and SSCAN may return a set member more than once.
+        """
+        if chunk_size is None:
+            chunk_size = self.chunk_size
+        Mapper.validate_chunk_size(chunk_size)
+        key = self.__redis_key(key)
+        return Members.iterate(
+            self.redis_conn, key, chunk_size, path, route=self.__route)
+
+    def get_fields(self, key: str, paths: Iterable[Union[
+            str, Sequence]]) -> dict[Union[str, tuple], CacheDataType]:
+        """
+        Retrieves parts of a dict value without fetching the whole value.
+
+        Only the hash fields under each path are read, with HMGET for exact
+        fields and HSCAN MATCH for subtrees, together with the list and set
+        fields under the paths. Packed values are fetched whole and filtered.
+
+        Args:
+            key (str): The key holding the dict.
+            paths (Iterable[str | Sequence]): Paths of the parts to retrieve,
+                either "|"-joined string keys or sequences of keys.
+
+        Returns:
+            dict: The found paths and their values, sequence paths as tuples.
+        """
+        key, paths = self.__redis_key(key), list(paths)
+        return self.__route(lambda conn: Mapper.unmap_fields_from_db(
+            conn, key, *paths))
+
+    def get_path(self, key: str, path: Union[str, Sequence]) -> Union[
+            CacheDataType, None]:
+        """
+        Retrieves a part of a dict value without fetching the whole value.
+
+        Args:
+            key (str): The key holding the dict.
+            path (str | Sequence): Path of the part, either "|"-joined string
+                keys like "inventory|sku123" or a sequence of keys.
+
+        Returns:
+            CacheDataType | None: The value at the path, or None if not found.
+
+        Usage:
+
+            cache.get_path("store", "inventory|sku123")
+        """
+        return next(iter(self.get_fields(key, [path]).values()), None)
+
+    def __should_refresh(self, key: str, beta: float) -> bool:
+        """
+        Internal method deciding on an early recomputation (XFetch).
+
+        Args:
+            key (str): The key holding the value.
+            beta (float): Eagerness of the early recomputation.
+
+        Returns:
+            bool: True if the value should be recomputed before it expires.
+        """
+        key = self.__redis_key(key)
+        with self.redis_conn.pipeline(transaction=False) as pipe:
+            for redis_key in [
+                    key, "|" + LIST_SEP + "|" + key,
+                    "|" + SET_SEP + "|" + key]:
+                pipe.pttl(redis_key)
+            RedisNative(pipe).execute_get_many("|" + DELTA + "|" + key)
+            *ttls, delta = pipe.execute()
+        ttl = max(ttls)
+        delta = RedisNative(self.redis_conn).format_get_many(
+            ["delta"], delta).get("delta")
+        if ttl < 0 or not delta:
+            return False
+        return -delta * beta * math.log(
+            1.0 - random.random()) >= ttl
+
+    def __produce(self, key: str, producer: Callable[[], CacheDataType],
+                  timeout: int, separator: str, beta: float) -> CacheDataType:
+        """
+        Internal method computing a value and storing it in the cache.
+
+        Args:
+            key (str): The key to store.
+            producer (Callable): Function computing the value.
+            timeout (int): Expiration time in seconds.
+            separator (str): Separator for nested keys.
+            beta (float | None): Eagerness of the early recomputation.
+
+        Returns:
+            CacheDataType | None: The computed value.
+        """
+        start = time.monotonic()
+        value = producer()
+        delta = int((time.monotonic() - start) * 1000)
+        if value is None:
+            return None
+        self.set(key, value, timeout, separator)
+        if beta is not None:
+            RedisNative(self.redis_conn).set(
+                "|" + DELTA + "|" + self.__redis_key(key), delta,
+                datetime.timedelta(seconds=timeout) if timeout else None)
+        return value
+
+    def __fill(self, key: str, producer: Callable[[], CacheDataType],
+               stale: Union[CacheDataType, None], timeout: int,
+               separator: str, lease_timeout: int, wait_timeout: float,
+               beta: float) -> CacheDataType:
+        """
+        Internal method recomputing a value under a cross-process lease.
+
+        Args:
+            key (str): The key to fill.
+            producer (Callable): Function computing the value.
+            stale (CacheDataType | None): Current value, if refreshed early.
+            timeout (int): Expiration time in seconds.
+            separator (str): Separator for nested keys.
+            lease_timeout (int): Lifetime of the lease in seconds.
+            wait_timeout (float): Time in seconds to wait for another worker.
+            beta (float | None): Eagerness of the early recomputation.
+
+        Returns:
+            CacheDataType | None: The cached or computed value.
+
+        Note:
+            Reads here go to the primary, where the value of the lease holder
+            appears first.
+        """
+        lease_key = "|" + LEASE + "|" + self.__redis_key(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait_timeout
+        while True:
+            if self.redis_conn.set(
+                    lease_key, token, nx=True, px=lease_timeout * 1000):
+                try:
+                    if stale is None:
+                        value = self.__read(
+                            key, redis_conn=self.redis_conn).get(key)
+                        if value is not None:
+                            return value
+                    return self.__produce(
+                        key, producer, timeout, separator, beta)
+                finally:
+                    RELEASE_LEASE(
+                        self.redis_conn, keys=[lease_key], args=[token])
+            if stale is not None:
+                return stale
+            value = self.__read(
+                key, redis_conn=self.redis_conn).get(key)
+            if value is not None:
+                return value
+            if time.monotonic() >= deadline:
+                return self.__produce(
+                    key, producer, timeout, separator, beta)
+            time.sleep(0.05)
+
+    def get_or_set(self, key: str, producer: Callable[[], CacheDataType],
+                   timeout: int = None, separator: str = "",
+                   lease_timeout: int = 10, wait_timeout: float = 5.0,
+                   beta: float = None) -> Union[CacheDataType, None]:
+        """
+        Retrieves a value, computing and storing it once on a miss.
+
+        Concurrent misses within the process are coalesced, and across
+        processes a short Redis lease lets a single worker run the producer
+        while others wait for its value. With beta set, values are recomputed
+        early with a probability rising as their TTL runs out (XFetch), while
+        the other workers keep serving the current value.
+
+        Args:
+            key (str): The key to retrieve.
+            producer (Callable): Function computing the value on a miss.
+            timeout (int, optional): Expiration time in seconds. Defaults to None.
+            separator (str, optional): Separator for nested keys. Defaults to "".
+            lease_timeout (int, optional): Lifetime of the recomputation lease
+                in seconds. Defaults to 10.
+            wait_timeout (float, optional): Time in seconds to wait for another
+                worker before computing the value anyway. Defaults to 5.0.
+            beta (float, optional): Eagerness of the early recomputation, 1.0
+                being the usual value. Defaults to None, disabling it.
+
+        Returns:
+            CacheDataType | None: The cached or computed value, or None if the
+            producer returned None.
+
+        Raises:
+            InvalidFormatError: If lease_timeout is not a positive integer.
+        """
+        if not isinstance(lease_timeout, int) or lease_timeout <= 0:
+            raise InvalidFormatError(
+                f"Cache lease timeout wrong. Expected positive int, got "
+                f"{lease_timeout}."
+            )
+        value = self.get(key)
+        if value is not None and (
+                beta is None or not self.__should_refresh(key, beta)):
+            return value
+        return self.__flight.do(key, lambda: self.__fill(
+            key, producer, value, timeout, separator,
+            lease_timeout, wait_timeout, beta))
+
+    def memoize(self, timeout: int = None,
+                prefix: str = MEMOIZE_PREFIX) -> Callable[[Callable], Memoized]:
+        """
+        Decorator caching the results of a function by its arguments.
+
+        Args:
+            timeout (int, optional): Expiration time in seconds. Defaults to None.
+            prefix (str, optional): Prefix of the generated keys. Defaults to
+                "memoize".
+
+        Returns:
+            Callable: Decorator wrapping the function in a Memoized, which also
+            offers many(args_list) for batched lookups, key(*args, **kwargs)
+            and invalidate(*args, **kwargs).
+
+        Usage:
+
+            @cache.memoize(timeout=300)
+            def get_store(store_id):
+                ...
+
+            stores = get_store.many([(1,), (2,), (3,)])
+        """
+        if timeout is not None and not isinstance(timeout, int):
+            raise InvalidFormatError(
+                f"Cache memoize expiry wrong. Expected int, got {type(timeout)}."
+            )
+
+        def decorator(fn: Callable) -> Memoized:
+            return Memoized(self, fn, timeout, prefix)
+        return decorator
+
+    def namespace(self, name: str, generation_ttl: float = 1.0) -> Namespace:
+        """
+        Returns a view of the cache storing its keys under a namespace.
+
+        Keys are prefixed with a generation counter held in Redis, so all the
+        keys of the namespace are invalidated at once with a single INCR,
+        without FLUSHDB or deleting them one by one.
+
+        Args:
+            name (str): Name of the namespace, without "#", "$" or "|".
+            generation_ttl (float, optional): Seconds the generation is
+                cached in the process. Defaults to 1.0.
+
+        Returns:
+            Namespace: View offering get, get_many, set, set_many, delete,
+            exists, expire, incr, decr, incr_many, get_or_set and memoize,
+            plus invalidate() and reap().
+
+        Usage:
+
+            store = cache.namespace("store:42")
+            store.set("inventory", inventory, timeout=3600)
+            store.invalidate()
+        """
+        return Namespace(self, name, generation_ttl)
+
+    def lock(self, name: str, ttl: float = 10, wait_timeout: float = None,
+             watchdog: bool = False) -> Lock:
+        """
+        Returns a distributed lock, held in Redis under "|lock|<name>".
+
+        The lock is acquired with SET NX PX and released with a
+        token-checked script, so only its holder releases it. Waiters block
+        on a Redis list with BLPOP, and are woken up by the release rather
+        than polling.
+
+        Args:
+            name (str): Name of the lock.
+            ttl (float, optional): Lifetime of the lock in seconds, after
+                which it is released if its holder has not. Defaults to 10.
+            wait_timeout (float, optional): Seconds to wait for the lock.
+                Defaults to None, waiting until it is acquired.
+            watchdog (bool, optional): Extend the lock every third of its ttl
+                while held, in a background thread. Defaults to False.
+
+        Returns:
+            Lock: The lock, acquired on entering it as a context manager, or
+            with acquire() and release().
+
+        Raises:
+            LockNotAcquiredError: On entering the lock, if it is not acquired
+            within wait_timeout.
+
+        Usage:
+
+            with cache.lock("checkout:42", ttl=5, wait_timeout=2):
+                ...
+        """
+        Mapper.validate_keys(name)
+        return Lock(
+            self.redis_conn, "|" + LOCK + "|" + self.__redis_key(name), ttl,
+            wait_timeout, watchdog)
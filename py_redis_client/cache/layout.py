@@ -0,0 +1,89 @@
+from collections.abc import MutableMapping
+from typing import Union, Any
+
+from py_redis_client import codec
+
+
+def _is_native(value: Any) -> bool:
+    return type(value) in codec.ENCODERS and type(value) is not codec.Packed
+
+
+def _is_iterable(value: Any) -> bool:
+    return isinstance(value, (list, set)) and bool(value) and all(
+        _is_native(v) for v in value)
+
+
+class PackLayout:
+    """
+    Chooses between the native and the packed storage layout of values.
+
+    Lists, sets and hash maps are stored natively as Redis lists, sets and
+    hashes, with address keys recording the layout. Small ones are cheaper
+    packed into the value of a single key, where the value tag itself records
+    the layout, so they are read back in the same round trip as any other
+    value. Values above either limit keep the native layout and its partial
+    and server-side operations.
+
+    Attributes:
+        max_elements (int): Largest number of elements packed. The elements
+            of a hash map are its scalars plus the members of its lists and
+            sets.
+        max_bytes (int | None): Largest packed text size, None for no limit.
+    """
+
+    def __init__(self, max_elements: int = 64,
+                 max_bytes: int = None) -> None:
+        self.max_elements = max_elements
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_options(cls, options: Union[dict, None]) -> Union[
+            "PackLayout", None]:
+        """
+        Builds a PackLayout from the "PACK" option of a cache.
+
+        Args:
+            options (dict | None): Mapping with the optional "MAX_ELEMENTS"
+                and "MAX_BYTES" keys.
+
+        Returns:
+            PackLayout | None: The layout, or None if not configured.
+        """
+        if not options:
+            return None
+        return cls(
+            max_elements=options.get("MAX_ELEMENTS", 64),
+            max_bytes=options.get("MAX_BYTES"))
+
+    def pack(self, value: Any) -> Union[codec.Packed, None]:
+        """
+        Packs a value formatted by Mapper.format_to_db, if small enough.
+
+        Args:
+            value (Any): A list, a set, or a flattened hash map.
+
+        Returns:
+            Packed | None: The packed value, or None if the value has to keep
+            the native layout.
+        """
+        if isinstance(value, MutableMapping):
+            value = {k: v for k, v in value.items() if v is not None}
+            elements = 0
+            for v in value.values():
+                if _is_iterable(v):
+                    elements += len(v)
+                elif _is_native(v):
+                    elements += 1
+                else:
+                    return None
+        elif _is_iterable(value):
+            elements = len(value)
+        else:
+            return None
+        if not value or elements > self.max_elements:
+            return None
+        packed = codec.Packed(value)
+        if self.max_bytes is not None and len(
+                codec.encode(packed)) > self.max_bytes:
+            return None
+        return packed
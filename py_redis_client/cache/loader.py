@@ -0,0 +1,169 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Union, Callable, Iterator
+
+from py_redis_client.cache.local import _copy
+from py_redis_client.constants import CacheDataType
+
+
+_MISSING = object()
+
+_scope: ContextVar[Union[dict, None]] = ContextVar(
+    "py_redis_client_batching_scope", default=None)
+
+
+class Deferred:
+    """
+    Handle to a value queued on a RequestLoader.
+
+    Reading ``value`` resolves every key queued on the loader so far with a
+    single get_many.
+    """
+
+    __slots__ = ("loader", "key")
+
+    def __init__(self, loader: "RequestLoader", key: str) -> None:
+        self.loader = loader
+        self.key = key
+
+    @property
+    def value(self) -> Union[CacheDataType, None]:
+        return self.loader.get_many(self.key).get(self.key)
+
+    def __repr__(self) -> str:
+        return "<Deferred {!r}>".format(self.key)
+
+
+class RequestLoader:
+    """
+    Scope-local batching and deduplication of cache reads.
+
+    Keys are queued with ``load`` and fetched together the first time any of
+    them, or any other key, is read. Every key is fetched at most once per
+    scope, later reads are answered from the scope, and local writes forget
+    the written keys so they are read again.
+
+    Reads from several threads of the scope, such as the shards of a
+    ShardedCache, are coalesced: a key already being fetched is waited for
+    rather than fetched again, and keys queued meanwhile go with the next
+    fetch. Values are returned as copies, so a caller mutating one does not
+    change what later reads of the scope see.
+
+    Attributes:
+        dispatches (int): Number of get_many round trips issued.
+    """
+
+    def __init__(self, fetch: Callable[..., dict[str, CacheDataType]]) -> None:
+        self.__fetch = fetch
+        self.__results: dict = {}
+        self.__pending: dict = {}
+        self.__inflight: dict[str, threading.Event] = {}
+        self.__stale: set = set()
+        self.__lock = threading.Lock()
+        self.dispatches = 0
+
+    def load(self, key: str) -> Deferred:
+        with self.__lock:
+            if key not in self.__results:
+                self.__pending[key] = None
+        return Deferred(self, key)
+
+    def __dispatch(self, keys: list, done: threading.Event) -> None:
+        fetched = None
+        try:
+            fetched = self.__fetch(*keys)
+        finally:
+            with self.__lock:
+                if fetched is not None:
+                    self.dispatches += 1
+                for key in keys:
+                    del self.__inflight[key]
+                    # Keys written while fetched may have been read before
+                    # the write, they are fetched again.
+                    if key in self.__stale:
+                        self.__stale.discard(key)
+                    elif fetched is not None:
+                        self.__results[key] = fetched.get(key, _MISSING)
+            done.set()
+
+    def get_many(self, *keys: str) -> dict[str, CacheDataType]:
+        while True:
+            with self.__lock:
+                missing = [key for key in keys if key not in self.__results]
+                if not missing:
+                    res = {key: self.__results[key] for key in keys}
+                    break
+                waits = {self.__inflight[key] for key in missing
+                         if key in self.__inflight}
+                for key in missing:
+                    if key not in self.__inflight:
+                        self.__pending[key] = None
+                batch = [key for key in self.__pending
+                         if key not in self.__inflight
+                         and key not in self.__results]
+                self.__pending.clear()
+                done = threading.Event()
+                for key in batch:
+                    self.__inflight[key] = done
+            if batch:
+                self.__dispatch(batch, done)
+            # Keys still missing after the waits, because their fetch failed
+            # or they were written meanwhile, are fetched on the next pass.
+            for event in waits:
+                event.wait()
+        return {key: _copy(value) for key, value in res.items()
+                if value is not _MISSING}
+
+    def forget(self, *keys: str) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__results.pop(key, None)
+                if key in self.__inflight:
+                    self.__stale.add(key)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__results.clear()
+            self.__stale.update(self.__inflight)
+
+
+def current_loader(owner: object, fetch: Callable[
+        ..., dict[str, CacheDataType]] = None) -> Union[RequestLoader, None]:
+    """
+    Returns the loader of the owner in the active scope.
+
+    Args:
+        owner (object): The cache the loader batches reads for.
+        fetch (Callable, optional): Function fetching keys, used to create
+            the loader if the scope has none yet. Defaults to None.
+
+    Returns:
+        RequestLoader | None: The loader, or None outside of a scope or if
+        none exists and no fetch function was given.
+    """
+    loaders = _scope.get()
+    if loaders is None:
+        return None
+    loader = loaders.get(id(owner))
+    if loader is None and fetch is not None:
+        # Threads of the scope share its loaders, the first one set wins.
+        loader = loaders.setdefault(id(owner), RequestLoader(fetch))
+    return loader
+
+
+@contextmanager
+def batching_scope() -> Iterator[None]:
+    """
+    Batches and deduplicates the reads of every cache within the block.
+
+    Nested scopes share the outermost one.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
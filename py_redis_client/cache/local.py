@@ -0,0 +1,225 @@
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Union, Any
+
+from py_redis_client.constants import CacheDataType
+from py_redis_client.exceptions import InvalidFormatError
+
+
+_MISSING = object()
+
+
+def _sizeof(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, MutableMapping):
+        for k, v in value.items():
+            size += _sizeof(k) + _sizeof(v)
+    elif isinstance(value, (list, set, tuple)):
+        for v in value:
+            size += _sizeof(v)
+    return size
+
+
+def _copy(value: Any) -> Any:
+    return copy.deepcopy(value) if isinstance(
+        value, (MutableMapping, list, set)) else value
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: Union[float, None],
+                 size: int) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class LocalCache:
+    """
+    Bounded, thread-safe in-process cache of decoded values.
+
+    Entries are evicted least recently used first once either the entry or
+    the byte budget is exceeded, and expire at the earliest of the local
+    timeout and the Redis deadline known from local writes.
+
+    Invalidated keys keep a value-less entry holding their Redis deadline,
+    so a value read back after a local ``set`` never outlives its Redis TTL.
+    Such entries count against ``max_entries`` only.
+
+    Attributes:
+        max_entries (int): Maximum number of entries held.
+        max_bytes (int | None): Maximum estimated size of the held values.
+        timeout (int | None): Maximum age in seconds of a held value.
+        hits (int): Number of lookups served locally.
+        misses (int): Number of lookups not found locally.
+        evictions (int): Number of values evicted to honour the bounds.
+    """
+
+    def __init__(self, max_entries: int = 1024,
+                 max_bytes: int = None,
+                 timeout: int = None) -> None:
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise InvalidFormatError(
+                f"Local cache max entries wrong. Expected positive int, "
+                f"got {max_entries}."
+            )
+        if max_bytes is not None and not isinstance(max_bytes, int):
+            raise InvalidFormatError(
+                f"Local cache max bytes wrong. Expected int, got "
+                f"{type(max_bytes)}."
+            )
+        if timeout is not None and not isinstance(timeout, int):
+            raise InvalidFormatError(
+                f"Local cache timeout wrong. Expected int, got "
+                f"{type(timeout)}."
+            )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__bytes = 0
+        self.__generation = 0
+        self.__entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options: Union[dict, None]) -> Union[
+            "LocalCache", None]:
+        """
+        Builds a LocalCache from the "LOCAL_CACHE" option of a cache.
+
+        Args:
+            options (dict | None): Mapping with the optional "MAX_ENTRIES",
+                "MAX_BYTES" and "TIMEOUT" keys.
+
+        Returns:
+            LocalCache | None: The local cache, or None if not configured.
+        """
+        if not options:
+            return None
+        return cls(
+            max_entries=options.get("MAX_ENTRIES", 1024),
+            max_bytes=options.get("MAX_BYTES"),
+            timeout=options.get("TIMEOUT"))
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry is not None and entry.value is not _MISSING:
+            self.__bytes -= entry.size
+
+    def __evict(self) -> None:
+        while self.__entries and (
+                len(self.__entries) > self.max_entries or (
+                    self.max_bytes is not None
+                    and self.__bytes > self.max_bytes)):
+            _, entry = self.__entries.popitem(last=False)
+            if entry.value is not _MISSING:
+                self.__bytes -= entry.size
+                self.evictions += 1
+
+    def get(self, key: str, default: Any = None) -> Union[
+            CacheDataType, None]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry.expires_at is not None and (
+                    entry.expires_at <= time.monotonic()):
+                self.__remove(key)
+                entry = None
+            if entry is None or entry.value is _MISSING:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            value = entry.value
+        return _copy(value)
+
+    def get_many(self, *keys: str) -> dict[str, CacheDataType]:
+        res = {}
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                res[key] = value
+        return res
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter bumped by every invalidation. Values read from Redis are only
+        stored if no invalidation happened since the read was issued.
+        """
+        return self.__generation
+
+    def set(self, key: str, value: CacheDataType,
+            generation: int = None) -> None:
+        size = _sizeof(value)
+        now = time.monotonic()
+        with self.__lock:
+            if generation is not None and (
+                    generation != self.__generation):
+                return
+            current = self.__entries.get(key)
+            expires_at = now + self.timeout if self.timeout else None
+            if current is not None and current.expires_at is not None:
+                if current.expires_at <= now:
+                    self.__remove(key)
+                    return
+                if expires_at is None or current.expires_at < expires_at:
+                    expires_at = current.expires_at
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self.__remove(key)
+            self.__entries[key] = _Entry(_copy(value), expires_at, size)
+            self.__bytes += size
+            self.__evict()
+
+    def set_many(self, data: dict[str, CacheDataType],
+                 generation: int = None) -> None:
+        for key, value in data.items():
+            self.set(key, value, generation)
+
+    def invalidate(self, *keys: str, timeout: int = None) -> None:
+        """
+        Drops the values held for the keys.
+
+        Args:
+            *keys (str): Keys to invalidate.
+            timeout (int, optional): Redis TTL in seconds the keys were just
+                written with, remembered for the next values read back.
+        """
+        expires_at = (time.monotonic() + timeout
+                      if timeout else None)
+        with self.__lock:
+            self.__generation += 1
+            for key in keys:
+                self.__remove(key)
+                if expires_at is not None:
+                    self.__entries[key] = _Entry(
+                        _MISSING, expires_at, 0)
+            self.__evict()
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the counters of the local cache.
+
+        Returns:
+            dict: Hits, misses, evictions, held entries and estimated bytes.
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.__entries),
+                "bytes": self.__bytes}
@@ -0,0 +1,186 @@
+import threading
+import time
+import uuid
+import redis
+from typing import Union
+
+from py_redis_client.exceptions import InvalidFormatError, LockNotAcquiredError
+from py_redis_client.scripts import RELEASE_LEASE, EXTEND_LEASE
+
+
+class Lock:
+    """
+    Distributed lock held in a Redis key, acquired with SET NX PX.
+
+    The key holds a random token of the holder, so only the holder releases
+    or extends it, with token-checked Lua scripts. Waiters block on a Redis
+    list with BLPOP and releasing the lock pushes to that list, so a waiter
+    takes over as soon as the lock is released instead of on its next poll.
+    Waiters also retry when the lock expires without being released.
+
+    With watchdog set, a daemon thread extends the lock every third of its
+    ttl while it is held. A holder running longer than ttl then keeps the
+    lock, and a crashed holder loses it after ttl.
+
+    A Lock is not reentrant and is meant to be used by one thread at a time.
+
+    Attributes:
+        redis_conn (redis.Redis): Client the lock is held with.
+        key (str): Redis key of the lock.
+        ttl (float): Lifetime of the lock in seconds.
+        wait_timeout (float | None): Seconds to wait for the lock, None to
+            wait until it is acquired.
+        watchdog (bool): Whether the lock is extended while held.
+        token (str | None): Token of the holder, None while not held.
+        lost (bool): Whether the watchdog found the lock taken over, after
+            it expired.
+    """
+
+    # Most seconds a waiter blocks before checking the lock again, kept
+    # below the usual socket timeouts.
+    BLOCK_LIMIT = 1.0
+
+    def __init__(self, redis_conn: redis.Redis, key: str,
+                 ttl: float = 10, wait_timeout: float = None,
+                 watchdog: bool = False) -> None:
+        if type(ttl) not in (int, float) or ttl <= 0:
+            raise InvalidFormatError(
+                f"Lock ttl wrong. Expected positive number, got {ttl}."
+            )
+        if wait_timeout is not None and (
+                type(wait_timeout) not in (int, float) or wait_timeout < 0):
+            raise InvalidFormatError(
+                f"Lock wait timeout wrong. Expected non-negative number, got "
+                f"{wait_timeout}."
+            )
+        self.redis_conn = redis_conn
+        self.key = key
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.watchdog = watchdog
+        self.token = None
+        self.lost = False
+        self.__signal_key = key + "$wake"
+        self.__stop = None
+
+    @property
+    def locked(self) -> bool:
+        """
+        Whether the lock is held by this Lock.
+        """
+        return self.token is not None
+
+    @property
+    def __ttl_ms(self) -> int:
+        return max(int(self.ttl * 1000), 1)
+
+    def acquire(self, blocking: bool = True,
+                wait_timeout: float = None) -> bool:
+        """
+        Acquires the lock.
+
+        Args:
+            blocking (bool, optional): Wait for the lock if it is held.
+                Defaults to True.
+            wait_timeout (float, optional): Seconds to wait for the lock.
+                Defaults to the wait_timeout of the Lock.
+
+        Returns:
+            bool: True if the lock was acquired.
+
+        Raises:
+            InvalidFormatError: If the lock is already held by this Lock.
+        """
+        if self.token is not None:
+            raise InvalidFormatError(
+                "Lock '{}' already acquired.".format(self.key))
+        if wait_timeout is None:
+            wait_timeout = self.wait_timeout
+        deadline = None if wait_timeout is None else (
+            time.monotonic() + wait_timeout)
+        token = uuid.uuid4().hex
+        while True:
+            if self.redis_conn.set(
+                    self.key, token, nx=True, px=self.__ttl_ms):
+                self.token = token
+                self.lost = False
+                if self.watchdog:
+                    self.__start_watchdog(token)
+                return True
+            if not blocking:
+                return False
+            wait = self.BLOCK_LIMIT
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+            pttl = self.redis_conn.pttl(self.key)
+            if pttl == -2:
+                # Released since the SET, retried at once.
+                continue
+            if pttl > 0:
+                wait = min(wait, pttl / 1000)
+            self.redis_conn.blpop([self.__signal_key], timeout=max(
+                wait, 0.001))
+
+    def release(self) -> bool:
+        """
+        Releases the lock and wakes up a waiter.
+
+        Returns:
+            bool: True if the lock was still held, False if it had expired.
+        """
+        if self.token is None:
+            return False
+        if self.__stop is not None:
+            self.__stop.set()
+            self.__stop = None
+        token, self.token = self.token, None
+        return bool(RELEASE_LEASE(
+            self.redis_conn, keys=[self.key, self.__signal_key],
+            args=[token, self.__ttl_ms]))
+
+    def extend(self, ttl: float = None) -> bool:
+        """
+        Resets the lifetime of the held lock.
+
+        Args:
+            ttl (float, optional): New lifetime in seconds. Defaults to the
+                ttl of the Lock.
+
+        Returns:
+            bool: True if the lock was still held.
+        """
+        if self.token is None:
+            return False
+        ms = self.__ttl_ms if ttl is None else max(int(ttl * 1000), 1)
+        return bool(EXTEND_LEASE(
+            self.redis_conn, keys=[self.key], args=[self.token, ms]))
+
+    def __start_watchdog(self, token: str) -> None:
+        stop = self.__stop = threading.Event()
+        threading.Thread(
+            target=self.__watch, args=(token, stop), daemon=True,
+            name="py-redis-client-lock-watchdog").start()
+
+    def __watch(self, token: str, stop: threading.Event) -> None:
+        while not stop.wait(self.ttl / 3):
+            try:
+                extended = EXTEND_LEASE(
+                    self.redis_conn, keys=[self.key],
+                    args=[token, self.__ttl_ms])
+            except (redis.ConnectionError, redis.TimeoutError):
+                continue
+            if not extended:
+                self.lost = True
+                return
+
+    def __enter__(self) -> "Lock":
+        if not self.acquire():
+            raise LockNotAcquiredError(
+                "Lock '{}' not acquired in {} seconds.".format(
+                    self.key, self.wait_timeout))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
@@ -1,25 +1,66 @@
+import re
+import time
 import redis
+from itertools import islice
 from redis import client
-from typing import Union, List, Any
+from redis.cluster import RedisCluster
+from redis.crc import key_slot
+from typing import Union, List, Any, Sequence, Iterable, Iterator, Callable
 from collections.abc import MutableMapping
 
+from py_redis_client import codec
+from py_redis_client.cache.layout import PackLayout
 from py_redis_client.constants import (
     ExpiryType, CacheDataType, LIST, SET, HASHMAP,
-    ADDRESS, LIST_SEP, SET_SEP, CONVERT, UNCONVERT)
+    ADDRESS, LIST_SEP, SET_SEP, CONVERT, UNCONVERT,
+    PIPELINE_ENGINE, SCRIPT_ENGINE, TAG)
 from py_redis_client.conversions import Conversions
 from py_redis_client.db import RedisNative, RedisList, RedisSet, RedisHashMap
 from py_redis_client.db.base import _RedisDB
-from py_redis_client.exceptions import InavlidRedisKeyError, InavlidRedisValueError
+from py_redis_client.exceptions import (
+    InavlidRedisKeyError, InavlidRedisValueError, InvalidFormatError)
 from py_redis_client.pipe_execution import Operation, PipeExecution
+from py_redis_client.scripts import RESOLVE_GET, KEY_FAMILY, TAG_KEYS
+
+
+FAMILY_DELETE = "del"
+FAMILY_EXPIRE = "expire"
+FAMILY_EXISTS = "exists"
 
 
 class DBExecutions(PipeExecution):
-    def set_in_db(
+    @property
+    def cluster(self) -> bool:
+        return isinstance(self.redis, RedisCluster)
+
+    def slot_groups(self, items: Iterable,
+                    key: Callable[[Any], str] = None) -> List[list]:
+        # Redis Cluster rejects multi-key commands spanning hash slots, so
+        # those are sent once per slot. Hash tagged cache keys keep all the
+        # keys of one value in the same slot.
+        if not self.cluster:
+            return [list(items)]
+        groups = {}
+        for item in items:
+            redis_key = key(item) if key is not None else item
+            groups.setdefault(key_slot(
+                redis_key.encode("utf-8")), []).append(item)
+        return list(groups.values())
+
+    def queue_set(
             self, data: dict,
-            expiry: ExpiryType = None) -> None:
+            expiry: ExpiryType = None,
+            multi: bool = True,
+            conv: Conversions = None,
+            layout: PackLayout = None,
+            tags: Sequence[str] = None) -> None:
         self.clear_operations
+        # Address and field metadata is always written as text, only the
+        # values go through the value conversion.
         native_kwargs = {
             "data": {}, "expiry": expiry}
+        value_kwargs = {
+            "data": {}, "expiry": expiry, "conv": conv}
         
         def list_operation(
                 key, value, address = True):
@@ -29,7 +70,7 @@ class DBExecutions(PipeExecution):
             self.add_operation(Operation(
                 RedisList, "set", kwargs={
                     "key": key, "expiry": expiry,
-                    "data": value}))
+                    "data": value, "conv": conv}))
         
         def set_operation(
                 key, value, address = True):
@@ -39,22 +80,35 @@ class DBExecutions(PipeExecution):
             self.add_operation(Operation(
                 RedisSet, "set", kwargs={
                     "key": key, "expiry": expiry,
-                    "data": value}))
+                    "data": value, "conv": conv}))
         
         def hmap_operation(key, data):
-            native_kwargs["data"]["{}${}".format(
-                        key, ADDRESS)] = HASHMAP
             self.add_operation(Operation(
                 RedisHashMap, "set", kwargs={
                     "key": key, "data": data,
-                    "expiry": expiry}))
+                    "expiry": expiry, "conv": conv}))
 
-        self.add_operation(Operation(
-            _RedisDB, "db_multi"))
+        if multi and not self.cluster:
+            self.add_operation(Operation(
+                _RedisDB, "db_multi"))
+        # Values switch between the packed and the native layout, so every
+        # key of the previous value, sub-keys of nested lists and sets
+        # included, is removed before a packed one may be written.
+        replaced = list(data) if layout is not None else [
+            key for key, value in data.items() if isinstance(
+                value, (list, tuple, set, MutableMapping)) and not value]
+        if replaced:
+            self.add_operation(Operation(
+                DBExecutions, "queue_family", args=[
+                    FAMILY_DELETE, *dict.fromkeys(
+                        Mapper.logical_key(key) for key in replaced)]))
         for key, value in data.items():
             if isinstance(value, tuple):
                 value = list(value)
-            if isinstance(value, list) and value:
+            packed = layout.pack(value) if layout is not None else None
+            if packed is not None:
+                value_kwargs["data"][key] = packed
+            elif isinstance(value, list) and value:
                 list_operation(key, value)
             elif isinstance(value, set) and value:
                 set_operation(key, value)
@@ -73,6 +127,11 @@ class DBExecutions(PipeExecution):
                             key + "$" + k, v, False)
                     elif v is not None:
                         res[k] = v
+                if res or lists or sets:
+                    # Set even without scalar fields, a dict of lists and
+                    # sets has no hash key to be found by.
+                    native_kwargs["data"]["{}${}".format(
+                        key, ADDRESS)] = HASHMAP
                 if res:
                     hmap_operation(key, res)
                 if lists:
@@ -81,21 +140,50 @@ class DBExecutions(PipeExecution):
                 if sets:
                     native_kwargs["data"]["{}${}".format(
                         key, SET)] = "$".join(sets)
+            elif isinstance(value, (list, set, MutableMapping)):
+                # Empty lists, sets and dicts have no Redis type of their
+                # own, they are written packed.
+                value_kwargs["data"][key] = codec.Packed(value)
             elif value is not None:
-                native_kwargs["data"][key] = value
-        if native_kwargs["data"]:
-            self.add_operation(Operation(
-                RedisNative, "set_many", kwargs=native_kwargs))
+                value_kwargs["data"][key] = value
+        for kwargs in [native_kwargs, value_kwargs]:
+            for keys in self.slot_groups(kwargs["data"]):
+                if keys:
+                    self.add_operation(Operation(
+                        RedisNative, "set_many", kwargs={
+                            **kwargs, "data": {
+                                k: kwargs["data"][k] for k in keys}}))
+        if tags:
+            members = list(dict.fromkeys(
+                Mapper.logical_key(key) for key in data))
+            for tag in dict.fromkeys(tags):
+                self.add_operation(Operation(
+                    DBExecutions, "queue_tag", args=[tag, *members],
+                    kwargs={"expiry": expiry}))
+
+    def queue_tag(self, tag: str, *keys,
+                  expiry: ExpiryType = None) -> None:
+        TAG_KEYS.eval_on(self.redis, keys=[Mapper.tag_key(tag)], args=[
+            int(expiry.total_seconds() * 1000) if expiry else 0, *keys])
+
+    def set_in_db(
+            self, data: dict,
+            expiry: ExpiryType = None,
+            conv: Conversions = None,
+            layout: PackLayout = None,
+            tags: Sequence[str] = None) -> None:
+        self.queue_set(data, expiry, conv=conv, layout=layout, tags=tags)
         self.execute
-    
-    def get_from_db(self, *keys):
-        self.clear_operations
-        get_address = [
+
+    @staticmethod
+    def address_keys(*keys) -> List[str]:
+        return [
             "{}${}".format(key, suffix) for key in
             keys for suffix in [ADDRESS, LIST, SET]]
-        address_map = RedisNative(self.redis).get_many(
-            *get_address)
-        
+
+    def queue_get(self, address_map: dict, *keys) -> tuple:
+        self.clear_operations
+
         def add_hash_iterables(key, iterables = [LIST, SET]):
             klass_map = {LIST: RedisList, SET: RedisSet}
             iters_keys = []
@@ -114,46 +202,6 @@ class DBExecutions(PipeExecution):
                         kwargs={"key": created_key}))
                 iter_map[iterables[idx]] = iter_keys
             return iter_map
-        
-        def get_values(
-                data: dict, hash_iterables: dict,
-                native_keys: List[str]):
-            list_val, set_val, hm_val, nat_val = (
-                RedisList(self.redis).format_get,
-                RedisSet(self.redis).format_get,
-                RedisHashMap(self.redis).format_get,
-                RedisNative(self.redis).format_get_many)
-            native_val = data.pop("$native", [])
-            res = {}
-            for key, value in data.items():
-                if not value:
-                    continue
-                address = address_map.get(
-                    "{}${}".format(key, ADDRESS))
-                if address == LIST:
-                    res[key] = list_val(*value)
-                elif address == SET:
-                    res[key] = set_val(*value)
-                elif address == HASHMAP:
-                    temp = {}
-                    hmap = {}
-                    for k, v in value.items():
-                        if not v:
-                            continue
-                        if k in hash_iterables.get(
-                            key, {}).get(LIST, []):
-                            hmap[k] = list_val(*v)
-                        elif k in hash_iterables.get(
-                            key, {}).get(SET, []):
-                            hmap[k] = set_val(*v)
-                        else:
-                            temp[k] = v
-                    hmap.update(hm_val(temp))
-                    if hmap:
-                        res[key] = hmap
-            if native_keys:
-                res.update(nat_val(native_keys, native_val))
-            return res
 
         native_keys = []
         hm_iterables = {}
@@ -174,14 +222,21 @@ class DBExecutions(PipeExecution):
                 native_keys.extend([
                     key, "|" + LIST_SEP + "|" + key,
                     "|" + SET_SEP + "|" + key])
-        if native_keys:
+        groups = self.slot_groups(native_keys) if native_keys else []
+        for idx, group in enumerate(groups):
             self.add_operation(Operation(
                 RedisNative, "execute_get_many",
-                ["$native"], args=native_keys))
-        result = self.execute
+                ["$native" if idx == 0 else "$native|{}".format(idx)],
+                args=group))
+        return hm_iterables, [key for group in groups for key in group]
+
+    @staticmethod
+    def group_results(result: dict) -> dict:
         formatted_data = {}
         for k, v in result.items():
-            if "$" in k and k != "$native":
+            if k.startswith("$native|"):
+                formatted_data["$native"].extend(v)
+            elif "$" in k and k != "$native":
                 temp = k.split("$")
                 hm = formatted_data.get(temp[0], {})
                 hm.update({temp[1]: v})
@@ -191,21 +246,252 @@ class DBExecutions(PipeExecution):
                     formatted_data[k].update(v)
                 else:
                     formatted_data[k] = v
-        return get_values(
-            formatted_data, hm_iterables, native_keys)
+        return formatted_data
+
+    def get_from_db(self, *keys):
+        get_address = self.address_keys(*keys)
+        address_map = RedisNative(self.redis).get_many(
+            *get_address)
+        hm_iterables, native_keys = self.queue_get(
+            address_map, *keys)
+        return self.format_values(
+            self.group_results(self.execute), address_map,
+            hm_iterables, native_keys)
+
+    @staticmethod
+    def script_args() -> List[str]:
+        conv = Conversions(CONVERT)
+        return [
+            conv.final_value(LIST), conv.final_value(SET),
+            conv.final_value(HASHMAP), conv.final_value("")]
+
+    def get_from_db_script(self, *keys):
+        if not keys:
+            return {}
+        if not self.cluster:
+            response = RESOLVE_GET(
+                self.redis, keys=list(keys), args=self.script_args())
+            return self.format_script_response(keys, response)
+        groups = self.slot_groups(keys)
+        with self.redis.pipeline() as pipe:
+            for group in groups:
+                RESOLVE_GET.eval_on(
+                    pipe, keys=group, args=self.script_args())
+            responses = pipe.execute()
+        return self.format_script_response(
+            [key for group in groups for key in group],
+            [res for response in responses for res in response])
+
+    @staticmethod
+    def family_args(operation: str, expiry: ExpiryType = None) -> list:
+        return [operation, Conversions(CONVERT).final_value(""),
+                int(expiry.total_seconds() * 1000) if expiry else 0]
+
+    def queue_family(self, operation: str, *keys,
+                     expiry: ExpiryType = None) -> None:
+        for group in self.slot_groups(keys):
+            KEY_FAMILY.eval_on(self.redis, keys=group, args=self.family_args(
+                operation, expiry))
+
+    def family_in_db(self, operation: str, *keys,
+                     expiry: ExpiryType = None) -> int:
+        if not keys:
+            return 0
+        groups = self.slot_groups(keys)
+        if len(groups) == 1:
+            return KEY_FAMILY(self.redis, keys=groups[0],
+                              args=self.family_args(operation, expiry))
+        with self.redis.pipeline() as pipe:
+            DBExecutions(pipe).queue_family(operation, *keys, expiry=expiry)
+            return sum(pipe.execute())
+
+    @staticmethod
+    def field_names(field: str) -> List[str]:
+        return [field, "|" + LIST_SEP + "|" + field,
+                "|" + SET_SEP + "|" + field]
+
+    @staticmethod
+    def in_fields(name: str, *fields: str) -> bool:
+        for field in fields:
+            for field_name in DBExecutions.field_names(field):
+                if name == field_name or name.startswith(
+                        field_name + "|"):
+                    return True
+        return False
+
+    @staticmethod
+    def scan_patterns(field: str) -> List[str]:
+        # Anchored at the start, so a field whose name merely contains the
+        # path is not matched. The second pattern covers the separated
+        # iterables under the path, "|lsep|<field>|..." and "|ssep|...".
+        escaped = re.sub(r"([*?\[\]\\])", r"\\\1", field) + "|*"
+        return [escaped, "|[{}{}]{}|".format(
+            LIST_SEP[0], SET_SEP[0], LIST_SEP[1:]) + escaped]
+
+    def queue_get_fields(self, address_map: dict, key: str,
+                         *fields) -> tuple:
+        self.clear_operations
+        klass_map = {LIST: RedisList, SET: RedisSet}
+        iterables = {}
+        for itr, klass in klass_map.items():
+            for iter_key in address_map.get(
+                    "{}${}".format(key, itr), "").split("$"):
+                if not iter_key or not self.in_fields(iter_key, *fields):
+                    continue
+                created_key = key + "$" + iter_key
+                iterables[iter_key] = itr
+                self.add_operation(Operation(
+                    klass, "execute_get", [created_key],
+                    kwargs={"key": created_key}))
+        exact = [name for field in fields
+                 for name in self.field_names(field)]
+        self.add_operation(Operation(
+            RedisHashMap, "execute_get_fields", ["$fields"],
+            args=[key, *exact]))
+        for field in fields:
+            for idx, pattern in enumerate(self.scan_patterns(field)):
+                self.add_operation(Operation(
+                    RedisHashMap, "execute_scan",
+                    ["|{}|{}".format(idx, field)],
+                    kwargs={"key": key, "match": pattern}))
+        return iterables, exact
+
+    def get_fields_from_db(self, key: str, *fields) -> dict:
+        address_map = RedisNative(self.redis).get_many(
+            *self.address_keys(key), key)
+        address = address_map.get("{}${}".format(key, ADDRESS))
+        if address != HASHMAP:
+            packed = address_map.get(key)
+            if address is None and isinstance(packed, dict):
+                return {k: v for k, v in packed.items()
+                        if self.in_fields(k, *fields)}
+            return {}
+        iterables, exact = self.queue_get_fields(
+            address_map, key, *fields)
+        result = self.execute
+        hmap = RedisHashMap(self.redis)
+        raw = {name.encode("utf-8"): value for name, value in zip(
+            exact, result["$fields"]) if value is not None}
+        for field in fields:
+            for idx, pattern in enumerate(self.scan_patterns(field)):
+                cursor, found = result["|{}|{}".format(idx, field)]
+                raw.update(found)
+                while cursor:
+                    cursor, found = hmap.execute_scan(key, pattern, cursor)
+                    raw.update(found)
+        res = hmap.format_get({
+            k: v for k, v in raw.items()
+            if self.in_fields(k.decode("utf-8"), *fields)})
+        for iter_key, itr in iterables.items():
+            value = result.get(key + "$" + iter_key)
+            if not value:
+                continue
+            res[iter_key] = RedisList(self.redis).format_get(
+                *value) if itr == LIST else RedisSet(
+                    self.redis).format_get(*value)
+        return res
+
+    def format_script_response(self, keys, response):
+        unconv = Conversions(UNCONVERT)
+        address_map = {}
+        formatted_data = {}
+        hm_iterables = {}
+        native_keys = []
+        native_val = []
+        for key, (address, *values) in zip(keys, response):
+            if address is None:
+                native_keys.extend([
+                    key, "|" + LIST_SEP + "|" + key,
+                    "|" + SET_SEP + "|" + key])
+                native_val.extend(values[0])
+                continue
+            address = unconv.final_value(address)
+            address_map["{}${}".format(key, ADDRESS)] = address
+            if address == HASHMAP:
+                hmap_values, iterables = values
+                hmap = dict(zip(
+                    hmap_values[::2], hmap_values[1::2]))
+                iter_map = {}
+                for iter_type, iter_key, iter_values in iterables:
+                    iter_key = iter_key.decode("utf-8")
+                    hmap[iter_key] = iter_values
+                    iter_map.setdefault(unconv.final_value(
+                        iter_type), []).append(iter_key)
+                formatted_data[key] = hmap
+                hm_iterables[key] = iter_map
+            else:
+                formatted_data[key] = values[0]
+        if native_keys:
+            formatted_data["$native"] = native_val
+        return self.format_values(
+            formatted_data, address_map,
+            hm_iterables, native_keys)
+
+    def format_values(
+            self, data: dict, address_map: dict,
+            hash_iterables: dict, native_keys: List[str]):
+        list_val, set_val, hm_val, nat_val = (
+            RedisList(self.redis).format_get,
+            RedisSet(self.redis).format_get,
+            RedisHashMap(self.redis).format_get,
+            RedisNative(self.redis).format_get_many)
+        native_val = data.pop("$native", [])
+        res = {}
+        for key, value in data.items():
+            if not value:
+                continue
+            address = address_map.get(
+                "{}${}".format(key, ADDRESS))
+            if address == LIST:
+                res[key] = list_val(*value)
+            elif address == SET:
+                res[key] = set_val(*value)
+            elif address == HASHMAP:
+                temp = {}
+                hmap = {}
+                for k, v in value.items():
+                    if not v:
+                        continue
+                    if k in hash_iterables.get(
+                        key, {}).get(LIST, []):
+                        hmap[k] = list_val(*v)
+                    elif k in hash_iterables.get(
+                        key, {}).get(SET, []):
+                        hmap[k] = set_val(*v)
+                    else:
+                        temp[k] = v
+                hmap.update(hm_val(temp))
+                if hmap:
+                    res[key] = hmap
+        if native_keys:
+            res.update(nat_val(native_keys, native_val))
+        return res
 
 
 class Mapper:
     @staticmethod
-    def map_to_db(
-        redis_conn: redis.Redis,
-        data: dict, expiry: ExpiryType = None,
-        separator: Union[str, None] = None) -> None:
+    def chunks(items: Iterable, size: int) -> Iterator[list]:
+        items = iter(items)
+        chunk = list(islice(items, size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(items, size))
+
+    @staticmethod
+    def validate_chunk_size(chunk_size: Any) -> None:
+        if type(chunk_size) is not int or chunk_size < 1:
+            raise InvalidFormatError(
+                "Invalid chunk size - {}".format(chunk_size))
+
+    @staticmethod
+    def format_to_db(
+        data: dict,
+        separator: Union[str, None] = None) -> dict:
         conv = Conversions(CONVERT)
 
         def separator_iterable(
                 key: str, value: Any, res: dict):
-            if (separator is not None
+            if (separator is not None and value
                 and (isinstance(value, list)
                      or isinstance(value, set))):
                 iter_type = LIST_SEP if isinstance(
@@ -253,7 +539,7 @@ class Mapper:
                     "Cache keys cannot contain $ or |")
             if isinstance(v, tuple):
                 v = list(v)
-            if not v:
+            if v is None:
                 continue
             if isinstance(v, MutableMapping):
                 res = {}
@@ -261,15 +547,35 @@ class Mapper:
                 to_map[k] = res
             else:
                 separator_iterable(k, v, to_map)
+        return to_map
 
+    @staticmethod
+    def map_to_db(
+        redis_conn: redis.Redis,
+        data: dict, expiry: ExpiryType = None,
+        separator: Union[str, None] = None,
+        conv: Conversions = None,
+        layout: PackLayout = None,
+        tags: Sequence[str] = None) -> None:
         DBExecutions(redis_conn).set_in_db(
-            to_map, expiry)
-    
+            Mapper.format_to_db(data, separator), expiry, conv, layout, tags)
+
     @staticmethod
-    def unmap_from_db(
-        redis_conn: client.Pipeline,
-        *keys) -> dict[str: CacheDataType]:
-        unconv = Conversions(UNCONVERT, False)
+    def validate_keys(*keys) -> None:
+        conv = Conversions(UNCONVERT)
+        for key in keys:
+            conv.key_validate(key)
+
+    @staticmethod
+    def validate_read_engine(read_engine: str) -> None:
+        if read_engine not in (PIPELINE_ENGINE, SCRIPT_ENGINE):
+            raise InvalidFormatError(
+                "Invalid read engine - {}".format(read_engine))
+
+    @staticmethod
+    def format_from_db(
+        result: dict) -> dict[str: CacheDataType]:
+        unconv = Conversions(UNCONVERT)
         
         def deseparate_iterable(
                 key: str, value: Any):
@@ -300,10 +606,6 @@ class Mapper:
             else:
                 res[curr_key] = value
 
-        for key in keys:
-            unconv.key_validate(key)
-        result = DBExecutions(redis_conn).get_from_db(
-            *keys)
         to_return = {}
         for k, v in result.items():
             k, v = deseparate_iterable(k, v)
@@ -318,11 +620,152 @@ class Mapper:
         return to_return
 
     @staticmethod
-    def delete_from_db(redis_conn: redis.Redis, *keys: str) -> None:
-        keys_to_delete = []
-        for key in keys:
-            keys_to_delete.extend([
-                key,
-                "|" + LIST_SEP + "|" + key,
-                "|" + SET_SEP + "|" + key])
-        _RedisDB(redis_conn).delete(*keys_to_delete)
+    def unmap_from_db(
+        redis_conn: client.Pipeline,
+        *keys, read_engine: str = PIPELINE_ENGINE
+        ) -> dict[str: CacheDataType]:
+        Mapper.validate_keys(*keys)
+        Mapper.validate_read_engine(read_engine)
+        if read_engine == SCRIPT_ENGINE:
+            result = DBExecutions(
+                redis_conn).get_from_db_script(*keys)
+        else:
+            result = DBExecutions(redis_conn).get_from_db(
+                *keys)
+        return Mapper.format_from_db(result)
+
+    @staticmethod
+    def path_field(path: Union[str, Sequence]) -> tuple:
+        conv = Conversions(CONVERT)
+        segments = path.split("|") if isinstance(
+            path, str) else list(path)
+        fields = []
+        for segment in segments:
+            field = conv.final_value(segment)
+            if "$" in field or "|" in field:
+                raise InavlidRedisKeyError(
+                    "Cache keys cannot contain $ or |")
+            fields.append(field)
+        return segments, "|".join(fields)
+
+    @staticmethod
+    def unmap_fields_from_db(
+        redis_conn: redis.Redis, key: str,
+        *paths: Union[str, Sequence]) -> dict:
+        Mapper.validate_keys(key)
+        resolved = [Mapper.path_field(path) for path in paths]
+        if not resolved:
+            return {}
+        flat = DBExecutions(redis_conn).get_fields_from_db(
+            key, *[field for _, field in resolved])
+        value = Mapper.format_from_db({key: flat})[key]
+        res = {}
+        for path, (segments, _) in zip(paths, resolved):
+            node = value
+            for segment in segments:
+                if not isinstance(node, MutableMapping) or (
+                        segment not in node):
+                    break
+                node = node[segment]
+            else:
+                res[path if isinstance(path, str) else tuple(
+                    path)] = node
+        return res
+
+    @staticmethod
+    def hash_tag(key: str) -> str:
+        # Redis Cluster hashes only the part between the first braces, so
+        # every composite key of a tagged key lands in its slot.
+        Mapper.validate_keys(key)
+        return "{" + key + "}"
+
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        Mapper.validate_keys(tag)
+        return "|" + TAG + "|" + tag
+
+    @staticmethod
+    def pop_tagged(redis_conn: redis.Redis, tag: str, count: int) -> List[
+            str]:
+        # SPOP takes the keys out of the index as they are read, so keys
+        # tagged meanwhile stay indexed for the next invalidation.
+        return [key.decode("utf-8") if isinstance(key, bytes) else key
+                for key in redis_conn.spop(Mapper.tag_key(tag), count) or []]
+
+    @staticmethod
+    def logical_key(redis_key: str) -> str:
+        if redis_key.startswith("|"):
+            return redis_key.split("|", maxsplit=2)[-1]
+        return redis_key.split("$", maxsplit=1)[0]
+
+    @staticmethod
+    def escape_pattern(value: str) -> str:
+        return re.sub(r"([*?\[\]\\])", r"\\\1", value)
+
+    @staticmethod
+    def scan_chunks(
+            redis_conn: redis.Redis, *patterns: str, count: int = 1000,
+            accept: Callable[[str], bool] = None) -> Iterator[List[str]]:
+        # SCAN walks the keyspace in steps of about count keys, so Redis
+        # serves other clients between the steps.
+        db = _RedisDB(redis_conn)
+        for pattern in patterns:
+            found = (key.decode("utf-8") if isinstance(key, bytes) else key
+                     for key in db.scan_iter(pattern, count))
+            if accept is not None:
+                found = filter(accept, found)
+            yield from Mapper.chunks(found, count)
+
+    @staticmethod
+    def throttle(chunks: Iterable[list],
+                 rate: float = None) -> Iterator[list]:
+        # Holds each chunk back until the keys passed so far fit in rate keys
+        # a second.
+        start = time.monotonic()
+        passed = 0
+        for chunk in chunks:
+            if rate:
+                wait = passed / rate - (time.monotonic() - start)
+                if wait > 0:
+                    time.sleep(wait)
+            yield chunk
+            passed += len(chunk)
+
+    @staticmethod
+    def validate_rate(rate: Any) -> None:
+        if rate is not None and (
+                type(rate) not in (int, float) or rate <= 0):
+            raise InvalidFormatError("Invalid rate - {}".format(rate))
+
+    @staticmethod
+    def unlink_matching(
+            redis_conn: redis.Redis, *patterns: str, count: int = 1000,
+            accept: Callable[[str], bool] = None, rate: float = None,
+            progress: Callable[[int], None] = None) -> int:
+        # Every batch found is removed with UNLINK, the memory being
+        # reclaimed off the main thread of Redis.
+        db = _RedisDB(redis_conn)
+        removed = 0
+        for chunk in Mapper.throttle(Mapper.scan_chunks(
+                redis_conn, *patterns, count=count, accept=accept), rate):
+            removed += db.unlink(*chunk)
+            if progress is not None:
+                progress(removed)
+        return removed
+
+    @staticmethod
+    def delete_from_db(redis_conn: redis.Redis, *keys: str) -> int:
+        Mapper.validate_keys(*keys)
+        return DBExecutions(redis_conn).family_in_db(FAMILY_DELETE, *keys)
+
+    @staticmethod
+    def expire_in_db(redis_conn: redis.Redis, expiry: ExpiryType,
+                     *keys: str) -> int:
+        Mapper.validate_keys(*keys)
+        return DBExecutions(redis_conn).family_in_db(
+            FAMILY_EXPIRE, *keys, expiry=expiry)
+
+    @staticmethod
+    def count_in_db(redis_conn: redis.Redis, *keys: str) -> int:
+        Mapper.validate_keys(*keys)
+        return DBExecutions(redis_conn).family_in_db(FAMILY_EXISTS, *keys)
@@ -0,0 +1,128 @@
+import redis
+from typing import Union, Any, Callable, Iterator, List, Sequence
+
+from py_redis_client.cache.mapper import DBExecutions, Mapper
+from py_redis_client.constants import (
+    RedisNativeTypes, LIST, SET, HASHMAP, ADDRESS)
+from py_redis_client.db import RedisNative, RedisList, RedisSet
+from py_redis_client.exceptions import InvalidFormatError
+
+
+class Members:
+    """
+    Partial access to stored lists and sets.
+
+    Natively stored lists and sets are read in windows with LRANGE and SSCAN
+    and decoded one window at a time. Packed and separated ones are small by
+    construction and read whole.
+    """
+
+    @staticmethod
+    def locate(redis_conn: redis.Redis, key: str,
+               path: Union[str, Sequence] = None) -> tuple:
+        """
+        Finds where a list or set is stored.
+
+        Returns:
+            tuple: LIST or SET and the Redis key of a natively stored list or
+            set, else None and the decoded value, None if not found.
+        """
+        Mapper.validate_keys(key)
+        address_map = RedisNative(redis_conn).get_many(
+            *DBExecutions.address_keys(key))
+        address = address_map.get("{}${}".format(key, ADDRESS))
+        if path is None:
+            if address in (LIST, SET):
+                return address, key
+            value = Mapper.unmap_from_db(redis_conn, key).get(key)
+        else:
+            segments, field = Mapper.path_field(path)
+            if address == HASHMAP:
+                for itr in (LIST, SET):
+                    if field in address_map.get(
+                            "{}${}".format(key, itr), "").split("$"):
+                        return itr, key + "$" + field
+            value = Mapper.unmap_fields_from_db(
+                redis_conn, key, segments).get(tuple(segments))
+        if value is not None and not isinstance(value, (list, set)):
+            raise InvalidFormatError(
+                "Value of key '{}' is not a list or set.".format(key))
+        return None, value
+
+    @staticmethod
+    def get_range(redis_conn: redis.Redis, key: str, start: int,
+                  stop: Union[int, None],
+                  path: Union[str, Sequence] = None) -> List[
+                      RedisNativeTypes]:
+        kind, found = Members.locate(redis_conn, key, path)
+        if kind == SET or isinstance(found, set):
+            raise InvalidFormatError(
+                "Value of key '{}' is a set, which has no order.".format(key))
+        if kind is None:
+            return (found or [])[start:stop]
+        if stop is None:
+            end = -1
+        elif stop == 0:
+            return []
+        else:
+            end = stop - 1
+        return RedisList(redis_conn).format_get(*RedisList(
+            redis_conn).execute_get_range(found, start, end))
+
+    @staticmethod
+    def length(redis_conn: redis.Redis, key: str,
+               path: Union[str, Sequence] = None) -> int:
+        kind, found = Members.locate(redis_conn, key, path)
+        if kind == LIST:
+            return RedisList(redis_conn).execute_len(found)
+        if kind == SET:
+            return RedisSet(redis_conn).execute_len(found)
+        return len(found or [])
+
+    @staticmethod
+    def iterate(redis_conn: redis.Redis, key: str, chunk_size: int,
+                path: Union[str, Sequence] = None,
+                route: Callable[[Callable[[redis.Redis], Any]], Any] = None
+                ) -> Iterator[RedisNativeTypes]:
+        """
+        Iterates over a list or set, chunk_size members per read.
+
+        Args:
+            route (Callable, optional): Function running each read with the
+                client it picks, such as ReplicaRouter.read. Defaults to None,
+                for reading with redis_conn.
+
+        Note:
+            SSCAN cursors are only valid on the server that returned them,
+            so a set scan served by another server restarts, and members
+            already yielded may be yielded again.
+        """
+        if route is None:
+            def route(read):
+                return read(redis_conn)
+        kind, found = route(lambda conn: Members.locate(conn, key, path))
+        if kind is None:
+            yield from found or []
+        elif kind == LIST:
+            db = RedisList(redis_conn)
+            start = 0
+            while True:
+                chunk = route(lambda conn: RedisList(
+                    conn).execute_get_range(
+                        found, start, start + chunk_size - 1))
+                yield from db.format_get(*chunk)
+                if len(chunk) < chunk_size:
+                    break
+                start += chunk_size
+        else:
+            db = RedisSet(redis_conn)
+            scanned_on, cursor = None, 0
+
+            def scan(conn):
+                return conn, RedisSet(conn).execute_scan(
+                    found, cursor if conn is scanned_on else 0, chunk_size)
+            while True:
+                scanned_on, (cursor, chunk) = route(scan)
+                yield from db.format_get(*chunk)
+                if not cursor:
+                    break
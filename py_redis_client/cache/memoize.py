@@ -0,0 +1,99 @@
+import datetime
+import functools
+import hashlib
+import inspect
+from collections.abc import Mapping
+from typing import Any, Callable, Iterable, List
+
+from py_redis_client.exceptions import InavlidRedisKeyError
+
+
+MEMOIZE_PREFIX = "memoize"
+
+_SCALARS = (
+    str, int, float, bool, type(None), datetime.datetime,
+    datetime.date, datetime.time)
+
+
+def _key_part(value: Any) -> str:
+    if isinstance(value, _SCALARS):
+        return type(value).__name__ + repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_key_part(v) for v in value) + "]"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_key_part(v) for v in value)) + "}"
+    if isinstance(value, Mapping):
+        return "{" + ",".join(sorted(
+            _key_part(k) + ":" + _key_part(v)
+            for k, v in value.items())) + "}"
+    raise InavlidRedisKeyError(
+        "Memoized argument not hashable to a stable key - {}. "
+        "Type - {}".format(value, type(value).__name__))
+
+
+class Memoized:
+    """
+    Callable wrapper caching the results of a function in a Cache.
+
+    Keys are built from the module and qualified name of the function and a
+    digest of its bound arguments, so calls passing the same arguments
+    positionally or by keyword share a key. Falsy results such as 0, False,
+    "" or [] are cached too, None results are not.
+    """
+
+    def __init__(self, cache, fn: Callable, timeout: int = None,
+                 prefix: str = MEMOIZE_PREFIX) -> None:
+        self.cache = cache
+        self.fn = fn
+        self.timeout = timeout
+        self.prefix = prefix
+        self.__signature = inspect.signature(fn)
+        self.__name = "{}.{}".format(fn.__module__, fn.__qualname__)
+        functools.update_wrapper(self, fn)
+
+    def key(self, *args, **kwargs) -> str:
+        bound = self.__signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        digest = hashlib.sha1(_key_part(
+            dict(bound.arguments)).encode("utf-8")).hexdigest()
+        return "{}:{}:{}".format(self.prefix, self.__name, digest)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        key = self.key(*args, **kwargs)
+        value = self.cache.get(key)
+        if value is None:
+            value = self.fn(*args, **kwargs)
+            if value is not None:
+                self.cache.set(key, value, self.timeout)
+        return value
+
+    def many(self, args_list: Iterable[tuple]) -> List[Any]:
+        """
+        Calls the function for each tuple of positional arguments.
+
+        All the cached results are fetched with a single get_many, the
+        function only runs for the misses and their results are stored with a
+        single set_many.
+
+        Args:
+            args_list (Iterable[tuple]): Positional arguments of each call.
+
+        Returns:
+            list: The results, in the order of args_list.
+        """
+        args_list = [tuple(args) for args in args_list]
+        keys = [self.key(*args) for args in args_list]
+        found = self.cache.get_many(*dict.fromkeys(keys))
+        computed = {}
+        for key, args in zip(keys, args_list):
+            if key not in found and key not in computed:
+                computed[key] = self.fn(*args)
+        to_store = {key: value for key, value in computed.items()
+                    if value is not None}
+        if to_store:
+            self.cache.set_many(to_store, self.timeout)
+        return [found[key] if key in found else computed[key]
+                for key in keys]
+
+    def invalidate(self, *args, **kwargs) -> bool:
+        return self.cache.delete(self.key(*args, **kwargs))
@@ -0,0 +1,30 @@
+from py_redis_client.cache.loader import batching_scope
+
+
+class CacheBatchingMiddleware:
+    """
+    Django middleware scoping cache read batching to each request.
+
+    Within a request, every key is fetched at most once per cache and keys
+    queued with Cache.load() are fetched together with the next read.
+
+    Usage:
+        Add it to the middleware of the Django settings:
+
+            MIDDLEWARE = [
+                ...,
+                "py_redis_client.cache.middleware.CacheBatchingMiddleware",
+            ]
+
+    Note:
+        Values read are kept for the whole request, so writes made by other
+        processes during the request are not seen. Writes through the same
+        Cache are.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with batching_scope():
+            return self.get_response(request)
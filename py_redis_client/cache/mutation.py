@@ -0,0 +1,270 @@
+import datetime
+import redis
+from collections.abc import MutableMapping
+from typing import Union, Any, List, Sequence
+
+from py_redis_client.cache.layout import PackLayout
+from py_redis_client.cache.mapper import DBExecutions, Mapper, FAMILY_DELETE
+from py_redis_client.constants import (
+    CacheDataType, CONVERT, UNCONVERT, LIST, SET, HASHMAP,
+    LIST_SEP, SET_SEP)
+from py_redis_client.conversions import Conversions
+from py_redis_client.exceptions import InvalidFormatError
+from py_redis_client.scripts import UPDATE_VALUE, INCREMENT as INCREMENT_SCRIPT
+
+
+LIST_PUSH = "rpush"
+SET_ADD = "sadd"
+SET_REMOVE = "srem"
+FIELD_VALUE = "hset"
+FIELD_DELETE = "hdel"
+FIELD_LIST = LIST
+FIELD_MEMBERS = SET
+INCREMENT = "incr"
+
+
+class Mutation:
+    """
+    In-place updates of stored lists, sets and dicts.
+
+    Operations are (operation, path, values) records, the path being the
+    keys leading to the updated part of a dict, or empty for the value
+    itself. On the native layout they run as deltas in a single Lua script
+    call, keeping the address and field keys consistent and giving new
+    sub-keys the remaining expiry of the value. Packed and separated values
+    are read, updated and rewritten whole in a WATCH transaction.
+    """
+
+    @staticmethod
+    def operations_from_fields(
+            fields: dict, path: List = None) -> List[tuple]:
+        operations = []
+        for k, v in fields.items():
+            segments = (path or []) + [k]
+            if isinstance(v, tuple):
+                v = list(v)
+            if isinstance(v, MutableMapping):
+                operations.extend(
+                    Mutation.operations_from_fields(v, segments))
+            elif isinstance(v, list) and v:
+                operations.append((FIELD_LIST, segments, v))
+            elif isinstance(v, set) and v:
+                operations.append((FIELD_MEMBERS, segments, list(v)))
+            elif v is not None and not isinstance(v, (list, set)):
+                operations.append((FIELD_VALUE, segments, [v]))
+        return operations
+
+    @staticmethod
+    def script_args(operations: List[tuple],
+                    conv: Conversions = None) -> List[Any]:
+        conv = conv or Conversions(CONVERT)
+        args = DBExecutions.script_args()
+        for operation, path, values in operations:
+            field = Mapper.path_field(path)[1] if path else ""
+            args.extend([operation, field, len(values)])
+            args.extend(conv.final_value(value) for value in values)
+        return args
+
+    @staticmethod
+    def __parent(value: dict, path: Sequence, create: bool) -> Union[
+            dict, None]:
+        node = value
+        for segment in path[:-1]:
+            child = node.get(segment)
+            if not isinstance(child, MutableMapping):
+                if not create:
+                    return None
+                child = node[segment] = {}
+            node = child
+        return node
+
+    @staticmethod
+    def __apply_one(value: Union[CacheDataType, None], operation: str,
+                    path: Sequence, values: list) -> tuple:
+        res = None
+        creates = operation not in (SET_REMOVE, FIELD_DELETE)
+        if not path:
+            parent, target = None, value
+        else:
+            if value is None and creates:
+                value = {}
+            if not isinstance(value, MutableMapping):
+                if value is None:
+                    return value, 0
+                raise InvalidFormatError(
+                    "Value updated by path is not a dict.")
+            parent = Mutation.__parent(value, path, creates)
+            if parent is None:
+                return value, 0
+            target = parent.get(path[-1])
+        if operation == FIELD_DELETE:
+            parent.pop(path[-1], None)
+            return value, None
+        if operation == INCREMENT:
+            if target is None:
+                target = 0
+            if type(target) not in (int, float):
+                raise InvalidFormatError("Value updated is not a number.")
+            target = res = target + values[0]
+        elif operation == FIELD_VALUE:
+            target = values[0]
+        elif operation == FIELD_LIST:
+            target = list(values)
+        elif operation == FIELD_MEMBERS:
+            target = set(values)
+        elif operation == LIST_PUSH:
+            if target is None:
+                target = []
+            if not isinstance(target, list):
+                raise InvalidFormatError("Value updated is not a list.")
+            target.extend(values)
+            res = len(target)
+        else:
+            if target is None and operation == SET_REMOVE:
+                return value, 0
+            if target is None:
+                target = set()
+            if not isinstance(target, set):
+                raise InvalidFormatError("Value updated is not a set.")
+            size = len(target)
+            if operation == SET_ADD:
+                target.update(values)
+                res = len(target) - size
+            else:
+                target.difference_update(values)
+                res = size - len(target)
+        if not path:
+            value = target
+        elif operation == SET_REMOVE and not target:
+            parent.pop(path[-1], None)
+        else:
+            parent[path[-1]] = target
+        return value, res
+
+    @staticmethod
+    def apply(value: Union[CacheDataType, None],
+              operations: List[tuple]) -> tuple:
+        """
+        Applies operations to a decoded value.
+
+        Returns:
+            tuple: The updated value and the result of each operation, the
+            length or number of members changed for rpush, sadd and srem and
+            the new value for incr.
+        """
+        results = []
+        for operation, path, values in operations:
+            value, res = Mutation.__apply_one(value, operation, path, values)
+            results.append(res)
+        return value, results
+
+    @staticmethod
+    def rewrite_in_db(
+            redis_conn: redis.Redis, key: str, operations: List[tuple],
+            conv: Conversions = None, layout: PackLayout = None) -> list:
+        value_keys = [
+            key, "|" + LIST_SEP + "|" + key, "|" + SET_SEP + "|" + key]
+        # Cluster pipelines only support WATCH in transaction mode, the
+        # default of the other pipelines.
+        with redis_conn.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    pipe.watch(*value_keys, *DBExecutions.address_keys(key))
+                    value = Mapper.unmap_from_db(redis_conn, key).get(key)
+                    ttl = max(pipe.pttl(k) for k in value_keys)
+                    value, results = Mutation.apply(value, operations)
+                    pipe.multi()
+                    executions = DBExecutions(pipe)
+                    executions.queue_family(FAMILY_DELETE, key)
+                    if value:
+                        executions.queue_set(
+                            Mapper.format_to_db({key: value}),
+                            datetime.timedelta(milliseconds=ttl)
+                            if ttl > 0 else None, multi=False,
+                            conv=conv, layout=layout)
+                        executions.batch.queue_on(pipe)
+                    pipe.execute()
+                    return results
+                except redis.WatchError:
+                    continue
+
+    @staticmethod
+    def update_in_db(
+            redis_conn: redis.Redis, key: str, operations: List[tuple],
+            conv: Conversions = None, layout: PackLayout = None) -> int:
+        Mapper.validate_keys(key)
+        if not operations:
+            return 0
+        res = UPDATE_VALUE(redis_conn, keys=[key], args=Mutation.script_args(
+            operations, conv))
+        if res == -2:
+            raise InvalidFormatError(
+                "Value of key '{}' does not support the update.".format(key))
+        if res == -1:
+            return Mutation.rewrite_in_db(
+                redis_conn, key, operations, conv, layout)[-1]
+        return res
+
+    @staticmethod
+    def increment_in_db(
+            redis_conn: redis.Redis, counters: List[tuple],
+            conv: Conversions = None,
+            layout: PackLayout = None) -> List[Union[int, float]]:
+        """
+        Increments counters atomically, in a single script call, or one per
+        hash slot on Redis Cluster.
+
+        Args:
+            counters (list): (key, path, amount) records, path being empty for
+                the value of the key itself.
+
+        Returns:
+            list: The new value of each counter.
+        """
+        unique = {}
+        for key, path, amount in counters:
+            Mapper.validate_keys(key)
+            if type(amount) not in (int, float):
+                raise InvalidFormatError(
+                    "Increment amount wrong. Expected int or float, "
+                    "got {}.".format(type(amount)))
+            field = Mapper.path_field(path)[1] if path else ""
+            previous = unique.get((key, field))
+            unique[(key, field)] = (path, amount + (
+                previous[1] if previous else 0))
+        if not unique:
+            return []
+        text = Conversions(CONVERT)
+        response = []
+        groups = DBExecutions(redis_conn).slot_groups(
+            unique, key=lambda item: item[0])
+        for group in groups:
+            args = [text.final_value(HASHMAP), text.final_value("")]
+            for item in group:
+                amount = unique[item][1]
+                args.extend([item[1], repr(amount), "f" if isinstance(
+                    amount, float) else "i"])
+            try:
+                response.extend(INCREMENT_SCRIPT(redis_conn, keys=[
+                    key for key, _ in group], args=args))
+            except redis.ResponseError as err:
+                raise InvalidFormatError(str(err))
+        unique = {item: unique[item] for group in groups for item in group}
+        unconv = Conversions(UNCONVERT)
+        values = {}
+        rewrites = {}
+        for ((key, field), (path, amount)), value in zip(
+                unique.items(), response):
+            if value is None:
+                rewrites.setdefault(key, []).append(
+                    (field, (INCREMENT, path, [amount])))
+            else:
+                values[(key, field)] = unconv.final_value(value)
+        for key, operations in rewrites.items():
+            results = Mutation.rewrite_in_db(
+                redis_conn, key, [operation for _, operation in operations],
+                conv, layout)
+            for (field, _), value in zip(operations, results):
+                values[(key, field)] = value
+        return [values[(key, Mapper.path_field(path)[1] if path else "")]
+                for key, path, _ in counters]
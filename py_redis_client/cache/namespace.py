@@ -0,0 +1,271 @@
+import threading
+import time
+from typing import Union, Callable, Iterable
+
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.cache.memoize import Memoized, MEMOIZE_PREFIX
+from py_redis_client.constants import CacheDataType, NAMESPACE
+from py_redis_client.exceptions import InvalidFormatError
+
+
+class Namespace:
+    """
+    A view of a Cache storing its keys under the generation of a namespace.
+
+    Keys are stored as "ns:<name>#<generation>:<key>", the generation being
+    a counter kept in Redis under "|ns|<name>" and cached in the process for
+    generation_ttl seconds. invalidate() increments the counter with a single
+    INCR, so every key of the namespace is missed at once, and the keys of
+    older generations age out with their expiry, or are removed by reap()
+    with SCAN and UNLINK.
+
+    Other processes keep reading the previous generation until their cached
+    counter expires, for at most generation_ttl seconds.
+
+    Attributes:
+        cache (Cache): The cache the keys are stored in.
+        name (str): Name of the namespace.
+        generation_ttl (float): Seconds the generation is cached in the
+            process. 0 reads it from Redis on every call.
+
+    Usage:
+
+        store = cache.namespace("store:42")
+        store.set("inventory", inventory, timeout=3600)
+        store.invalidate(reap=True)
+    """
+
+    def __init__(self, cache, name: str,
+                 generation_ttl: float = 1.0) -> None:
+        if not isinstance(name, str) or not name or any(
+                char in name for char in "#$|"):
+            raise InvalidFormatError(
+                f"Namespace name wrong. Expected non-empty str without '#', "
+                f"'$' or '|', got {name!r}."
+            )
+        if not isinstance(generation_ttl, (int, float)) or (
+                generation_ttl < 0):
+            raise InvalidFormatError(
+                f"Namespace generation ttl wrong. Expected non-negative "
+                f"number, got {generation_ttl}."
+            )
+        self.cache = cache
+        self.name = name
+        self.generation_ttl = generation_ttl
+        self.__generation_key = "|" + NAMESPACE + "|" + name
+        self.__prefix = NAMESPACE + ":" + name + "#"
+        self.__generation = None
+        self.__fetched_at = None
+        self.__lock = threading.Lock()
+
+    def __fetch_generation(self) -> int:
+        redis_conn = self.cache.redis_conn
+        generation = redis_conn.get(self.__generation_key)
+        if generation is None:
+            # Counters start from the clock rather than 0, so a counter lost
+            # to eviction never brings back the keys of an older generation.
+            redis_conn.set(
+                self.__generation_key, int(time.time() * 1000), nx=True)
+            generation = redis_conn.get(self.__generation_key)
+        return int(generation)
+
+    def __store_generation(self, generation: int) -> int:
+        with self.__lock:
+            self.__generation = generation
+            self.__fetched_at = time.monotonic()
+        return generation
+
+    @property
+    def generation(self) -> int:
+        """
+        The current generation of the namespace, cached for generation_ttl
+        seconds.
+        """
+        with self.__lock:
+            if self.__fetched_at is not None and (
+                    time.monotonic() - self.__fetched_at
+                    < self.generation_ttl):
+                return self.__generation
+        return self.__store_generation(self.__fetch_generation())
+
+    def key(self, key: str) -> str:
+        """
+        Returns the cache key a key of the namespace is stored under, in the
+        current generation.
+        """
+        Mapper.validate_keys(key)
+        return "{}{}:{}".format(self.__prefix, self.generation, key)
+
+    def __keys(self, keys) -> dict[str, str]:
+        Mapper.validate_keys(*keys)
+        prefix = "{}{}:".format(self.__prefix, self.generation)
+        return {prefix + key: key for key in keys}
+
+    def invalidate(self, reap: bool = False) -> int:
+        """
+        Invalidates every key of the namespace with a single INCR.
+
+        Args:
+            reap (bool, optional): Remove the keys of the older generations
+                in a background thread, see reap. Defaults to False.
+
+        Returns:
+            int: The new generation.
+        """
+        with self.cache.redis_conn.pipeline(transaction=False) as pipe:
+            pipe.set(self.__generation_key, int(time.time() * 1000), nx=True)
+            pipe.incr(self.__generation_key)
+            generation = self.__store_generation(pipe.execute()[-1])
+        if reap:
+            threading.Thread(
+                target=self.reap, args=(generation,), daemon=True,
+                name="py-redis-client-reaper").start()
+        return generation
+
+    def reap(self, generation: int = None, count: int = 1000,
+             rate: float = None,
+             progress: Callable[[int], None] = None) -> int:
+        """
+        Removes the keys of the generations older than a generation.
+
+        The keyspace is walked with SCAN, about count keys per step, and the
+        keys found are removed with UNLINK, so Redis keeps serving other
+        clients throughout.
+
+        Args:
+            generation (int, optional): Oldest generation kept. Defaults to
+                None, for the current generation read from Redis.
+            count (int, optional): Keys per SCAN step and UNLINK. Defaults
+                to 1000.
+            rate (float, optional): Most Redis keys a second removed.
+                Defaults to the maintenance_rate of the cache.
+            progress (Callable, optional): Function called after each UNLINK
+                with the number of Redis keys removed so far. Defaults to None.
+
+        Returns:
+            int: The number of Redis keys removed.
+        """
+        Mapper.validate_chunk_size(count)
+        Mapper.validate_rate(rate)
+        if generation is None:
+            generation = self.__store_generation(self.__fetch_generation())
+        tag = "{" if self.cache.cluster else ""
+        pattern = tag + Mapper.escape_pattern(self.__prefix) + "*"
+
+        def is_stale(redis_key: str) -> bool:
+            if redis_key.startswith("|"):
+                redis_key = redis_key.split("|", maxsplit=2)[-1]
+            found = redis_key[len(tag + self.__prefix):].split(":", 1)[0]
+            return found.isdigit() and int(found) < generation
+        return Mapper.unlink_matching(
+            self.cache.redis_conn, pattern, "|*|" + pattern, count=count,
+            accept=is_stale, rate=rate or self.cache.maintenance_rate,
+            progress=progress)
+
+    def get(self, key: str) -> Union[CacheDataType, None]:
+        """
+        Retrieves a value for a given key of the namespace, see Cache.get.
+        """
+        return self.cache.get(self.key(key))
+
+    def get_many(self, *keys: str) -> dict[str, CacheDataType]:
+        """
+        Retrieves values for multiple keys of the namespace, see
+        Cache.get_many.
+        """
+        keys = self.__keys(keys)
+        return {keys[key]: value
+                for key, value in self.cache.get_many(*keys).items()}
+
+    def set(self, key: str, value: CacheDataType, timeout: int = None,
+            separator: str = "", tags: Iterable[str] = None) -> None:
+        """
+        Stores a single key-value pair in the namespace, see Cache.set.
+        """
+        self.cache.set(self.key(key), value, timeout, separator, tags)
+
+    def set_many(self, data: dict[str, CacheDataType], timeout: int = None,
+                 separator: str = "", tags: Iterable[str] = None) -> None:
+        """
+        Stores multiple key-value pairs in the namespace, see Cache.set_many.
+        """
+        if not isinstance(data, dict):
+            raise InvalidFormatError(
+                f"Cache set format wrong. Expected dict, got {type(data)}."
+            )
+        self.cache.set_many(
+            {key: data[k] for key, k in self.__keys(data).items()},
+            timeout, separator, tags)
+
+    def delete(self, *keys: str) -> bool:
+        """
+        Deletes keys of the namespace, see Cache.delete.
+        """
+        return self.cache.delete(*self.__keys(keys))
+
+    def exists(self, *keys: str) -> bool:
+        """
+        Checks if all keys exist in the namespace, see Cache.exists.
+        """
+        return self.cache.exists(*self.__keys(keys))
+
+    def expire(self, expiry: int, *keys: str) -> bool:
+        """
+        Sets an expiration time for keys of the namespace, see Cache.expire.
+        """
+        return self.cache.expire(expiry, *self.__keys(keys))
+
+    def incr(self, key: str, amount: Union[int, float] = 1) -> Union[
+            int, float]:
+        """
+        Increments a counter of the namespace atomically, see Cache.incr.
+        """
+        return self.cache.incr(self.key(key), amount)
+
+    def decr(self, key: str, amount: Union[int, float] = 1) -> Union[
+            int, float]:
+        """
+        Decrements a counter of the namespace atomically, see Cache.decr.
+        """
+        return self.cache.decr(self.key(key), amount)
+
+    def incr_many(self, counters: dict[str, Union[int, float]]) -> dict[
+            str, Union[int, float]]:
+        """
+        Increments counters of the namespace atomically, see
+        Cache.incr_many.
+        """
+        if not isinstance(counters, dict):
+            raise InvalidFormatError(
+                f"Cache incr format wrong. Expected dict, got {type(counters)}."
+            )
+        keys = self.__keys(counters)
+        return {keys[key]: value for key, value in self.cache.incr_many(
+            {key: counters[k] for key, k in keys.items()}).items()}
+
+    def get_or_set(self, key: str, producer: Callable[[], CacheDataType],
+                   timeout: int = None, separator: str = "",
+                   lease_timeout: int = 10, wait_timeout: float = 5.0,
+                   beta: float = None) -> Union[CacheDataType, None]:
+        """
+        Retrieves a value of the namespace, computing and storing it once on
+        a miss, see Cache.get_or_set.
+        """
+        return self.cache.get_or_set(
+            self.key(key), producer, timeout, separator, lease_timeout,
+            wait_timeout, beta)
+
+    def memoize(self, timeout: int = None,
+                prefix: str = MEMOIZE_PREFIX) -> Callable[[Callable], Memoized]:
+        """
+        Decorator caching the results of a function in the namespace, see
+        Cache.memoize.
+        """
+        if timeout is not None and not isinstance(timeout, int):
+            raise InvalidFormatError(
+                f"Cache memoize expiry wrong. Expected int, got {type(timeout)}."
+            )
+
+        def decorator(fn: Callable) -> Memoized:
+            return Memoized(self, fn, timeout, prefix)
+        return decorator
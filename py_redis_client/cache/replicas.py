@@ -0,0 +1,185 @@
+import threading
+import time
+import redis
+from typing import Union, Any, Callable, List, Iterable
+
+from py_redis_client.constants import ROUND_ROBIN, LEAST_LATENCY
+from py_redis_client.exceptions import InvalidFormatError
+
+
+class _Replica:
+    __slots__ = ("client", "latency", "usable", "checked_at")
+
+    def __init__(self, client: redis.Redis) -> None:
+        self.client = client
+        self.latency = None
+        self.usable = True
+        self.checked_at = None
+
+
+class ReplicaRouter:
+    """
+    Routes reads to replicas of the primary, falling back to the primary.
+
+    Replicas are picked round robin, or by the lowest moving average of their
+    latency, sampled from the reads they serve and from their checks. A
+    replica is skipped while its replication link is down or, with
+    max_staleness set, while its last contact with the primary is older than
+    max_staleness seconds, both read from INFO replication at most every
+    check_interval seconds. A replica failing a read with a connection error
+    is skipped until its next check, and the read is run on the primary.
+
+    Replicas lag behind the primary, so a value just written may not be read
+    back at once.
+
+    Attributes:
+        primary (redis.Redis): Client of the primary.
+        selection (str): "round_robin" or "least_latency".
+        max_staleness (int | None): Largest replication lag in seconds a
+            replica is read with, None for no limit.
+        check_interval (float): Seconds between the checks of a replica.
+        fallbacks (int): Number of reads run on the primary because no
+            replica was usable or the replica failed.
+    """
+
+    ERRORS = (redis.ConnectionError, redis.TimeoutError)
+    SMOOTHING = 0.2
+
+    def __init__(self, primary: redis.Redis, replicas: Iterable[redis.Redis],
+                 selection: str = ROUND_ROBIN, max_staleness: int = None,
+                 check_interval: float = 1.0) -> None:
+        if selection not in (ROUND_ROBIN, LEAST_LATENCY):
+            raise InvalidFormatError(
+                "Invalid replica selection - {}".format(selection))
+        if max_staleness is not None and not isinstance(
+                max_staleness, int):
+            raise InvalidFormatError(
+                f"Replica max staleness wrong. Expected int, got "
+                f"{type(max_staleness)}."
+            )
+        if not isinstance(check_interval, (int, float)) or (
+                check_interval < 0):
+            raise InvalidFormatError(
+                f"Replica check interval wrong. Expected non-negative "
+                f"number, got {check_interval}."
+            )
+        self.primary = primary
+        self.selection = selection
+        self.max_staleness = max_staleness
+        self.check_interval = check_interval
+        self.fallbacks = 0
+        self.__replicas = [_Replica(client) for client in replicas]
+        if not self.__replicas:
+            raise InvalidFormatError("Replica router needs a replica.")
+        self.__next = 0
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, primary: redis.Redis,
+                     options: Union[dict, None]) -> Union[
+                         "ReplicaRouter", None]:
+        """
+        Builds a ReplicaRouter from the "REPLICAS" option of a cache.
+
+        Args:
+            primary (redis.Redis): Client of the primary.
+            options (dict | None): Mapping with the "LOCATIONS" key, the URLs
+                of the replicas, and the optional "SELECTION",
+                "MAX_STALENESS", "CHECK_INTERVAL" and
+                "CONNECTION_POOL_KWARGS" keys.
+
+        Returns:
+            ReplicaRouter | None: The router, or None if not configured.
+        """
+        if not options:
+            return None
+        locations = options.get("LOCATIONS")
+        if isinstance(locations, str):
+            locations = [locations]
+        if not locations:
+            raise InvalidFormatError("Replica locations not configured.")
+        kwargs = options.get("CONNECTION_POOL_KWARGS", {})
+        return cls(
+            primary,
+            [redis.Redis.from_url(location, **kwargs)
+             for location in locations],
+            selection=options.get("SELECTION", ROUND_ROBIN),
+            max_staleness=options.get("MAX_STALENESS"),
+            check_interval=options.get("CHECK_INTERVAL", 1.0))
+
+    @property
+    def replicas(self) -> List[redis.Redis]:
+        return [replica.client for replica in self.__replicas]
+
+    def __record(self, replica: _Replica, latency: float) -> None:
+        with self.__lock:
+            if replica.latency is None:
+                replica.latency = latency
+            else:
+                replica.latency += self.SMOOTHING * (
+                    latency - replica.latency)
+
+    def __check(self, replica: _Replica) -> bool:
+        start = time.monotonic()
+        try:
+            info = replica.client.info("replication")
+        except self.ERRORS:
+            return False
+        except redis.ResponseError:
+            # INFO disabled on the server, the lag cannot be checked.
+            return self.max_staleness is None
+        self.__record(replica, time.monotonic() - start)
+        if info.get("role") != "slave":
+            return True
+        if info.get("master_link_status") != "up":
+            return False
+        return self.max_staleness is None or 0 <= info.get(
+            "master_last_io_seconds_ago", -1) <= self.max_staleness
+
+    def __usable(self) -> List[_Replica]:
+        now = time.monotonic()
+        due = []
+        with self.__lock:
+            for replica in self.__replicas:
+                if replica.checked_at is None or (
+                        now - replica.checked_at >= self.check_interval):
+                    replica.checked_at = now
+                    due.append(replica)
+        for replica in due:
+            replica.usable = self.__check(replica)
+        return [replica for replica in self.__replicas if replica.usable]
+
+    def __choose(self) -> Union[_Replica, None]:
+        usable = self.__usable()
+        if not usable:
+            return None
+        if self.selection == LEAST_LATENCY:
+            return min(usable, key=lambda replica: replica.latency or 0.0)
+        with self.__lock:
+            self.__next += 1
+            return usable[self.__next % len(usable)]
+
+    def read(self, fn: Callable[[redis.Redis], Any]) -> Any:
+        """
+        Runs a read on a replica, or on the primary if none is usable or the
+        replica fails.
+
+        Args:
+            fn (Callable): Function reading with the client it is given.
+
+        Returns:
+            Any: The result of fn.
+        """
+        replica = self.__choose()
+        if replica is not None:
+            start = time.monotonic()
+            try:
+                res = fn(replica.client)
+            except self.ERRORS:
+                replica.usable = False
+            else:
+                self.__record(replica, time.monotonic() - start)
+                return res
+        with self.__lock:
+            self.fallbacks += 1
+        return fn(self.primary)
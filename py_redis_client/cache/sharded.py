@@ -0,0 +1,481 @@
+import bisect
+import contextvars
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Any, Callable, Iterable, List
+
+from py_redis_client.cache.cache import Cache
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.cache.memoize import Memoized, MEMOIZE_PREFIX
+from py_redis_client.constants import CacheDataType
+from py_redis_client.exceptions import InvalidFormatError
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping keys to named nodes.
+
+    Each node is placed on the ring at replicas * weight points, and a key
+    belongs to the node of the first point after its hash. Adding or removing
+    a node only moves the keys of the arcs it gains or loses, about 1/N of
+    the keys, and the virtual nodes spread those evenly over the other nodes.
+    The points are replaced rather than changed in place, so node is safe to
+    call while another thread adds or removes a node.
+
+    Attributes:
+        replicas (int): Points per unit of weight.
+        weights (dict[str, int]): Weight of each node.
+    """
+
+    def __init__(self, replicas: int = 160) -> None:
+        if type(replicas) is not int or replicas < 1:
+            raise InvalidFormatError(
+                "Invalid hash ring replicas - {}".format(replicas))
+        self.replicas = replicas
+        self.weights: dict[str, int] = {}
+        self.__ring: tuple[List[int], List[str]] = ([], [])
+
+    @staticmethod
+    def hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(
+            value.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, node: str, weight: int = 1) -> None:
+        if node in self.weights:
+            raise InvalidFormatError(
+                "Node '{}' already in the hash ring.".format(node))
+        if type(weight) is not int or weight < 1:
+            raise InvalidFormatError(
+                "Invalid weight for node '{}' - {}".format(node, weight))
+        points, nodes = list(self.__ring[0]), list(self.__ring[1])
+        for idx in range(self.replicas * weight):
+            point = self.hash("{}#{}".format(node, idx))
+            pos = bisect.bisect(points, point)
+            points.insert(pos, point)
+            nodes.insert(pos, node)
+        self.weights = {**self.weights, node: weight}
+        self.__ring = (points, nodes)
+
+    def remove(self, node: str) -> None:
+        if node not in self.weights:
+            raise InvalidFormatError(
+                "Node '{}' not in the hash ring.".format(node))
+        kept = [(point, owner) for point, owner in zip(
+            *self.__ring) if owner != node]
+        self.__ring = (
+            [point for point, _ in kept], [owner for _, owner in kept])
+        self.weights = {
+            name: weight for name, weight in self.weights.items()
+            if name != node}
+
+    def copy(self) -> "HashRing":
+        ring = HashRing(self.replicas)
+        ring.weights = dict(self.weights)
+        ring.__ring = self.__ring
+        return ring
+
+    def node(self, key: str) -> str:
+        points, nodes = self.__ring
+        if not points:
+            raise InvalidFormatError("Hash ring has no nodes.")
+        idx = bisect.bisect(points, self.hash(key))
+        return nodes[idx % len(points)]
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.weights
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+
+class ShardedCache:
+    """
+    A cache distributed over several Redis-backed Django caches.
+
+    Keys are mapped to the caches with a consistent-hash ring, so adding a
+    cache only moves about 1/N of the keys, which then miss once. Multi-key
+    operations are split per shard and the shards are called concurrently,
+    each with its own pipelines, so a get_many costs the slowest shard rather
+    than the sum of them. Each shard is a Cache with its own options.
+
+    Attributes:
+        shards (dict[str, Cache]): The Cache of each cache name.
+        ring (HashRing): Ring mapping keys to cache names.
+        max_workers (int | None): Threads calling the shards concurrently.
+            None uses one per shard.
+
+    Usage:
+        Initialize with the cache names, optionally weighted:
+
+            cache = ShardedCache(["shard1", "shard2", "shard3"])
+            cache = ShardedCache({"large": 2, "small": 1})
+
+        Use it as a Cache:
+
+            cache.set_many({"a": 1, "b": 2}, timeout=3600)
+            values = cache.get_many("a", "b")
+
+        Other single key operations are run on the shard of the key:
+
+            cache.shard("cart").append("cart", item)
+    """
+
+    def __init__(self, cache_names: Union[Iterable[str], dict[str, int]],
+                 replicas: int = 160, max_workers: int = None) -> None:
+        """
+        Initializes the ShardedCache with the specified Django cache names.
+
+        Args:
+            cache_names (Iterable[str] | dict[str, int]): Names of the caches
+                defined in Django settings, or names mapped to their weights.
+            replicas (int, optional): Points per unit of weight on the ring.
+                Defaults to 160.
+            max_workers (int, optional): Threads calling the shards
+                concurrently. Defaults to None, for one per shard.
+
+        Raises:
+            InvalidFormatError: If no cache name is given, or a cache is not
+            defined in settings or not configured with a Redis backend.
+        """
+        if isinstance(cache_names, str):
+            raise InvalidFormatError(
+                "Sharded cache names wrong. Expected iterable of names, got "
+                "str."
+            )
+        weights = dict(cache_names) if isinstance(
+            cache_names, dict) else dict.fromkeys(cache_names, 1)
+        if not weights:
+            raise InvalidFormatError("Sharded cache needs at least one cache.")
+        self.__topology: tuple[HashRing, dict[str, Cache]] = (
+            HashRing(replicas), {})
+        self.max_workers = max_workers
+        self.__executor = None
+        self.__lock = threading.Lock()
+        for cache_name, weight in weights.items():
+            self.add_shard(cache_name, weight)
+
+    @property
+    def ring(self) -> HashRing:
+        return self.__topology[0]
+
+    @property
+    def shards(self) -> dict[str, Cache]:
+        return self.__topology[1]
+
+    def add_shard(self, cache_name: str, weight: int = 1) -> None:
+        """
+        Adds a cache to the ring. Keys moved to it miss until set again.
+
+        The ring and the shards are copied, changed and swapped in together,
+        so operations running meanwhile use either the old or the new ones.
+
+        Args:
+            cache_name (str): The name of the cache defined in Django settings.
+            weight (int, optional): Share of the keys relative to the other
+                shards. Defaults to 1.
+        """
+        cache = Cache(cache_name)
+        with self.__lock:
+            ring, shards = self.__topology
+            ring = ring.copy()
+            ring.add(cache_name, weight)
+            self.__topology = (ring, {**shards, cache_name: cache})
+
+    def remove_shard(self, cache_name: str) -> None:
+        """
+        Removes a cache from the ring. Its keys move to the other shards.
+
+        Args:
+            cache_name (str): The name of the cache.
+        """
+        with self.__lock:
+            ring, shards = self.__topology
+            ring = ring.copy()
+            ring.remove(cache_name)
+            self.__topology = (ring, {
+                name: cache for name, cache in shards.items()
+                if name != cache_name})
+
+    def shard(self, key: str) -> Cache:
+        """
+        Returns the Cache holding a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            Cache: The shard of the key.
+        """
+        Mapper.validate_keys(key)
+        ring, shards = self.__topology
+        return shards[ring.node(key)]
+
+    def __partition(self, keys: Iterable[str]) -> dict[Cache, list]:
+        """
+        Internal method splitting keys per shard.
+
+        Args:
+            keys (Iterable[str]): Keys to split.
+
+        Returns:
+            dict: The shards and their keys, in the order given.
+        """
+        ring, shards = self.__topology
+        groups = {}
+        for key in keys:
+            Mapper.validate_keys(key)
+            groups.setdefault(shards[ring.node(key)], []).append(key)
+        return groups
+
+    def __fan_out(self, groups: dict[Cache, Any],
+                  fn: Callable[[Cache, Any], Any]) -> list:
+        """
+        Internal method calling the shards concurrently.
+
+        Each call runs in a copy of the caller's context, so the batching
+        scope of the caller is still seen by the shards.
+
+        Args:
+            groups (dict): The shards and the part of the operation for each
+                of them.
+            fn (Callable): Function called with the Cache and its part.
+
+        Returns:
+            list: The result of each call, in the order of groups.
+        """
+        if len(groups) <= 1:
+            return [fn(cache, part) for cache, part in groups.items()]
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers or len(self.shards),
+                    thread_name_prefix="py_redis_client_shard")
+        futures = [self.__executor.submit(
+            contextvars.copy_context().run, fn, cache, part)
+            for cache, part in groups.items()]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """
+        Stops the threads calling the shards. They are started again on use.
+        """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def get(self, key: str) -> Union[CacheDataType, None]:
+        """
+        Retrieves a value for a given key from its shard.
+
+        Args:
+            key (str): The key to retrieve.
+
+        Returns:
+            CacheDataType | None: The value associated with the key, or None if not found.
+        """
+        return self.shard(key).get(key)
+
+    def get_many(self, *keys: str) -> dict[str, CacheDataType]:
+        """
+        Retrieves values for multiple keys, from all their shards at once.
+
+        Args:
+            *keys (str): Keys to retrieve.
+
+        Returns:
+            dict: A dictionary with keys and their corresponding values.
+        """
+        res = {}
+        for found in self.__fan_out(
+                self.__partition(keys),
+                lambda cache, part: cache.get_many(*part)):
+            res.update(found)
+        return res
+
+    def set(self, key: str, value: CacheDataType, timeout: int = None,
+            separator: str = "", tags: Iterable[str] = None) -> None:
+        """
+        Stores a single key-value pair in its shard, see Cache.set.
+        """
+        self.shard(key).set(key, value, timeout, separator, tags)
+
+    def set_many(self, data: dict[str, CacheDataType], timeout: int = None,
+                 separator: str = "", tags: Iterable[str] = None) -> None:
+        """
+        Stores multiple key-value pairs, in all their shards at once.
+
+        Args:
+            data (dict): Dictionary of key-value pairs to store.
+            timeout (int, optional): Expiration time in seconds. Defaults to None.
+            separator (str, optional): Separator for nested keys. Defaults to "".
+            tags (Iterable[str], optional): Tags to index the keys under, in
+                the shard of each key, see invalidate_tags. Defaults to None.
+
+        Raises:
+            InvalidFormatError: If data is not a dictionary, or tags is a
+            string.
+
+        Note:
+            Writes are not atomic across shards.
+        """
+        if not isinstance(data, dict):
+            raise InvalidFormatError(
+                f"Cache set format wrong. Expected dict, got {type(data)}."
+            )
+        if isinstance(tags, str):
+            raise InvalidFormatError(
+                "Cache set tags wrong. Expected iterable of str, got str."
+            )
+        tags = list(tags) if tags else None
+        self.__fan_out(
+            {cache: {key: data[key] for key in keys}
+             for cache, keys in self.__partition(data).items()},
+            lambda cache, part: cache.set_many(
+                part, timeout, separator, tags))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Deletes every key indexed under the specified tags, in all the shards
+        at once, see Cache.invalidate_tags.
+
+        Args:
+            *tags (str): Tags to invalidate.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+        Mapper.validate_keys(*tags)
+        return sum(self.__fan_out(
+            dict.fromkeys(self.shards.values()),
+            lambda cache, part: cache.invalidate_tags(*tags)))
+
+    def delete(self, *keys: str) -> bool:
+        """
+        Deletes the specified keys, from all their shards at once.
+
+        Args:
+            *keys (str): Keys to be deleted from the cache.
+
+        Returns:
+            bool: True if the operation is successful.
+        """
+        self.__fan_out(
+            self.__partition(keys),
+            lambda cache, part: cache.delete(*part))
+        return True
+
+    def exists(self, *keys: str) -> bool:
+        """
+        Checks if all specified keys exist in their shards.
+
+        Args:
+            *keys (str): Keys to be checked in the cache.
+
+        Returns:
+            bool: True if all keys exist, False otherwise.
+        """
+        return all(self.__fan_out(
+            self.__partition(keys),
+            lambda cache, part: cache.exists(*part)))
+
+    def expire(self, expiry: int, *keys: str) -> bool:
+        """
+        Sets an expiration time for the specified keys in their shards.
+
+        Args:
+            expiry (int): Expiration time in seconds.
+            *keys (str): Keys to set the expiration for.
+
+        Returns:
+            bool: True if the operation is successful.
+
+        Raises:
+            InvalidFormatError: If the expiry is not an integer.
+        """
+        if not isinstance(expiry, int):
+            raise InvalidFormatError(
+                f"Cache expire format wrong. Expected int, got {type(expiry)}."
+            )
+        return all(self.__fan_out(
+            self.__partition(keys),
+            lambda cache, part: cache.expire(expiry, *part)))
+
+    def flush(self) -> bool:
+        """
+        Clears all data from every shard.
+
+        Returns:
+            bool: True if the operation is successful.
+        """
+        return all(self.__fan_out(
+            dict.fromkeys(self.shards.values()),
+            lambda cache, part: cache.flush()))
+
+    def incr(self, key: str, amount: Union[int, float] = 1) -> Union[
+            int, float]:
+        """
+        Increments a counter atomically in its shard, see Cache.incr_many.
+        """
+        return self.shard(key).incr(key, amount)
+
+    def decr(self, key: str, amount: Union[int, float] = 1) -> Union[
+            int, float]:
+        """
+        Decrements a counter atomically in its shard, see Cache.incr_many.
+        """
+        return self.shard(key).decr(key, amount)
+
+    def incr_many(self, counters: dict[str, Union[int, float]]) -> dict[
+            str, Union[int, float]]:
+        """
+        Increments multiple counters, in all their shards at once.
+
+        Args:
+            counters (dict): Keys and the amounts to add to them.
+
+        Returns:
+            dict: The keys and their new values.
+
+        Note:
+            Counters are incremented atomically within a shard only.
+        """
+        if not isinstance(counters, dict):
+            raise InvalidFormatError(
+                f"Cache incr format wrong. Expected dict, got {type(counters)}."
+            )
+        res = {}
+        for values in self.__fan_out(
+                {cache: {key: counters[key] for key in keys}
+                 for cache, keys in self.__partition(counters).items()},
+                lambda cache, part: cache.incr_many(part)):
+            res.update(values)
+        return {key: res[key] for key in counters}
+
+    def get_or_set(self, key: str, producer: Callable[[], CacheDataType],
+                   timeout: int = None, separator: str = "",
+                   lease_timeout: int = 10, wait_timeout: float = 5.0,
+                   beta: float = None) -> Union[CacheDataType, None]:
+        """
+        Retrieves a value, computing and storing it once on a miss, in the
+        shard of the key. See Cache.get_or_set.
+        """
+        return self.shard(key).get_or_set(
+            key, producer, timeout, separator, lease_timeout, wait_timeout,
+            beta)
+
+    def memoize(self, timeout: int = None,
+                prefix: str = MEMOIZE_PREFIX) -> Callable[[Callable], Memoized]:
+        """
+        Decorator caching the results of a function by its arguments, see
+        Cache.memoize. Batched lookups with many() fan out to the shards.
+        """
+        if timeout is not None and not isinstance(timeout, int):
+            raise InvalidFormatError(
+                f"Cache memoize expiry wrong. Expected int, got {type(timeout)}."
+            )
+
+        def decorator(fn: Callable) -> Memoized:
+            return Memoized(self, fn, timeout, prefix)
+        return decorator
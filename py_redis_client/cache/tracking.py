@@ -0,0 +1,188 @@
+import os
+import threading
+import weakref
+import redis
+from redis.utils import str_if_bytes
+from typing import List
+
+from py_redis_client.cache.local import LocalCache
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.constants import (
+    TRACKING_DEFAULT, TRACKING_BCAST, LIST_SEP, SET_SEP)
+from py_redis_client.exceptions import InvalidFormatError
+
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+
+class InvalidationListener:
+    """
+    Keeps a LocalCache coherent with Redis through CLIENT TRACKING.
+
+    A background thread subscribes to the invalidation channel and drops the
+    local values of every logical key whose Redis key, or any of its composite
+    sub-keys, is reported as modified.
+
+    In "default" mode Redis reports the keys read through ``redis_conn``, a
+    client whose pooled connections enable tracking on connect. In "bcast"
+    mode one dedicated connection subscribes to the configured key prefixes
+    and reads keep using the original client.
+
+    Whenever the listener or a tracking connection reconnects, notifications
+    may have been missed, so the local cache is cleared, and bypassed until
+    tracking is redirected again. In "default" mode a dropped pooled
+    connection is only noticed when it is used again, so "bcast" is the
+    safer choice when connections are closed by the server on idle.
+
+    Attributes:
+        redis_conn (redis.Redis): Client to read through for values to be
+            tracked.
+    """
+
+    def __init__(self, redis_conn: redis.Redis, local_cache: LocalCache,
+                 mode: str = TRACKING_DEFAULT,
+                 prefixes: List[str] = None) -> None:
+        if mode not in (TRACKING_DEFAULT, TRACKING_BCAST):
+            raise InvalidFormatError(
+                f"Invalid tracking mode '{mode}'."
+            )
+        if prefixes and mode != TRACKING_BCAST:
+            raise InvalidFormatError(
+                "Tracking prefixes are only supported in bcast mode."
+            )
+        self.local_cache = local_cache
+        self.mode = mode
+        self.prefixes = list(prefixes or [])
+        self.__origin = redis_conn
+        self.__client_id = None
+        self.__pubsub = None
+        self.__broken = threading.Event()
+        self.__active = threading.Event()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.__pid = None
+        self.__tracked = weakref.WeakSet()
+        pool = redis_conn.connection_pool
+        self.__tracked_pool = redis.ConnectionPool(
+            connection_class=pool.connection_class,
+            **dict(pool.connection_kwargs,
+                   redis_connect_func=self.__enable_tracking))
+        # The bcast connection is opened by the listener thread, as tracking
+        # can only be redirected once the listener knows its client id.
+        self.__bcast_conn = None
+        self.redis_conn = redis_conn if mode == TRACKING_BCAST else (
+            redis.Redis(connection_pool=self.__tracked_pool))
+        self.ensure_running()
+
+    @property
+    def active(self) -> bool:
+        return self.__active.is_set()
+
+    def __tracking_args(self) -> list:
+        args = ["CLIENT", "TRACKING", "ON",
+                "REDIRECT", self.__client_id]
+        if self.mode == TRACKING_BCAST:
+            args.append("BCAST")
+            for prefix in self.prefixes:
+                args.extend([
+                    "PREFIX", prefix,
+                    "PREFIX", "|" + LIST_SEP + "|" + prefix,
+                    "PREFIX", "|" + SET_SEP + "|" + prefix])
+        return args
+
+    def __enable_tracking(self, connection) -> None:
+        connection.on_connect()
+        if connection in self.__tracked:
+            self.local_cache.clear()
+        self.__tracked.add(connection)
+        if self.__client_id is None:
+            raise redis.ConnectionError(
+                "Invalidation listener is not connected")
+        connection.send_command(*self.__tracking_args())
+        if str_if_bytes(connection.read_response()) != "OK":
+            raise redis.ConnectionError(
+                "CLIENT TRACKING could not be enabled")
+
+    def __on_reconnect(self, connection) -> None:
+        self.__broken.set()
+
+    def __connect(self) -> None:
+        self.__active.clear()
+        self.local_cache.clear()
+        if self.__pubsub is not None:
+            self.__pubsub.close()
+        self.__client_id = None
+        if self.__bcast_conn is not None:
+            self.__bcast_conn.close()
+            self.__bcast_conn = None
+        self.__tracked_pool.disconnect()
+        pubsub = self.__origin.pubsub(ignore_subscribe_messages=True)
+        pubsub.execute_command("CLIENT", "ID")
+        self.__client_id = pubsub.parse_response(block=True)
+        pubsub.connection.register_connect_callback(
+            self.__on_reconnect)
+        pubsub.subscribe(INVALIDATE_CHANNEL)
+        self.__pubsub = pubsub
+        if self.mode == TRACKING_BCAST:
+            self.__bcast_conn = redis.Redis(
+                connection_pool=self.__tracked_pool,
+                single_connection_client=True)
+            self.__bcast_conn.connection.register_connect_callback(
+                self.__on_reconnect)
+        self.__broken.clear()
+        self.__active.set()
+
+    def __handle(self, message: dict) -> None:
+        if message.get("type") != "message":
+            return
+        keys = message.get("data")
+        if not keys:
+            self.local_cache.clear()
+            return
+        if not isinstance(keys, list):
+            keys = [keys]
+        self.local_cache.invalidate(*{
+            Mapper.logical_key(str_if_bytes(key))
+            for key in keys})
+
+    def __run(self) -> None:
+        while not self.__stopped.is_set():
+            try:
+                if self.__pubsub is None or self.__broken.is_set():
+                    self.__connect()
+                message = self.__pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    self.__handle(message)
+                elif self.__bcast_conn is not None:
+                    self.__bcast_conn.ping()
+            except redis.RedisError:
+                self.__active.clear()
+                self.local_cache.clear()
+                self.__broken.set()
+                self.__stopped.wait(1.0)
+
+    def ensure_running(self) -> None:
+        """
+        Starts the listener thread, again in a forked worker process.
+        """
+        if self.__pid == os.getpid() and self.__thread.is_alive():
+            return
+        self.__pid = os.getpid()
+        self.__active.clear()
+        self.__pubsub = None
+        self.__stopped.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, daemon=True,
+            name="py-redis-client-invalidation")
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__active.clear()
+        if self.__thread is not None:
+            self.__thread.join()
+        if self.__pubsub is not None:
+            self.__pubsub.close()
+        if self.__bcast_conn is not None:
+            self.__bcast_conn.close()
+        self.__tracked_pool.disconnect()
@@ -0,0 +1,190 @@
+import datetime
+import json
+import zlib
+from typing import Union, Callable, Any
+
+from py_redis_client.constants import RedisNativeTypes
+from py_redis_client.exceptions import InavlidRedisValueError
+
+
+class Packed:
+    """
+    A list, set or flattened hash map written as a single value.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Union[list, set, dict]) -> None:
+        self.value = value
+
+
+def _pack_element(value: Any) -> Any:
+    if isinstance(value, list):
+        return {"l": [encode(v) for v in value]}
+    if isinstance(value, set):
+        return {"s": [encode(v) for v in value]}
+    return encode(value)
+
+
+def _pack(value: Packed) -> str:
+    value = value.value
+    if isinstance(value, dict):
+        value = {"h": {k: _pack_element(v) for k, v in value.items()}}
+    else:
+        value = _pack_element(value)
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _unpack_element(value: Any) -> Any:
+    if isinstance(value, str):
+        return decode(value)
+    if "l" in value:
+        return [decode(v) for v in value["l"]]
+    return {decode(v) for v in value["s"]}
+
+
+def _unpack(value: str) -> Union[list, set, dict]:
+    value = json.loads(value)
+    if isinstance(value, dict) and "h" in value:
+        return {k: _unpack_element(v) for k, v in value["h"].items()}
+    return _unpack_element(value)
+
+
+def _encode_time(value: datetime.time) -> str:
+    return "time%02d:%02d:%02d" % (
+        value.hour, value.minute, value.second)
+
+
+# Exact type -> encoder. Subclasses are rejected, same as the type name
+# lookup used before.
+ENCODERS: dict[type, Callable[[Any], str]] = {
+    str: lambda value: "str" + value,
+    int: lambda value: "int" + str(value),
+    float: lambda value: "float" + str(value),
+    bool: lambda value: "bool" + str(value),
+    datetime.datetime: lambda value: "datetime" + value.isoformat(),
+    datetime.date: lambda value: "date" + value.isoformat(),
+    datetime.time: _encode_time,
+    Packed: lambda value: "pack" + _pack(value),
+}
+
+# First character -> (prefix, decoder) candidates, longest prefix first
+# so "datetime" wins over "date".
+DECODERS: dict[str, tuple] = {
+    "s": (("str", lambda value: value[3:]),),
+    "i": (("int", lambda value: int(value[3:])),),
+    "f": (("float", lambda value: float(value[5:])),),
+    "b": (("bool", lambda value: value[4:] == "True"),),
+    "d": (
+        ("datetime", lambda value: datetime.datetime.fromisoformat(
+            value[8:])),
+        ("date", lambda value: datetime.date.fromisoformat(
+            value[4:]))),
+    "t": (("time", lambda value: datetime.time.fromisoformat(
+        value[4:])),),
+    "p": (("pack", lambda value: _unpack(value[4:])),),
+}
+
+
+# Binary values start with a NUL byte, which no text tag starts with, so
+# both formats can be read back without knowing how a key was written.
+BINARY_MARK = b"\x00"
+COMPRESSED = b"z"
+
+
+def _encode_int(value: int) -> bytes:
+    return value.to_bytes(
+        value.bit_length() // 8 + 1, "big", signed=True)
+
+
+BINARY_ENCODERS: dict[type, Callable[[Any], bytes]] = {
+    str: lambda value: b"\x00s" + value.encode("utf-8"),
+    int: lambda value: b"\x00i" + _encode_int(value),
+    float: lambda value: b"\x00f" + repr(value).encode("ascii"),
+    bool: lambda value: b"\x00T" if value else b"\x00F",
+    datetime.datetime: lambda value: (
+        b"\x00D" + value.isoformat().encode("ascii")),
+    datetime.date: lambda value: (
+        b"\x00d" + _encode_int(value.toordinal())),
+    datetime.time: lambda value: b"\x00t" + bytes(
+        [value.hour, value.minute, value.second]),
+    Packed: lambda value: b"\x00p" + _pack(value).encode("utf-8"),
+}
+
+BINARY_DECODERS: dict[int, Callable[[bytes], Any]] = {
+    ord("s"): lambda value: value.decode("utf-8"),
+    ord("i"): lambda value: int.from_bytes(value, "big", signed=True),
+    ord("f"): lambda value: float(value),
+    ord("T"): lambda value: True,
+    ord("F"): lambda value: False,
+    ord("D"): lambda value: datetime.datetime.fromisoformat(
+        value.decode("ascii")),
+    ord("d"): lambda value: datetime.date.fromordinal(
+        int.from_bytes(value, "big", signed=True)),
+    ord("t"): lambda value: datetime.time(*value),
+    ord("p"): lambda value: _unpack(value.decode("utf-8")),
+    ord("z"): lambda value: decode(zlib.decompress(value)),
+}
+
+
+def binary_encoder(
+        compress_threshold: int = None,
+        compress_level: int = 6) -> Callable[[RedisNativeTypes], bytes]:
+    """
+    Builds an encoder writing the compact binary format.
+
+    Args:
+        compress_threshold (int, optional): Size in bytes above which encoded
+            values are zlib compressed, if that makes them smaller. Defaults
+            to None, disabling compression.
+        compress_level (int, optional): zlib compression level. Defaults to 6.
+
+    Returns:
+        Callable: The encoder.
+    """
+    def encoder(value: RedisNativeTypes) -> bytes:
+        try:
+            res = BINARY_ENCODERS[type(value)](value)
+        except KeyError:
+            raise InavlidRedisValueError(
+                "Value passed not valid - {}. Type - {}".format(
+                    value, type(value).__name__))
+        if compress_threshold is not None and (
+                len(res) > compress_threshold):
+            compressed = BINARY_MARK + COMPRESSED + zlib.compress(
+                res, compress_level)
+            if len(compressed) < len(res):
+                return compressed
+        return res
+    return encoder
+
+
+def encode(value: RedisNativeTypes) -> str:
+    try:
+        encoder = ENCODERS[type(value)]
+    except KeyError:
+        raise InavlidRedisValueError(
+            "Value passed not valid - {}. Type - {}".format(
+                value, type(value).__name__))
+    return encoder(value)
+
+
+def decode(value: Union[str, bytes]) -> RedisNativeTypes:
+    if not isinstance(value, (str, bytes)):
+        raise InavlidRedisValueError(
+            "Found value not of redis native type - {}".format(value))
+    if type(value) is bytes:
+        if value[:1] == BINARY_MARK:
+            try:
+                return BINARY_DECODERS[value[1]](value[2:])
+            except (KeyError, IndexError):
+                raise InavlidRedisValueError(
+                    "Found value not of redis native type - {}".format(
+                        value))
+        value = value.decode("utf-8")
+    for prefix, decoder in DECODERS.get(value[:1], ()):
+        if value.startswith(prefix):
+            return decoder(value)
+    raise InavlidRedisValueError(
+        "Found value not of redis native type - {}".format(
+            value))
@@ -18,3 +18,17 @@ HASHMAP = "hmap"
 ADDRESS = "addr"
 LIST_SEP = "lsep"
 SET_SEP = "ssep"
+PIPELINE_ENGINE = "pipeline"
+SCRIPT_ENGINE = "script"
+TRACKING_DEFAULT = "default"
+TRACKING_BCAST = "bcast"
+LEASE = "lease"
+DELTA = "delta"
+NAMESPACE = "ns"
+TAG = "tag"
+LOCK = "lock"
+TEXT_CODEC = "text"
+BINARY_CODEC = "binary"
+DEFAULT_CHUNK_SIZE = 1000
+ROUND_ROBIN = "round_robin"
+LEAST_LATENCY = "least_latency"
@@ -1,5 +1,7 @@
 import redis
 from redis import client
+from redis.asyncio import client as asyncio_client
+from redis.cluster import RedisCluster, ClusterPipeline
 from typing import Union
 
 from py_redis_client.db.native import _RedisNativePipeline, _RedisNativeClient
@@ -9,53 +11,60 @@ from py_redis_client.db.hmap import _RedisHashMapPipeline, _RedisHashMapClient
 from py_redis_client.exceptions import InvalidFormatError
 
 
+# Asynchronous connections and pipelines get the pipeline wrappers, which
+# only queue commands and format replies. Awaiting is left to the caller.
+# ClusterPipeline subclasses RedisCluster, so it is checked first.
 class RedisNative:
     def __new__(cls, redis_conn) -> Union[
         _RedisNativeClient, _RedisNativePipeline]:
-        if isinstance(redis_conn, client.Pipeline):
+        if isinstance(redis_conn, (
+                client.Pipeline, ClusterPipeline, asyncio_client.Redis)):
             return _RedisNativePipeline(redis_conn)
-        if isinstance(redis_conn, redis.Redis):
+        if isinstance(redis_conn, (redis.Redis, RedisCluster)):
             return _RedisNativeClient(redis_conn)
         raise InvalidFormatError(
             "Invalid Redis connection type. Expected "
-            "redis.Redis or redis.client.Pipeline, "
-            "got {}".format(type(redis_conn)))
+            "redis.Redis, redis.cluster.RedisCluster, their "
+            "pipelines or redis.asyncio.Redis, got {}".format(type(redis_conn)))
 
 
 class RedisList:
     def __new__(cls, redis_conn) -> Union[
         _RedisListClient, _RedisListPipeline]:
-        if isinstance(redis_conn, client.Pipeline):
+        if isinstance(redis_conn, (
+                client.Pipeline, ClusterPipeline, asyncio_client.Redis)):
             return _RedisListPipeline(redis_conn)
-        if isinstance(redis_conn, redis.Redis):
+        if isinstance(redis_conn, (redis.Redis, RedisCluster)):
             return _RedisListClient(redis_conn)
         raise InvalidFormatError(
             "Invalid Redis connection type. Expected "
-            "redis.Redis or redis.client.Pipeline, "
-            "got {}".format(type(redis_conn)))
+            "redis.Redis, redis.cluster.RedisCluster, their "
+            "pipelines or redis.asyncio.Redis, got {}".format(type(redis_conn)))
 
 
 class RedisSet:
     def __new__(cls, redis_conn) -> Union[
         _RedisSetClient, _RedisSetPipeline]:
-        if isinstance(redis_conn, client.Pipeline):
+        if isinstance(redis_conn, (
+                client.Pipeline, ClusterPipeline, asyncio_client.Redis)):
             return _RedisSetPipeline(redis_conn)
-        if isinstance(redis_conn, redis.Redis):
+        if isinstance(redis_conn, (redis.Redis, RedisCluster)):
             return _RedisSetClient(redis_conn)
         raise InvalidFormatError(
             "Invalid Redis connection type. Expected "
-            "redis.Redis or redis.client.Pipeline, "
-            "got {}".format(type(redis_conn)))
+            "redis.Redis, redis.cluster.RedisCluster, their "
+            "pipelines or redis.asyncio.Redis, got {}".format(type(redis_conn)))
 
 
 class RedisHashMap:
     def __new__(cls, redis_conn) -> Union[
         _RedisHashMapClient, _RedisHashMapPipeline]:
-        if isinstance(redis_conn, client.Pipeline):
+        if isinstance(redis_conn, (
+                client.Pipeline, ClusterPipeline, asyncio_client.Redis)):
             return _RedisHashMapPipeline(redis_conn)
-        if isinstance(redis_conn, redis.Redis):
+        if isinstance(redis_conn, (redis.Redis, RedisCluster)):
             return _RedisHashMapClient(redis_conn)
         raise InvalidFormatError(
             "Invalid Redis connection type. Expected "
-            "redis.Redis or redis.client.Pipeline, "
-            "got {}".format(type(redis_conn)))
+            "redis.Redis, redis.cluster.RedisCluster, their "
+            "pipelines or redis.asyncio.Redis, got {}".format(type(redis_conn)))
@@ -1,6 +1,8 @@
 import datetime
 import redis
 from redis import client
+from redis.asyncio import client as asyncio_client
+from redis.cluster import ClusterPipeline
 from typing import Union
 
 from py_redis_client.constants import CONVERT
@@ -12,19 +14,39 @@ class _RedisDB:
     conv = Conversions(CONVERT)
 
     def __init__(self, redis_conn: Union[
-        redis.Redis, client.Pipeline]) -> None:
+        redis.Redis, client.Pipeline,
+        asyncio_client.Redis]) -> None:
         self.db_instance = redis_conn
     
     def exists(self, *keys) -> int:
         for key in keys:
             self.conv.key_validate(key)
+        if isinstance(self.db_instance, ClusterPipeline):
+            return self.__per_key("exists", *keys)
         return self.db_instance.exists(*keys)
     
     def delete(self, *keys) -> int:
         for key in keys:
             self.conv.key_validate(key)
+        if isinstance(self.db_instance, ClusterPipeline):
+            return self.__per_key("delete", *keys)
         return self.db_instance.delete(*keys)
 
+    def __per_key(self, command: str, *keys) -> ClusterPipeline:
+        # Cluster pipelines take a single key per DEL and EXISTS, each
+        # queued command replying on its own.
+        for key in keys:
+            getattr(self.db_instance, command)(key)
+        return self.db_instance
+
+    def unlink(self, *keys) -> int:
+        for key in keys:
+            self.conv.key_validate(key)
+        return self.db_instance.unlink(*keys)
+
+    def scan_iter(self, match: str, count: int):
+        return self.db_instance.scan_iter(match=match, count=count)
+
     def expire(self, expiry: datetime.timedelta,
                *keys) -> bool:
         res = []
@@ -39,8 +61,8 @@ class _RedisDB:
     
     def db_multi(self, multi: bool = True) -> None:
         if multi:
-            if not isinstance(
-            self.db_instance, client.Pipeline):
+            if not isinstance(self.db_instance, (
+                    client.Pipeline, asyncio_client.Pipeline)):
                 raise MethodNotImplementedError(
                     "Cannot be implemented without redis"
                     " pipeline instance")
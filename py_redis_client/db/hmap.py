@@ -12,12 +12,14 @@ class _RedisHashMapPipeline(_RedisDB):
 
     def set(self, key: str, data: dict,
             expiry: ExpiryType = None,
-            redis_multi: bool = False) -> None:
+            redis_multi: bool = False,
+            conv: Conversions = None) -> None:
         if not isinstance(data, dict):
             raise InavlidRedisValueError(
                 "Invalid value for Hash Map set. "
                 "Expected dict, got {}".format(type(data)))
-        res = {k: self.conv.final_value(v) for k, v in 
+        conv = conv or self.conv
+        res = {k: conv.final_value(v) for k, v in 
             data.items()}
         if expiry:
             self.db_multi(redis_multi)
@@ -30,6 +32,15 @@ class _RedisHashMapPipeline(_RedisDB):
     def execute_get(self, key: str):
         return self.db_instance.hgetall(
             key)
+
+    def execute_get_fields(self, key: str, *fields):
+        return self.db_instance.hmget(
+            key, fields)
+
+    def execute_scan(self, key: str, match: str,
+                     cursor: int = 0, count: int = 1000):
+        return self.db_instance.hscan(
+            key, cursor, match=match, count=count)
     
     def format_get(self, data: dict) -> dict[
         RedisNativeTypes: RedisNativeTypes]:
@@ -13,13 +13,15 @@ class _RedisListPipeline(_RedisDB):
 
     def set(self, key: str, data: Iterable,
             expiry: ExpiryType = None,
-            redis_multi: bool = False) -> None:
+            redis_multi: bool = False,
+            conv: Conversions = None) -> None:
         if not isinstance(data, Iterable):
             raise InavlidRedisValueError(
                 "Invalid value for List set. "
                 "Expected iterable, got - {}".format(
                     type(data)))
-        res = [self.conv.final_value(
+        conv = conv or self.conv
+        res = [conv.final_value(
             obj) for obj in data]
         self.db_multi(redis_multi)
         self.delete(*[key])
@@ -31,6 +33,13 @@ class _RedisListPipeline(_RedisDB):
     def execute_get(self, key: str):
         return self.db_instance.lrange(
             key, 0, -1)
+
+    def execute_get_range(self, key: str, start: int, end: int):
+        return self.db_instance.lrange(
+            key, start, end)
+
+    def execute_len(self, key: str):
+        return self.db_instance.llen(key)
     
     def format_get(self, *values) -> List[
         RedisNativeTypes]:
@@ -1,3 +1,4 @@
+from redis.cluster import RedisCluster
 from typing import Iterable
 
 from py_redis_client.constants import (
@@ -13,24 +14,29 @@ class _RedisNativePipeline(_RedisDB):
 
     def set_many(self, data: dict,
                  expiry: ExpiryType = None, 
-                 redis_multi: bool = False) -> None:
+                 redis_multi: bool = False,
+                 conv: Conversions = None) -> None:
         if not isinstance(data, dict):
             raise InvalidFormatError(
                 "Invalid format for Native set_many. "
                 "Expected dict, got {}".format(type(data)))
+        conv = conv or self.conv
         res = {}
         keys = []
         for key, value in data.items():
-            res[key] = self.conv.final_value(
+            res[key] = conv.final_value(
                 value)
             keys.append(key)
         if expiry:
             self.db_multi(redis_multi)
-        self.db_instance.mset(res)
+        self.execute_set_many(res)
         if expiry:
             self.expire(expiry, *keys)
             self.db_execute(redis_multi)
     
+    def execute_set_many(self, data: dict):
+        return self.db_instance.mset(data)
+
     def execute_get_many(self, *keys):
         return self.db_instance.mget(keys)
 
@@ -44,6 +50,17 @@ class _RedisNativePipeline(_RedisDB):
 
 
 class _RedisNativeClient(_RedisNativePipeline):
+    # Cluster clients split MGET and MSET per slot, in one pipeline.
+    def execute_set_many(self, data: dict):
+        if isinstance(self.db_instance, RedisCluster):
+            return self.db_instance.mset_nonatomic(data)
+        return super().execute_set_many(data)
+
+    def execute_get_many(self, *keys):
+        if isinstance(self.db_instance, RedisCluster):
+            return self.db_instance.mget_nonatomic(keys)
+        return super().execute_get_many(*keys)
+
     def set(self, key: str, value: str,
             expiry: ExpiryType = None) -> bool:
         return self.db_instance.set(
@@ -13,13 +13,15 @@ class _RedisSetPipeline(_RedisDB):
 
     def set(self, key: str, data: Iterable,
             expiry: ExpiryType = None,
-            redis_multi: bool = False) -> None:
+            redis_multi: bool = False,
+            conv: Conversions = None) -> None:
         if not isinstance(data, Iterable):
             raise InavlidRedisValueError(
                 "Invalid value for Set set. "
                 "Expected iterable, got - {}".format(
                     type(data)))
-        res = [self.conv.final_value(
+        conv = conv or self.conv
+        res = [conv.final_value(
             obj) for obj in data]
         self.db_multi(redis_multi)
         self.delete(*[key])
@@ -31,6 +33,14 @@ class _RedisSetPipeline(_RedisDB):
     def execute_get(self, key: str):
         return self.db_instance.smembers(
             key)
+
+    def execute_scan(self, key: str, cursor: int = 0,
+                     count: int = 1000):
+        return self.db_instance.sscan(
+            key, cursor, count=count)
+
+    def execute_len(self, key: str):
+        return self.db_instance.scard(key)
     
     def format_get(self, *values) -> Set[
         RedisNativeTypes]:
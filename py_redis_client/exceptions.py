@@ -36,3 +36,10 @@ class InavlidRedisKeyError(Error):
         Exception raised if an invalid key passed/found
     """
     pass
+
+
+class LockNotAcquiredError(Error):
+    """
+        Exception raised if a lock is not acquired in time
+    """
+    pass
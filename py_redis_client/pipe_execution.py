@@ -1,6 +1,7 @@
 import redis
 from redis import client
-from typing import List
+from redis.asyncio import client as asyncio_client
+from typing import List, Iterable
 
 from py_redis_client.exceptions import InvalidFormatError
 
@@ -8,50 +9,71 @@ from py_redis_client.exceptions import InvalidFormatError
 class Operation:
     def __init__(
             self, klass,
-            executable: str, variables: List[str] = [],
+            executable: str, variables: List[str] = None,
             pipe: client.Pipeline = None,
-            args: list = [], kwargs: dict = {}) -> None:
+            args: list = None, kwargs: dict = None) -> None:
         self.pipe = pipe
-        self.variables = variables
+        self.variables = list(variables or [])
         self.klass = klass
         self.executable = executable
-        self.args = args
-        self.kwargs = kwargs
-    
-    @property
-    def execute(self):
+        self.args = list(args or [])
+        self.kwargs = dict(kwargs or {})
+
+    def execute_on(self, pipe: client.Pipeline) -> None:
         try:
-            instance = self.klass(self.pipe)
+            instance = self.klass(pipe)
             method = getattr(instance, self.executable)
             method(*self.args, **self.kwargs)
         except Exception as err:
             raise InvalidFormatError(
                 "Invalid operation. Error - {}".format(err))
 
+    @property
+    def execute(self):
+        self.execute_on(self.pipe)
 
-class PipeExecution:
-    operations: List[Operation] = []
 
-    def __init__(self, redis: redis.Redis) -> None:
-        self.redis = redis
+class Batch:
+    """
+    Isolated, reusable list of operations executed in one pipeline.
 
-    def add_operation(
-            self, operation: Operation) -> None:
+    Executing a batch does not mutate it or its operations, so the same
+    batch can be executed again or from several threads at once, each
+    execution checking out its own pipeline.
+    """
+
+    def __init__(
+            self, operations: Iterable[Operation] = None) -> None:
+        self.operations: List[Operation] = list(operations or [])
+
+    def add(self, operation: Operation) -> None:
         self.operations.append(operation)
-    
-    @property
-    def clear_operations(self):
-        self.operations = []
-    
-    @property
-    def execute(self):
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def queue_on(self, pipe: client.Pipeline) -> List[str]:
         variables = []
-        with self.redis.pipeline() as pipe:
-            for op in self.operations:
-                op.pipe = pipe
-                op.execute
-                variables.extend(op.variables)
+        for op in self.operations:
+            op.execute_on(pipe)
+            variables.extend(op.variables)
+        return variables
+
+    def execute(self, redis_conn: redis.Redis) -> dict:
+        with redis_conn.pipeline() as pipe:
+            variables = self.queue_on(pipe)
             result = pipe.execute()
+        return self.collect(variables, result)
+
+    async def execute_async(
+            self, redis_conn: asyncio_client.Redis) -> dict:
+        async with redis_conn.pipeline() as pipe:
+            variables = self.queue_on(pipe)
+            result = await pipe.execute()
+        return self.collect(variables, result)
+
+    @staticmethod
+    def collect(variables: List[str], result: list) -> dict:
         if not variables:
             variables = [""] * len(result)
         try:
@@ -61,3 +83,25 @@ class PipeExecution:
             raise InvalidFormatError(
                 "Mismatch between variables and results "
                 "in Pipe executions")
+
+
+class PipeExecution:
+    def __init__(self, redis: redis.Redis) -> None:
+        self.redis = redis
+        self.batch = Batch()
+
+    @property
+    def operations(self) -> List[Operation]:
+        return self.batch.operations
+
+    def add_operation(
+            self, operation: Operation) -> None:
+        self.batch.add(operation)
+
+    @property
+    def clear_operations(self):
+        self.batch = Batch()
+
+    @property
+    def execute(self):
+        return self.batch.execute(self.redis)
@@ -0,0 +1,641 @@
+import redis
+from redis import client
+from redis.asyncio import client as asyncio_client
+from typing import Union, List, Any
+
+
+class LuaScript:
+    """
+    Lazily registered Lua script executed through EVALSHA.
+
+    The underlying redis-py ``Script`` caches the SHA1 of the source and
+    reloads it on a NOSCRIPT error, so a single instance can be shared by
+    every connection and pipeline of the process. Called with a
+    ``redis.asyncio`` connection it returns an awaitable.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.__scripts = {}
+
+    def __call__(
+            self, redis_conn: Union[
+                redis.Redis, client.Pipeline, asyncio_client.Redis],
+            keys: List[str] = [], args: List[Any] = []) -> Any:
+        is_async = isinstance(redis_conn, asyncio_client.Redis)
+        script = self.__scripts.get(is_async)
+        if script is None:
+            script = self.__scripts[is_async] = (
+                redis_conn.register_script(self.source))
+        return script(keys=keys, args=args, client=redis_conn)
+
+    def eval_on(self, pipe: client.Pipeline,
+                keys: List[str] = [], args: List[Any] = []) -> None:
+        """
+        Queues the script on a pipeline with EVAL. Unlike EVALSHA through
+        redis-py, this needs no SCRIPT EXISTS round trip before the pipeline
+        is executed.
+        """
+        pipe.eval(self.source, len(keys), *keys, *args)
+
+
+# KEYS - logical cache keys
+# ARGV - encoded list, set and hmap address tags, encoded str prefix
+RESOLVE_GET = LuaScript("""
+local function split_fields(value)
+    local fields = {}
+    if not value then
+        return fields
+    end
+    value = string.sub(value, #ARGV[4] + 1)
+    for field in string.gmatch(value, "[^$]+") do
+        fields[#fields + 1] = field
+    end
+    return fields
+end
+
+local res = {}
+for idx, key in ipairs(KEYS) do
+    local addr = redis.call("GET", key .. "$addr")
+    if addr == ARGV[1] then
+        res[idx] = {addr, redis.call("LRANGE", key, 0, -1)}
+    elseif addr == ARGV[2] then
+        res[idx] = {addr, redis.call("SMEMBERS", key)}
+    elseif addr == ARGV[3] then
+        local iterables = {}
+        for _, field in ipairs(split_fields(
+                redis.call("GET", key .. "$list"))) do
+            iterables[#iterables + 1] = {ARGV[1], field, redis.call(
+                "LRANGE", key .. "$" .. field, 0, -1)}
+        end
+        for _, field in ipairs(split_fields(
+                redis.call("GET", key .. "$set"))) do
+            iterables[#iterables + 1] = {ARGV[2], field, redis.call(
+                "SMEMBERS", key .. "$" .. field)}
+        end
+        res[idx] = {addr, redis.call("HGETALL", key), iterables}
+    else
+        res[idx] = {false, redis.call(
+            "MGET", key, "|lsep|" .. key, "|ssep|" .. key)}
+    end
+end
+return res
+""")
+
+
+# KEYS - logical cache keys
+# ARGV - operation (del, expire or exists), encoded str prefix, expiry in
+# milliseconds for expire. Covers every key of a value: the value, its
+# separated forms, address and field metadata, the sub-keys of its list and
+# set fields and its delta key. Returns the number of keys found.
+KEY_FAMILY = LuaScript("""
+local op, PREFIX = ARGV[1], ARGV[2]
+
+-- unpack is bounded by the Lua stack, values can have any number of fields
+local function unlink(keys)
+    local removed = 0
+    for start = 1, #keys, 1000 do
+        removed = removed + redis.call("UNLINK", unpack(
+            keys, start, math.min(start + 999, #keys)))
+    end
+    return removed
+end
+
+local found = 0
+for _, key in ipairs(KEYS) do
+    local family = {key, "|lsep|" .. key, "|ssep|" .. key,
+                    key .. "$addr", key .. "$list", key .. "$set"}
+    if op == "exists" then
+        if redis.call("EXISTS", unpack(family)) > 0 then
+            found = found + 1
+        end
+    else
+        for _, suffix in ipairs({"$list", "$set"}) do
+            local fields = redis.call("GET", key .. suffix)
+            if fields then
+                fields = string.sub(fields, #PREFIX + 1)
+                for field in string.gmatch(fields, "[^$]+") do
+                    family[#family + 1] = key .. "$" .. field
+                end
+            end
+        end
+        family[#family + 1] = "|delta|" .. key
+        local touched = 0
+        if op == "del" then
+            touched = unlink(family)
+        else
+            for _, member in ipairs(family) do
+                touched = touched + redis.call("PEXPIRE", member, ARGV[3])
+            end
+        end
+        if touched > 0 then
+            found = found + 1
+        end
+    end
+end
+return found
+""")
+
+
+# KEYS - tag set
+# ARGV - expiry in milliseconds of the tagged keys (0 for none), then the
+# tagged keys. The set is kept as long as the longest lived of its keys, so
+# it expires with them, and is persisted by keys without expiry.
+TAG_KEYS = LuaScript("""
+local ms = tonumber(ARGV[1])
+local created = redis.call("EXISTS", KEYS[1]) == 0
+for start = 2, #ARGV, 1000 do
+    redis.call("SADD", KEYS[1], unpack(
+        ARGV, start, math.min(start + 999, #ARGV)))
+end
+if ms == 0 then
+    redis.call("PERSIST", KEYS[1])
+elseif created then
+    redis.call("PEXPIRE", KEYS[1], ms)
+else
+    local ttl = redis.call("PTTL", KEYS[1])
+    if ttl >= 0 and ttl < ms then
+        redis.call("PEXPIRE", KEYS[1], ms)
+    end
+end
+return 1
+""")
+
+
+# KEYS - lease key, optional list waiters block on
+# ARGV - token the lease was acquired with, lifetime in milliseconds of the
+# wake-up pushed to the waiters list. A single wake-up is kept in the list.
+RELEASE_LEASE = LuaScript("""
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    local released = redis.call("DEL", KEYS[1])
+    if KEYS[2] then
+        redis.call("DEL", KEYS[2])
+        redis.call("RPUSH", KEYS[2], 1)
+        redis.call("PEXPIRE", KEYS[2], ARGV[2])
+    end
+    return released
+end
+return 0
+""")
+
+
+# KEYS - lease key
+# ARGV - token the lease was acquired with, new lifetime in milliseconds
+EXTEND_LEASE = LuaScript("""
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+""")
+
+
+# KEYS - logical cache key
+# ARGV - encoded list, set and hmap address tags, encoded str prefix, then
+# records of operation (rpush, sadd, srem, hset, hdel, or list/set to
+# replace a field), encoded field ("" for the value itself), member count
+# and encoded members. A value set at a path replaces the fields under
+# it and its ancestors that are not dicts. Returns -1 if the key holds a
+# packed, separated or plain value, -2 if it holds another type or a
+# dict is found where a list or set is updated, else the reply of the
+# last rpush/sadd/srem.
+UPDATE_VALUE = LuaScript("""
+local key = KEYS[1]
+local LIST_TAG, SET_TAG, HMAP_TAG, PREFIX = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local addr_key = key .. "$addr"
+local addr = redis.call("GET", addr_key)
+local ttl = redis.call("PTTL", addr_key)
+
+local expected = HMAP_TAG
+if ARGV[6] == "" then
+    expected = ARGV[5] == "rpush" and LIST_TAG or SET_TAG
+end
+if not addr then
+    if redis.call("EXISTS", key, "|lsep|" .. key, "|ssep|" .. key) > 0 then
+        return -1
+    end
+    local creates = false
+    local idx = 5
+    while idx <= #ARGV do
+        if ARGV[idx] ~= "srem" and ARGV[idx] ~= "hdel" then
+            creates = true
+        end
+        idx = idx + 3 + tonumber(ARGV[idx + 2])
+    end
+    if not creates then
+        return 0
+    end
+    redis.call("SET", addr_key, expected)
+    ttl = -1
+elseif addr ~= expected then
+    return -2
+end
+
+local function expire_new(target)
+    if ttl > 0 then
+        redis.call("PEXPIRE", target, ttl)
+    end
+end
+
+local function starts_with(value, prefix)
+    return string.sub(value, 1, #prefix) == prefix
+end
+
+local function call_chunked(command, target, members)
+    local res = 0
+    for first = 1, #members, 1000 do
+        local reply = redis.call(command, target, unpack(
+            members, first, math.min(first + 999, #members)))
+        res = command == "rpush" and reply or res + reply
+    end
+    return res
+end
+
+local metas = {}
+for tag, suffix in pairs({[LIST_TAG] = "$list", [SET_TAG] = "$set"}) do
+    local meta = {key = key .. suffix, fields = {}, changed = false}
+    local value = redis.call("GET", meta.key)
+    if value then
+        for field in string.gmatch(
+                string.sub(value, #PREFIX + 1), "[^$]+") do
+            meta.fields[field] = true
+        end
+    end
+    metas[tag] = meta
+end
+
+-- Hash field names under each path prefix, "a" -> {"a|b", "|lsep|a|c"},
+-- loaded on first use with a single HKEYS.
+local index = nil
+
+local function index_update(name, present)
+    local path = name
+    if starts_with(name, "|lsep|") or starts_with(name, "|ssep|") then
+        path = string.sub(name, 7)
+    end
+    local pos = string.find(path, "|", 1, true)
+    while pos do
+        local prefix = string.sub(path, 1, pos - 1)
+        index[prefix] = index[prefix] or {}
+        index[prefix][name] = present or nil
+        pos = string.find(path, "|", pos + 1, true)
+    end
+end
+
+local function load_index()
+    if not index then
+        index = {}
+        for _, name in ipairs(redis.call("HKEYS", key)) do
+            index_update(name, true)
+        end
+    end
+end
+
+local function hdel(names)
+    for first = 1, #names, 1000 do
+        redis.call("HDEL", key, unpack(
+            names, first, math.min(first + 999, #names)))
+    end
+    if index then
+        for _, name in ipairs(names) do
+            index_update(name, false)
+        end
+    end
+end
+
+local function drop_field(field)
+    hdel({field, "|lsep|" .. field, "|ssep|" .. field})
+    for _, meta in pairs(metas) do
+        if meta.fields[field] then
+            meta.fields[field] = nil
+            meta.changed = true
+            redis.call("DEL", key .. "$" .. field)
+        end
+    end
+end
+
+local function has_subtree(field)
+    load_index()
+    if next(index[field] or {}) then
+        return true
+    end
+    for _, meta in pairs(metas) do
+        for name in pairs(meta.fields) do
+            if starts_with(name, field .. "|") then
+                return true
+            end
+        end
+    end
+    return false
+end
+
+local function drop_subtree(field)
+    load_index()
+    local names = {}
+    for name in pairs(index[field] or {}) do
+        names[#names + 1] = name
+    end
+    hdel(names)
+    for _, meta in pairs(metas) do
+        for name in pairs(meta.fields) do
+            if starts_with(name, field .. "|") then
+                meta.fields[name] = nil
+                meta.changed = true
+                redis.call("DEL", key .. "$" .. name)
+            end
+        end
+    end
+end
+
+-- A value set at a path replaces whatever was stored at the path, under
+-- it, and at its ancestors when they are not dicts.
+local function drop_ancestors(field)
+    local pos = string.find(field, "|", 1, true)
+    while pos do
+        drop_field(string.sub(field, 1, pos - 1))
+        pos = string.find(field, "|", pos + 1, true)
+    end
+end
+
+local function drop_path(field)
+    drop_ancestors(field)
+    drop_field(field)
+    drop_subtree(field)
+end
+
+local function push(op, target, members)
+    local existed = redis.call("EXISTS", target) == 1
+    local res = call_chunked(op, target, members)
+    if not existed then
+        expire_new(target)
+    end
+    return res
+end
+
+local hash_existed = redis.call("EXISTS", key) == 1
+local res = 0
+local idx = 5
+while idx <= #ARGV do
+    local op, field, count = ARGV[idx], ARGV[idx + 1], tonumber(
+        ARGV[idx + 2])
+    local members = {}
+    for member = idx + 3, idx + 2 + count do
+        members[#members + 1] = ARGV[member]
+    end
+    idx = idx + 3 + count
+    if op == "hset" then
+        drop_path(field)
+        redis.call("HSET", key, field, members[1])
+        if index then
+            index_update(field, true)
+        end
+    elseif op == "hdel" then
+        drop_field(field)
+        drop_subtree(field)
+    elseif op == "list" or op == "set" then
+        local meta = metas[op == "list" and LIST_TAG or SET_TAG]
+        drop_path(field)
+        meta.fields[field] = true
+        meta.changed = true
+        push(op == "list" and "rpush" or "sadd",
+            key .. "$" .. field, members)
+    elseif field == "" then
+        res = op == "srem" and call_chunked(op, key, members) or push(
+            op, key, members)
+        if redis.call("EXISTS", key) == 0 then
+            redis.call("DEL", addr_key)
+        end
+    else
+        local target = key .. "$" .. field
+        local meta = metas[op == "rpush" and LIST_TAG or SET_TAG]
+        if meta.fields[field] then
+            res = op == "srem" and call_chunked(
+                op, target, members) or push(op, target, members)
+            if redis.call("EXISTS", target) == 0 then
+                meta.fields[field] = nil
+                meta.changed = true
+            end
+        elseif metas[LIST_TAG].fields[field] or metas[SET_TAG].fields[
+                field] or redis.call("HEXISTS", key, field) == 1
+                or has_subtree(field) then
+            return -2
+        elseif op ~= "srem" then
+            drop_ancestors(field)
+            meta.fields[field] = true
+            meta.changed = true
+            res = push(op, target, members)
+        end
+    end
+end
+
+if not hash_existed and redis.call("EXISTS", key) == 1 then
+    expire_new(key)
+end
+local fields = 0
+for _, meta in pairs(metas) do
+    local names = {}
+    for name in pairs(meta.fields) do
+        names[#names + 1] = name
+    end
+    fields = fields + #names
+    if meta.changed and #names == 0 then
+        redis.call("DEL", meta.key)
+    elseif meta.changed then
+        redis.call("SET", meta.key, PREFIX .. table.concat(names, "$"))
+        expire_new(meta.key)
+    end
+end
+if expected == HMAP_TAG and fields == 0 and redis.call(
+        "EXISTS", key) == 0 then
+    redis.call("DEL", addr_key)
+end
+return res
+""")
+
+
+# KEYS - counter keys, the dict key for field counters
+# ARGV - encoded hmap address tag and str prefix, then per key the encoded
+# field ("" for the value itself), the amount and "i" or "f" for integer or
+# float amounts. Integers are stored with their usual "int" tag and added as
+# decimal strings, as Lua numbers are exact below 2^53 only. Plain digits
+# are accepted as a counter too and stored tagged once incremented. Returns
+# per key the new encoded value, or false if the value has to be rewritten:
+# the dict is packed, or a binary integer or an integer added to a float is
+# not below 2^53.
+INCREMENT = LuaScript("""
+local HMAP_TAG, PREFIX = ARGV[1], ARGV[2]
+local LIMIT = 2 ^ 53
+
+local function add_magnitudes(a, b)
+    local digits, carry = {}, 0
+    for idx = 0, math.max(#a, #b) - 1 do
+        local sum = carry + (tonumber(string.sub(a, -idx - 1, -idx - 1)) or 0)
+            + (tonumber(string.sub(b, -idx - 1, -idx - 1)) or 0)
+        digits[#digits + 1] = sum % 10
+        carry = math.floor(sum / 10)
+    end
+    if carry > 0 then
+        digits[#digits + 1] = carry
+    end
+    return string.reverse(table.concat(digits))
+end
+
+-- a is not smaller than b.
+local function subtract_magnitudes(a, b)
+    local digits, borrow = {}, 0
+    for idx = 0, #a - 1 do
+        local diff = tonumber(string.sub(a, -idx - 1, -idx - 1)) - borrow
+            - (tonumber(string.sub(b, -idx - 1, -idx - 1)) or 0)
+        borrow = diff < 0 and 1 or 0
+        digits[#digits + 1] = diff + 10 * borrow
+    end
+    return (string.gsub(string.reverse(table.concat(digits)), "^0+(%d)", "%1"))
+end
+
+local function add_integers(a, b)
+    local a_neg, a_digits = string.match(a, "^(-?)0*(%d-)$")
+    local b_neg, b_digits = string.match(b, "^(-?)0*(%d-)$")
+    if a_digits == "" then
+        return b
+    elseif b_digits == "" then
+        return a
+    end
+    local neg, digits = a_neg, nil
+    if a_neg == b_neg then
+        digits = add_magnitudes(a_digits, b_digits)
+    elseif #a_digits > #b_digits or (
+            #a_digits == #b_digits and a_digits >= b_digits) then
+        digits = subtract_magnitudes(a_digits, b_digits)
+    else
+        neg, digits = b_neg, subtract_magnitudes(b_digits, a_digits)
+    end
+    if digits == "0" then
+        neg = ""
+    end
+    return neg .. digits
+end
+
+local function decode_binary_int(value)
+    local number = 0
+    for idx = 3, #value do
+        number = number * 256 + string.byte(value, idx)
+    end
+    if #value > 2 and string.byte(value, 3) >= 128 then
+        number = number - 256 ^ (#value - 2)
+    end
+    return number
+end
+
+local function parse(value)
+    if not value then
+        return "0", false, false
+    end
+    if string.match(value, "^-?%d+$") then
+        return value, false, false
+    end
+    if string.sub(value, 1, 3) == "int" and string.match(
+            string.sub(value, 4), "^-?%d+$") then
+        return string.sub(value, 4), false, false
+    end
+    if string.sub(value, 1, 5) == "float" and tonumber(
+            string.sub(value, 6)) then
+        return tonumber(string.sub(value, 6)), true, false
+    end
+    if string.sub(value, 1, 2) == "\\0i" then
+        local number = decode_binary_int(value)
+        if math.abs(number) >= LIMIT then
+            return number, false, true, true
+        end
+        return string.format("%d", number), false, true
+    end
+    if string.sub(value, 1, 2) == "\\0f" and tonumber(
+            string.sub(value, 3)) then
+        return tonumber(string.sub(value, 3)), true, true
+    end
+    return nil
+end
+
+local function has_field(meta_key, field)
+    local meta = redis.call("GET", meta_key)
+    return meta and string.find(
+        "$" .. string.sub(meta, #PREFIX + 1) .. "$",
+        "$" .. field .. "$", 1, true)
+end
+
+local counters = {}
+for idx, key in ipairs(KEYS) do
+    local base = 3 * idx
+    local counter = {key = key, field = ARGV[base], amount = ARGV[base + 1],
+        is_float_amount = ARGV[base + 2] == "f"}
+    local value
+    if counter.field == "" then
+        local kind = redis.call("TYPE", key).ok
+        if kind ~= "string" and kind ~= "none" then
+            return redis.error_reply("Value of " .. key .. " is not a number")
+        end
+        value = redis.call("GET", key)
+    else
+        local addr = redis.call("GET", key .. "$addr")
+        if not addr and redis.call("EXISTS", key) == 1 then
+            counter.packed = true
+        elseif addr and addr ~= HMAP_TAG then
+            return redis.error_reply("Value of " .. key .. " is not a dict")
+        elseif has_field(key .. "$list", counter.field) or has_field(
+                key .. "$set", counter.field) then
+            return redis.error_reply(
+                "Field " .. counter.field .. " of " .. key ..
+                " is not a number")
+        else
+            counter.create = not addr
+            value = redis.call("HGET", key, counter.field)
+        end
+    end
+    if not counter.packed then
+        counter.number, counter.is_float, counter.is_binary,
+            counter.rewrite = parse(value)
+        if counter.number == nil then
+            return redis.error_reply(
+                "Value of " .. key .. " " .. counter.field ..
+                " is not a number")
+        end
+        if counter.is_float ~= counter.is_float_amount then
+            local int = counter.is_float and counter.amount or counter.number
+            counter.rewrite = counter.rewrite or math.abs(
+                tonumber(int)) >= LIMIT
+        end
+    end
+    counters[idx] = counter
+end
+
+local res = {}
+for idx, counter in ipairs(counters) do
+    local key, field = counter.key, counter.field
+    if counter.packed or counter.rewrite then
+        res[idx] = false
+    else
+        if counter.create then
+            redis.call("SET", key .. "$addr", HMAP_TAG)
+        end
+        if not counter.is_float and not counter.is_float_amount then
+            local encoded = "int" .. add_integers(
+                counter.number, counter.amount)
+            if field == "" then
+                redis.call("SET", key, encoded, "KEEPTTL")
+            else
+                redis.call("HSET", key, field, encoded)
+            end
+            res[idx] = encoded
+        else
+            local encoded = (counter.is_binary and "\\0f" or "float") ..
+                string.format("%.17g", tonumber(counter.number) +
+                    tonumber(counter.amount))
+            if field == "" then
+                redis.call("SET", key, encoded, "KEEPTTL")
+            else
+                redis.call("HSET", key, field, encoded)
+            end
+            res[idx] = encoded
+        end
+    end
+end
+return res
+""")
@@ -6,7 +6,9 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=[
-       "redis", "django>=4.2"],
+       "redis>=4.2", "django>=4.2"],
+    extras_require={
+        "test": ["pytest", "fakeredis[lua]", "django-redis"]},
     description="A helper library, built over redis-py, to use as cache, lock etc.",
     license='MIT',
     long_description=open('README.md').read(),
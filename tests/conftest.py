@@ -0,0 +1,96 @@
+import socket
+import threading
+
+import django
+import fakeredis
+import pytest
+import redis
+from django.conf import settings
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# A fakeredis server over TCP, with Lua through lupa, stands in for Redis:
+# django-redis builds its own clients from the location.
+PORT = _free_port()
+SERVER = fakeredis.TcpFakeServer(("127.0.0.1", PORT))
+SERVER.daemon_threads = True
+threading.Thread(target=SERVER.serve_forever, daemon=True).start()
+LOCATION = "redis://127.0.0.1:{}/0".format(PORT)
+
+CACHE_OPTIONS = {
+    "default": {},
+    "script": {"READ_ENGINE": "script"},
+    "binary": {"CODEC": "binary", "COMPRESS_THRESHOLD": 256},
+    "pack": {"PACK": {"MAX_ELEMENTS": 8}},
+    "packbin": {"PACK": {"MAX_ELEMENTS": 8, "MAX_BYTES": 400},
+                "CODEC": "binary", "READ_ENGINE": "script"},
+    "local": {"LOCAL_CACHE": {"MAX_ENTRIES": 100, "TIMEOUT": 5}},
+    "tracking": {"LOCAL_CACHE": {"TRACKING": "bcast",
+                                 "TRACKING_PREFIXES": ["t:"]}},
+    "chunked": {"CHUNK_SIZE": 3},
+}
+# Aliases of the sharded cache, each on a database of its own.
+SHARDS = {"shard1": 1, "shard2": 2, "shard3": 3}
+
+
+def _caches() -> dict:
+    caches = {name: {"BACKEND": "django_redis.cache.RedisCache",
+                     "LOCATION": LOCATION, "OPTIONS": options}
+              for name, options in CACHE_OPTIONS.items()}
+    for name, db in SHARDS.items():
+        caches[name] = {"BACKEND": "django_redis.cache.RedisCache",
+                        "LOCATION": LOCATION[:-1] + str(db)}
+    return caches
+
+
+settings.configure(CACHES=_caches())
+django.setup()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    SERVER.shutdown()
+    SERVER.server_close()
+
+
+def _connect(db: int = 0) -> redis.Redis:
+    from py_redis_client import scripts
+    conn = redis.Redis(port=PORT, db=db)
+    conn.flushdb()
+    # The fake server drops a connection after any error reply, NOSCRIPT
+    # included, which breaks the script reload inside pipelines.
+    for script in vars(scripts).values():
+        if isinstance(script, scripts.LuaScript):
+            conn.script_load(script.source)
+    return conn
+
+
+@pytest.fixture
+def redis_conn():
+    conn = _connect()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def shard_conns(redis_conn):
+    conns = {name: _connect(db) for name, db in SHARDS.items()}
+    yield conns
+    for conn in conns.values():
+        conn.close()
+
+
+@pytest.fixture
+def cache(redis_conn):
+    from py_redis_client.cache import Cache
+    return Cache("default")
+
+
+@pytest.fixture(params=["default", "script", "binary", "pack", "packbin"])
+def any_cache(request, redis_conn):
+    from py_redis_client.cache import Cache
+    return Cache(request.param)
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from py_redis_client.cache import AsyncCache
+from py_redis_client.exceptions import InavlidRedisKeyError, InvalidFormatError
+
+
+VALUES = {
+    "int": 1,
+    "falsy": 0,
+    "str": "text",
+    "list": [1, "a", 2.5],
+    "set": {1, "b"},
+    "empty": [],
+    "nested": {"a": 1, "b": [1, 2], "c": {3}, "d": {"e": "x"}},
+}
+
+
+def run(alias, test):
+    async def main():
+        cache = AsyncCache(alias)
+        try:
+            return await test(cache)
+        finally:
+            await cache.redis_conn.aclose()
+    return asyncio.run(main())
+
+
+@pytest.fixture(params=["default", "script", "binary", "pack", "packbin"])
+def alias(request, redis_conn):
+    return request.param
+
+
+def test_set_and_get(alias, redis_conn):
+    async def test(cache):
+        await cache.set_many(VALUES, timeout=100)
+        await cache.set("sep", [1, 2], separator=",")
+        assert await cache.get("nested") == VALUES["nested"]
+        assert await cache.get("missing") is None
+        return await cache.get_many(*VALUES, "sep", "missing")
+    assert run(alias, test) == {**VALUES, "sep": [1, 2]}
+    assert 0 < redis_conn.ttl("int") <= 100
+
+
+def test_delete_exists_expire(alias, redis_conn):
+    async def test(cache):
+        await cache.set_many(VALUES)
+        assert await cache.exists(*VALUES)
+        assert not await cache.exists("int", "missing")
+        assert await cache.expire(100, *VALUES)
+        assert not await cache.expire(100, "int", "missing")
+        assert all(0 < redis_conn.ttl(key) <= 100
+                   for key in redis_conn.keys())
+        assert await cache.delete(*VALUES, "missing")
+        assert redis_conn.keys() == []
+        await cache.set("a", 1)
+        assert await cache.flush()
+        return await cache.get_many(*VALUES, "a")
+    assert run(alias, test) == {}
+
+
+def test_reads_sync_writes(cache):
+    cache.set_many(VALUES)
+
+    async def test(async_cache):
+        return await async_cache.get_many(*VALUES)
+    assert run("default", test) == VALUES
+
+
+@pytest.mark.parametrize("call", [
+    lambda cache: cache.delete(1),
+    lambda cache: cache.exists(1),
+    lambda cache: cache.expire(10, 1),
+    lambda cache: cache.get(1),
+])
+def test_invalid_keys(redis_conn, call):
+    async def test(cache):
+        with pytest.raises(InavlidRedisKeyError):
+            await call(cache)
+    run("default", test)
+
+
+def test_validation(redis_conn):
+    async def test(cache):
+        with pytest.raises(InvalidFormatError):
+            await cache.set_many([("a", 1)])
+        with pytest.raises(InvalidFormatError):
+            await cache.set("a", 1, timeout="1")
+        with pytest.raises(InvalidFormatError):
+            await cache.expire("1", "a")
+    run("default", test)
@@ -0,0 +1,127 @@
+import pytest
+import redis
+from redis.client import Pipeline
+
+from py_redis_client.cache import Cache
+from py_redis_client.exceptions import InvalidFormatError
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    """
+    Records the transaction flag and length of every pipeline executed.
+    """
+    pipelines = []
+    execute = Pipeline.execute
+
+    def record(self, *args, **kwargs):
+        pipelines.append((self.transaction, len(self)))
+        return execute(self, *args, **kwargs)
+    monkeypatch.setattr(Pipeline, "execute", record)
+    return pipelines
+
+
+def test_results_per_operation(any_cache, executed):
+    any_cache.set_many({"a": 1, "b": [1, 2]})
+    executed.clear()
+    with any_cache.batch() as batch:
+        first = batch.get("a")
+        written = batch.set("c", {"d": {1}}, timeout=100)
+        both = batch.get_many("a", "b", "c", "missing")
+        none = batch.get_many()
+        exists = batch.exists("a", "c")
+        not_all = batch.exists("a", "missing")
+        expired = batch.expire(50, "a", "b")
+        deleted = batch.delete("b")
+        after = batch.get_many("a", "b")
+    assert first.value == 1
+    assert written.value is None
+    assert both.value == {"a": 1, "b": [1, 2], "c": {"d": {1}}}
+    assert none.value == {}
+    assert (exists.value, not_all.value) == (True, False)
+    assert expired.value is True
+    assert deleted.value is True
+    assert after.value == {"a": 1}
+    assert [transaction for transaction, _ in executed] == [False]
+    assert batch.executed
+
+
+def test_execute_returns_every_result(cache):
+    batch = cache.batch()
+    batch.set("a", 1)
+    batch.get("a")
+    assert batch.execute() == [None, 1]
+    with pytest.raises(InvalidFormatError):
+        batch.execute()
+    with pytest.raises(InvalidFormatError):
+        batch.get("a")
+
+
+def test_results_are_pending_until_executed(cache):
+    batch = cache.batch()
+    result = batch.get("a")
+    assert not result.ready
+    with pytest.raises(InvalidFormatError):
+        result.value
+    batch.execute()
+    assert result.ready and result.value is None
+
+
+def test_transaction(cache, executed):
+    with cache.batch(transaction=True) as batch:
+        batch.set_many({"a": 1, "b": 2})
+        found = batch.get_many("a", "b")
+    assert found.value == {"a": 1, "b": 2}
+    assert [transaction for transaction, _ in executed] == [True]
+
+
+def test_not_executed_on_error(cache):
+    with pytest.raises(ValueError):
+        with cache.batch() as batch:
+            batch.set("a", 1)
+            raise ValueError("abort")
+    assert not batch.executed
+    assert cache.get("a") is None
+
+
+def test_command_errors_propagate(redis_conn):
+    cache = Cache("local")
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    # An address tag pointing at a string makes the read script fail.
+    redis_conn.set("bad", "strx")
+    redis_conn.set("bad$addr", "strlist")
+    batch = cache.batch()
+    batch.set("a", 2)
+    result = batch.get("bad")
+    with pytest.raises(redis.ResponseError):
+        batch.execute()
+    assert not result.ready
+    # The write went through and the local copy was dropped.
+    assert cache.get("a") == 2
+
+
+def test_writes_invalidate_local_and_scope(redis_conn):
+    cache = Cache("local")
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    with cache.batching() as loader:
+        assert cache.get_many("a", "b", "c") == {"a": 1, "b": 2, "c": 3}
+        with cache.batch() as batch:
+            batch.set("a", 4)
+            batch.delete("b")
+            batch.expire(100, "c")
+        assert cache.get_many("a", "b", "c") == {"a": 4, "c": 3}
+        assert loader.dispatches == 2
+    assert cache.get_many("a", "b") == {"a": 4}
+
+
+def test_validation(cache):
+    batch = cache.batch()
+    with pytest.raises(InvalidFormatError):
+        batch.set_many([("a", 1)])
+    with pytest.raises(InvalidFormatError):
+        batch.set("a", 1, timeout="1")
+    with pytest.raises(InvalidFormatError):
+        batch.set("a", 1, tags="t")
+    with pytest.raises(InvalidFormatError):
+        batch.expire("1", "a")
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from py_redis_client.cache import Cache
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.exceptions import InvalidFormatError
+
+
+DATA = {"k{}".format(idx): {"n": idx, "l": [idx]} for idx in range(10)}
+
+
+@pytest.fixture
+def chunked(redis_conn):
+    return Cache("chunked")
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"map": [], "unmap": []}
+    map_to_db, unmap_from_db = Mapper.map_to_db, Mapper.unmap_from_db
+
+    def counted_map(redis_conn, data, *args, **kwargs):
+        calls["map"].append(len(data))
+        return map_to_db(redis_conn, data, *args, **kwargs)
+
+    def counted_unmap(redis_conn, *keys, **kwargs):
+        calls["unmap"].append(len(keys))
+        return unmap_from_db(redis_conn, *keys, **kwargs)
+    monkeypatch.setattr(Mapper, "map_to_db", counted_map)
+    monkeypatch.setattr(Mapper, "unmap_from_db", counted_unmap)
+    return calls
+
+
+def test_set_and_get_many_in_chunks(chunked, calls):
+    chunked.set_many(DATA)
+    assert calls["map"] == [3, 3, 3, 1]
+    assert chunked.get_many(*DATA, "missing") == DATA
+    assert calls["unmap"] == [3, 3, 3, 2]
+
+
+def test_iter_many_yields_found_keys_in_order(chunked, calls):
+    chunked.set_many(DATA)
+    keys = ["k9", "missing", "k0", "k5"]
+    assert list(chunked.iter_many(iter(keys))) == [
+        ("k9", DATA["k9"]), ("k0", DATA["k0"]), ("k5", DATA["k5"])]
+    assert calls["unmap"] == [3, 1]
+
+
+def test_iter_many_is_lazy(chunked, calls):
+    chunked.set_many(DATA)
+    found = chunked.iter_many(DATA, chunk_size=4)
+    assert next(found) == ("k0", DATA["k0"])
+    assert calls["unmap"] == [4]
+    assert len(list(found)) == 9
+    assert calls["unmap"] == [4, 4, 2]
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1, 1.5, "3"])
+def test_invalid_chunk_size(chunked, chunk_size):
+    with pytest.raises(InvalidFormatError):
+        list(chunked.iter_many(DATA, chunk_size=chunk_size))
+
+
+def test_chunks():
+    assert list(Mapper.chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(Mapper.chunks([], 2)) == []
+
+
+def test_async_iter_many(chunked):
+    from py_redis_client.cache import AsyncCache
+    chunked.set_many(DATA)
+
+    async def run():
+        cache = AsyncCache("chunked")
+        try:
+            with pytest.raises(InvalidFormatError):
+                [item async for item in cache.iter_many(DATA, chunk_size=0)]
+            return [item async for item in cache.iter_many(
+                ["k1", "missing", "k2"])]
+        finally:
+            await cache.redis_conn.aclose()
+    assert asyncio.run(run()) == [("k1", DATA["k1"]), ("k2", DATA["k2"])]
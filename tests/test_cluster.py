@@ -0,0 +1,149 @@
+import pytest
+import redis
+from redis.client import Pipeline
+from redis.crc import key_slot
+
+from py_redis_client.cache import Cache
+from py_redis_client.cache.mapper import DBExecutions, Mapper
+from py_redis_client.db import base, native
+from py_redis_client.exceptions import InavlidRedisKeyError
+
+
+# Commands whose keys are all their arguments, and the position of the key
+# count of the scripting commands.
+MULTI_KEY = {"MGET", "DEL", "UNLINK", "EXISTS", "TOUCH"}
+SCRIPTS = {"EVAL", "EVALSHA"}
+# Commands a cluster client splits per slot itself, unlike its pipelines.
+CLIENT_SPLIT = {"DEL", "UNLINK", "EXISTS", "TOUCH"}
+
+
+def command_keys(args) -> list:
+    name = str(args[0]).upper()
+    if name in MULTI_KEY:
+        return list(args[1:])
+    if name == "MSET":
+        return list(args[1::2])
+    if name in SCRIPTS:
+        return list(args[3:3 + int(args[2])])
+    return []
+
+
+@pytest.fixture
+def slots(monkeypatch):
+    """
+    Records the commands spanning several hash slots, which Redis Cluster
+    rejects, sent through any client or pipeline.
+
+    A plain client stands in for the cluster client: it takes the nonatomic
+    MGET and MSET of the cluster client, and its pipelines take the per key
+    DEL and EXISTS of cluster pipelines.
+    """
+    crossing = []
+
+    def check(args):
+        keys = [key.encode("utf-8") if isinstance(key, str) else key
+                for key in command_keys(args)]
+        if len({key_slot(key) for key in keys}) > 1:
+            crossing.append(args)
+
+    execute_command = redis.Redis.execute_command
+    pipeline_command = Pipeline.pipeline_execute_command
+
+    def redis_command(self, *args, **options):
+        if str(args[0]).upper() not in CLIENT_SPLIT:
+            check(args)
+        return execute_command(self, *args, **options)
+
+    def mget_nonatomic(self, keys):
+        found = {}
+        for group in DBExecutions(None).slot_groups(keys):
+            found.update(zip(group, self.mget(group)))
+        return [found[key] for key in keys]
+
+    def mset_nonatomic(self, mapping):
+        for group in DBExecutions(None).slot_groups(mapping):
+            self.mset({key: mapping[key] for key in group})
+        return True
+
+    def queued_command(self, *args, **options):
+        check(args)
+        return pipeline_command(self, *args, **options)
+    monkeypatch.setattr(redis.Redis, "execute_command", redis_command)
+    monkeypatch.setattr(Pipeline, "pipeline_execute_command", queued_command)
+    monkeypatch.setattr(DBExecutions, "cluster", property(lambda self: True))
+    monkeypatch.setattr(
+        redis.Redis, "mget_nonatomic", mget_nonatomic, raising=False)
+    monkeypatch.setattr(
+        redis.Redis, "mset_nonatomic", mset_nonatomic, raising=False)
+    monkeypatch.setattr(native, "RedisCluster", redis.Redis)
+    monkeypatch.setattr(base, "ClusterPipeline", Pipeline)
+    return crossing
+
+
+@pytest.fixture(params=["default", "script", "binary", "pack", "packbin"])
+def cluster_cache(request, redis_conn, slots):
+    cache = Cache(request.param)
+    cache.cluster = True
+    return cache
+
+
+DATA = {"k{}".format(idx): value for idx, value in enumerate([
+    1, "s", [1, 2], {3, 4},
+    {"a": 1, "b": [1, 2], "c": {5}, "d": {"e": "x"}}] * 4)}
+
+
+def test_keys_are_hash_tagged(cluster_cache, redis_conn):
+    cluster_cache.set_many(DATA, timeout=100)
+    cluster_cache.set("sep", [1, 2], separator=",")
+    for key in redis_conn.keys():
+        assert key.startswith(b"{") or key.startswith(b"|"), key
+        assert key_slot(key) in {
+            key_slot(Mapper.hash_tag(name).encode("utf-8"))
+            for name in [*DATA, "sep"]}
+
+
+def test_reads_and_writes_stay_in_one_slot(cluster_cache, slots):
+    cluster_cache.set_many(DATA, timeout=100)
+    assert cluster_cache.get_many(*DATA, "missing") == DATA
+    assert cluster_cache.exists("k0", "k1")
+    assert not cluster_cache.exists("k0", "missing")
+    assert cluster_cache.expire(50, "k2", "k3")
+    assert cluster_cache.incr_many({"n1": 1, "n2": 2.5}) == {
+        "n1": 1, "n2": 2.5}
+    assert cluster_cache.incr_field("k4", "a", 2) == 3
+    assert cluster_cache.append("k2", 9) == 3
+    assert cluster_cache.get_path("k4", "d|e") == "x"
+    assert cluster_cache.delete(*DATA)
+    assert cluster_cache.get_many(*DATA) == {}
+    assert slots == []
+
+
+def test_batch_stays_in_one_slot(cluster_cache, slots):
+    with cluster_cache.batch() as batch:
+        batch.set_many({"x1": 1, "x2": [1]})
+        found = batch.get_many("x1", "x2")
+        exists = batch.exists("x1", "x2")
+    assert found.value == {"x1": 1, "x2": [1]}
+    assert exists.value is True
+    assert slots == []
+
+
+def test_tags_and_get_or_set(cluster_cache, slots):
+    cluster_cache.set_many({"a": 1, "b": 2}, tags=["t"])
+    assert cluster_cache.invalidate_tags("t") == 2
+    assert cluster_cache.get_many("a", "b") == {}
+    assert cluster_cache.get_or_set("g", lambda: 5, timeout=10) == 5
+    assert slots == []
+
+
+def test_hash_tag():
+    assert Mapper.hash_tag("key") == "{key}"
+    with pytest.raises(InavlidRedisKeyError):
+        Mapper.hash_tag(1)
+
+
+def test_slot_groups(slots):
+    executions = DBExecutions(None)
+    groups = executions.slot_groups(["{a}", "{a}$addr", "{b}", "|lsep|{b}"])
+    assert sorted(map(sorted, groups)) == [
+        ["{a}", "{a}$addr"], ["{b}", "|lsep|{b}"]]
@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+from py_redis_client import codec
+from py_redis_client.conversions import Conversions
+from py_redis_client.constants import CONVERT, UNCONVERT
+from py_redis_client.exceptions import (
+    InavlidRedisValueError, InvalidFormatError)
+
+
+VALUES = [
+    "text", "", 0, -12, 2 ** 70, 1.25, True, False,
+    datetime.datetime(2024, 5, 17, 10, 30, 15, 500),
+    datetime.date(2024, 5, 17), datetime.time(10, 30, 15),
+    codec.Packed([1, "a"]), codec.Packed({"a": [1], "b": {2}, "c": 3}),
+]
+
+
+def unpacked(value):
+    return value.value if isinstance(value, codec.Packed) else value
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_text_round_trip(value):
+    encoded = codec.encode(value)
+    assert codec.decode(encoded) == unpacked(value)
+    assert codec.decode(encoded.encode("utf-8")) == unpacked(value)
+
+
+@pytest.mark.parametrize("threshold", [None, 8])
+@pytest.mark.parametrize("value", VALUES + ["long text " * 20])
+def test_binary_round_trip(value, threshold):
+    encoded = codec.binary_encoder(threshold)(value)
+    assert encoded[:1] == codec.BINARY_MARK
+    assert codec.decode(encoded) == unpacked(value)
+
+
+def test_binary_is_compressed_only_when_smaller():
+    encoder = codec.binary_encoder(8)
+    assert encoder("a" * 100)[:2] == codec.BINARY_MARK + codec.COMPRESSED
+    assert encoder("abcdefghij")[:2] == b"\x00s"
+
+
+@pytest.mark.parametrize("value", [
+    "42", b"42", "-7", "-abc", "1.5", "12a", "-", "", "unknown", b"\x00?", b"\x00", None, 5,
+    "١"])
+def test_invalid_values(value):
+    with pytest.raises(InavlidRedisValueError):
+        codec.decode(value)
+
+
+def test_invalid_encode():
+    with pytest.raises(InavlidRedisValueError):
+        codec.encode(object())
+    with pytest.raises(InavlidRedisValueError):
+        codec.binary_encoder()([1])
+
+
+def test_conversions():
+    assert Conversions(UNCONVERT).final_value(b"int3") == 3
+    with pytest.raises(InavlidRedisValueError):
+        Conversions(UNCONVERT).final_value(None)
+    assert Conversions.from_options({}) is None
+    conv = Conversions.from_options({"CODEC": "binary"})
+    assert conv.final_value(3) == b"\x00i\x03"
+    with pytest.raises(InvalidFormatError):
+        Conversions.from_options({"CODEC": "json"})
+    assert Conversions(CONVERT).final_value(3) == "int3"
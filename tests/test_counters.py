@@ -0,0 +1,84 @@
+import pytest
+
+from py_redis_client.exceptions import (
+    InavlidRedisValueError, InvalidFormatError)
+
+
+BIG = 2 ** 53 + 1
+
+
+def test_incr_and_decr(any_cache):
+    assert any_cache.incr("c") == 1
+    assert any_cache.incr("c", 4) == 5
+    assert any_cache.decr("c", 2) == 3
+    assert any_cache.get("c") == 3
+    assert any_cache.incr("c", 0.5) == 3.5
+    assert any_cache.get("c") == 3.5
+
+
+def test_incr_keeps_stored_type_and_expiry(any_cache, redis_conn):
+    any_cache.set("c", 10, timeout=100)
+    assert any_cache.incr("c") == 11
+    assert 0 < redis_conn.ttl("c") <= 100
+    any_cache.set("f", 1.5)
+    assert any_cache.incr("f", 1) == 2.5
+
+
+def test_incr_many(any_cache):
+    any_cache.set("a", 1)
+    assert any_cache.incr_many({"a": 2, "b": -3}) == {"a": 3, "b": -3}
+    assert any_cache.get_many("a", "b") == {"a": 3, "b": -3}
+
+
+def test_incr_fields(any_cache):
+    any_cache.set("d", {"n": 1, "x": {"m": 2.5}, "l": [1]})
+    assert any_cache.incr_fields("d", {"n": 1, "x|m": 1, ("x", "k"): 2}) == {
+        "n": 2, "x|m": 3.5, ("x", "k"): 2}
+    assert any_cache.incr_field("d", "n", -5) == -3
+    assert any_cache.get("d") == {"n": -3, "x": {"m": 3.5, "k": 2}, "l": [1]}
+    with pytest.raises(InvalidFormatError):
+        any_cache.incr_field("d", "l")
+
+
+def test_incr_rejects_non_numbers(cache):
+    cache.set("s", "text")
+    with pytest.raises(InvalidFormatError):
+        cache.incr("s")
+    with pytest.raises(InvalidFormatError):
+        cache.incr("s", "1")
+
+
+@pytest.mark.parametrize("start,amount", [
+    (BIG, 2), (-BIG, -2), (2 ** 62, 2 ** 53), (BIG, 0.5), (2, float(BIG))])
+def test_large_counters_stay_exact(any_cache, start, amount):
+    any_cache.set("big", start)
+    assert any_cache.incr("big", amount) == start + amount
+    assert any_cache.get("big") == start + amount
+
+
+def test_large_field_counters_stay_exact(any_cache):
+    any_cache.set("d", {"n": BIG, "x": 1})
+    assert any_cache.incr_field("d", "n", 2) == BIG + 2
+    assert any_cache.get("d") == {"n": BIG + 2, "x": 1}
+
+
+@pytest.mark.parametrize("start,amount", [
+    (0, 0), (999, 1), (1000, -1), (-1000, 1), (5, -5), (-5, 3), (3, -10),
+    (-999, -1), (10 ** 30, -(10 ** 30) + 1), (-(2 ** 63), 2 ** 64)])
+def test_integer_counters_are_exact(cache, redis_conn, start, amount):
+    cache.set("c", start)
+    assert cache.incr("c", amount) == start + amount
+    assert redis_conn.get("c") == "int{}".format(start + amount).encode()
+
+
+def test_only_counters_read_plain_digits(cache, redis_conn):
+    redis_conn.mset({"raw": "123", "counter": "123"})
+    redis_conn.hset("d", "strn", "7")
+    redis_conn.set("d$addr", "strhmap")
+    with pytest.raises(InavlidRedisValueError):
+        cache.get("raw")
+    assert cache.incr("counter") == 124
+    assert cache.get("counter") == 124
+    assert cache.incr_field("d", "n", 1) == 8
+    assert cache.get("d") == {"n": 8}
+    assert redis_conn.get("raw") == b"123"
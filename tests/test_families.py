@@ -0,0 +1,59 @@
+from py_redis_client.cache.mapper import Mapper
+
+
+VALUES = {
+    "num": 1,
+    "items": [1, 2],
+    "members": {1, 2},
+    "nested": {"a": 1, "b": [1, 2], "c": {3}, "d": {"e": "x"}},
+    "lists": {"b": [1]},
+}
+
+
+def stored(redis_conn, key):
+    return sorted(name.decode() for name in redis_conn.keys()
+                  if Mapper.logical_key(name.decode()) == key)
+
+
+def test_delete_removes_every_redis_key(any_cache, redis_conn):
+    any_cache.set_many(VALUES)
+    any_cache.set("sep", [1, 2], separator=",")
+    any_cache.set("other", 1)
+    assert all(stored(redis_conn, key) for key in [*VALUES, "sep"])
+    assert any_cache.delete(*VALUES, "sep", "missing")
+    assert [name.decode() for name in redis_conn.keys()] == ["other"]
+    assert any_cache.get_many(*VALUES, "sep") == {}
+
+
+def test_exists_sees_any_layout(any_cache):
+    any_cache.set_many(VALUES)
+    assert any_cache.exists(*VALUES)
+    assert not any_cache.exists(*VALUES, "missing")
+    assert not any_cache.exists("missing")
+
+
+def test_expire_reaches_every_redis_key(any_cache, redis_conn):
+    any_cache.set_many(VALUES)
+    assert any_cache.expire(100, *VALUES)
+    names = [name for key in VALUES for name in stored(redis_conn, key)]
+    assert names and all(
+        0 < redis_conn.ttl(name) <= 100 for name in names)
+    assert not any_cache.expire(100, "num", "missing")
+
+
+def test_chunks_of_keys(redis_conn):
+    from py_redis_client.cache import Cache
+    cache = Cache("chunked")
+    data = {"k{}".format(idx): [idx] for idx in range(10)}
+    cache.set_many(data)
+    assert cache.exists(*data)
+    assert cache.expire(100, *data)
+    assert cache.delete(*data)
+    assert redis_conn.keys() == []
+
+
+def test_mapper_counts(redis_conn):
+    Mapper.map_to_db(redis_conn, {"a": [1], "b": {"c": 1}})
+    assert Mapper.count_in_db(redis_conn, "a", "b", "x") == 2
+    assert Mapper.delete_from_db(redis_conn, "a", "x") == 1
+    assert Mapper.count_in_db(redis_conn, "a", "b") == 1
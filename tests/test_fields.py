@@ -0,0 +1,41 @@
+from py_redis_client.cache.mapper import DBExecutions, Mapper
+
+
+VALUE = {
+    "a": {"b": 1, "c": {"d": "x"}},
+    "xa": {"b": 2},
+    "ba": {"a": {"b": 3}},
+    "tags": ["p", "q"],
+}
+
+
+def test_get_fields_of_nested_paths(any_cache):
+    any_cache.set("doc", VALUE)
+    assert any_cache.get_fields("doc", ["a", "a|c", ("xa", "b")]) == {
+        "a": VALUE["a"], "a|c": {"d": "x"}, ("xa", "b"): 2}
+    assert any_cache.get_path("doc", "ba|a") == {"b": 3}
+    assert any_cache.get_path("doc", "tags") == ["p", "q"]
+    assert any_cache.get_path("doc", "b") is None
+
+
+def test_scan_is_anchored_at_the_path(cache, redis_conn):
+    cache.set("doc", VALUE)
+    _, field = Mapper.path_field("a")
+    found = set()
+    for pattern in DBExecutions.scan_patterns(field):
+        found.update(name.decode("utf-8") for name, _ in
+                     redis_conn.hscan_iter("doc", match=pattern))
+    # "xa|b" and "ba|a|b" contain "a|" but are not under "a".
+    assert found == {"stra|strb", "stra|strc|strd"}
+
+
+def test_scan_covers_separated_iterables(cache, redis_conn):
+    cache.set("doc", {"a": {"l": [1, 2], "s": {3}}, "xa": {"l": [4]}},
+              separator=",")
+    _, field = Mapper.path_field("a")
+    found = set()
+    for pattern in DBExecutions.scan_patterns(field):
+        found.update(name.decode("utf-8") for name, _ in
+                     redis_conn.hscan_iter("doc", match=pattern))
+    assert found == {"|lsep|stra|strl", "|ssep|stra|strs"}
+    assert cache.get_path("doc", "a") == {"l": [1, 2], "s": {3}}
@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+from py_redis_client.exceptions import InvalidFormatError
+
+
+class Producer:
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def test_computes_once_and_stores(cache, redis_conn):
+    producer = Producer({"a": [1]})
+    assert cache.get_or_set("k", producer, timeout=100) == {"a": [1]}
+    assert cache.get_or_set("k", producer, timeout=100) == {"a": [1]}
+    assert producer.calls == 1
+    assert 0 < redis_conn.ttl("k$addr") <= 100
+    assert redis_conn.exists("|lease|k") == 0
+
+
+def test_none_is_not_stored(cache):
+    producer = Producer(None)
+    assert cache.get_or_set("k", producer) is None
+    assert cache.get_or_set("k", producer) is None
+    assert producer.calls == 2
+
+
+@pytest.mark.parametrize("value", [0, "", False, [], set(), {}])
+def test_falsy_values_are_stored(any_cache, value):
+    producer = Producer(value)
+    assert any_cache.get_or_set("k", producer) == value
+    assert any_cache.get_or_set("k", producer) == value
+    assert producer.calls == 1
+    assert type(any_cache.get("k")) is type(value)
+
+
+def test_empty_values_replace_native_ones(cache, redis_conn):
+    cache.set("k", {"a": [1], "b": 1})
+    cache.set("k", [])
+    assert redis_conn.keys() == [b"k"]
+    assert cache.get("k") == []
+    cache.set("k", [1, 2], separator=",")
+    cache.set("k", [], separator=",")
+    assert cache.get("k") == []
+
+
+def test_concurrent_misses_share_one_call(cache):
+    producer = Producer(5, delay=0.2)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(
+        cache.get_or_set("k", producer))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [5] * 8
+    assert producer.calls == 1
+
+
+def test_waits_for_the_lease_holder(cache, redis_conn):
+    redis_conn.set("|lease|k", "other", px=5000)
+    timer = threading.Timer(0.2, lambda: cache.set("k", 1))
+    timer.start()
+    producer = Producer(2)
+    assert cache.get_or_set("k", producer, wait_timeout=3) == 1
+    assert producer.calls == 0
+    timer.join()
+
+
+def test_computes_after_waiting_too_long(cache, redis_conn):
+    redis_conn.set("|lease|k", "other", px=5000)
+    producer = Producer(2)
+    start = time.monotonic()
+    assert cache.get_or_set("k", producer, wait_timeout=0.2) == 2
+    assert time.monotonic() - start >= 0.2
+    assert producer.calls == 1
+    # The lease of the other worker is left alone.
+    assert redis_conn.get("|lease|k") == b"other"
+
+
+def test_failing_producer_releases_the_lease(cache, redis_conn):
+    def fail():
+        raise ValueError("down")
+    with pytest.raises(ValueError):
+        cache.get_or_set("k", fail)
+    assert redis_conn.exists("|lease|k") == 0
+    assert cache.get_or_set("k", Producer(1)) == 1
+
+
+def test_early_refresh(cache, redis_conn):
+    slow = Producer(1, delay=0.05)
+    assert cache.get_or_set("k", slow, timeout=100, beta=1.0) == 1
+    assert int(redis_conn.get("|delta|k")[3:]) >= 50
+    fresh = Producer(2)
+    # Far from expiring, the value is served.
+    assert cache.get_or_set("k", fresh, timeout=100, beta=1.0) == 1
+    assert fresh.calls == 0
+    # Close to expiring, with a huge beta, it is recomputed.
+    redis_conn.pexpire("k", 500)
+    assert cache.get_or_set("k", fresh, timeout=100, beta=1e9) == 2
+    assert fresh.calls == 1
+
+
+def test_early_refresh_serves_stale_while_leased(cache, redis_conn):
+    cache.get_or_set("k", Producer(1), timeout=100, beta=1.0)
+    redis_conn.set("|delta|k", "int1000000")
+    redis_conn.set("|lease|k", "other", px=5000)
+    fresh = Producer(2)
+    assert cache.get_or_set("k", fresh, timeout=100, beta=1.0) == 1
+    assert fresh.calls == 0
+
+
+@pytest.mark.parametrize("lease_timeout", [0, 1.5, "1"])
+def test_invalid_lease_timeout(cache, lease_timeout):
+    with pytest.raises(InvalidFormatError):
+        cache.get_or_set("k", Producer(1), lease_timeout=lease_timeout)
@@ -0,0 +1,75 @@
+import pytest
+
+from py_redis_client import codec
+from py_redis_client.cache import Cache
+from py_redis_client.cache.layout import PackLayout
+
+
+@pytest.fixture(params=["pack", "packbin"])
+def packed_cache(request, redis_conn):
+    return Cache(request.param)
+
+
+SMALL = {
+    "items": [1, 2, 3],
+    "members": {"a", "b"},
+    "nested": {"a": 1, "b": [1, 2], "c": {3}, "d": {"e": "x"}},
+}
+
+
+def test_small_values_take_one_key(packed_cache, redis_conn):
+    packed_cache.set_many(SMALL, timeout=100)
+    assert sorted(redis_conn.keys()) == sorted(
+        key.encode() for key in SMALL)
+    assert packed_cache.get_many(*SMALL) == SMALL
+    assert packed_cache.get_path("nested", "d|e") == "x"
+    assert packed_cache.exists(*SMALL)
+
+
+def test_large_values_keep_the_native_layout(packed_cache, redis_conn):
+    packed_cache.set("items", list(range(20)))
+    assert redis_conn.type("items") == b"list"
+    assert redis_conn.get("items$addr") is not None
+    assert packed_cache.get("items") == list(range(20))
+
+
+def test_layout_switches_drop_the_old_keys(packed_cache, redis_conn):
+    packed_cache.set("k", {"a": list(range(20)), "b": {1}})
+    assert redis_conn.exists("k$addr", "k$list", "k$set") == 3
+    packed_cache.set("k", {"a": [1], "b": {1}})
+    assert redis_conn.keys() == [b"k"]
+    assert packed_cache.get("k") == {"a": [1], "b": {1}}
+    packed_cache.set("k", list(range(20)))
+    assert packed_cache.get("k") == list(range(20))
+
+
+def test_native_values_replace_packed_ones(packed_cache, redis_conn):
+    packed_cache.set("k", {"a": [1, 2]})
+    assert redis_conn.keys() == [b"k"]
+    packed_cache.set("k", {"a": list(range(20))})
+    assert redis_conn.type("k") == b"none"
+    assert packed_cache.get("k") == {"a": list(range(20))}
+    packed_cache.set("k", {"a": [1, 2]})
+    assert packed_cache.get("k") == {"a": [1, 2]}
+    packed_cache.set("k", set(range(20)))
+    assert packed_cache.get("k") == set(range(20))
+    packed_cache.set("k", 1)
+    assert redis_conn.keys() == [b"k"]
+    assert packed_cache.get("k") == 1
+
+
+def test_pack_limits():
+    layout = PackLayout(max_elements=3)
+    assert isinstance(layout.pack([1, 2, 3]), codec.Packed)
+    assert layout.pack([1, 2, 3, 4]) is None
+    assert layout.pack({"a": 1, "b": [1, 2]}) is not None
+    assert layout.pack({"a": 1, "b": [1, 2, 3]}) is None
+    assert layout.pack([]) is None
+    assert layout.pack("value") is None
+    assert PackLayout(max_bytes=10).pack(["x" * 20]) is None
+
+
+def test_from_options():
+    assert PackLayout.from_options(None) is None
+    layout = PackLayout.from_options({"MAX_BYTES": 100})
+    assert (layout.max_elements, layout.max_bytes) == (64, 100)
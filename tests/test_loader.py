@@ -0,0 +1,168 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from py_redis_client.cache.loader import (
+    RequestLoader, batching_scope, current_loader)
+from py_redis_client.cache.middleware import CacheBatchingMiddleware
+
+
+class Fetch:
+    def __init__(self, data, delay=0.0):
+        self.data = data
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, *keys):
+        self.calls.append(keys)
+        time.sleep(self.delay)
+        return {key: self.data[key] for key in keys if key in self.data}
+
+
+def test_loads_are_fetched_together():
+    fetch = Fetch({"a": 1, "b": 2})
+    loader = RequestLoader(fetch)
+    first, second, missing = (
+        loader.load("a"), loader.load("b"), loader.load("x"))
+    assert (first.value, second.value, missing.value) == (1, 2, None)
+    assert loader.get_many("a", "b", "x") == {"a": 1, "b": 2}
+    assert fetch.calls == [("a", "b", "x")]
+    assert loader.dispatches == 1
+
+
+def test_values_are_copies():
+    loader = RequestLoader(Fetch({"a": {"b": [1]}}))
+    value = loader.get_many("a")["a"]
+    value["b"].append(2)
+    assert loader.get_many("a") == {"a": {"b": [1]}}
+
+
+def test_forget_and_clear():
+    fetch = Fetch({"a": 1, "b": 2})
+    loader = RequestLoader(fetch)
+    loader.get_many("a", "b")
+    loader.forget("a")
+    loader.get_many("a", "b")
+    loader.clear()
+    loader.get_many("b")
+    assert fetch.calls == [("a", "b"), ("a",), ("b",)]
+
+
+def test_concurrent_reads_are_coalesced():
+    fetch = Fetch({"a": 1, "b": 2}, delay=0.1)
+    loader = RequestLoader(fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        loader.get_many("a", "b"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"a": 1, "b": 2}] * 8
+    assert fetch.calls == [("a", "b")]
+
+
+def test_keys_written_while_fetched_are_fetched_again():
+    fetch = Fetch({"a": 1}, delay=0.1)
+    loader = RequestLoader(fetch)
+    thread = threading.Thread(target=loader.get_many, args=("a",))
+    thread.start()
+    time.sleep(0.05)
+    # A write through the cache stores the value, then forgets the key.
+    fetch.data["a"] = 2
+    loader.forget("a")
+    thread.join()
+    assert loader.get_many("a") == {"a": 2}
+    assert fetch.calls == [("a",), ("a",)]
+
+
+def test_failed_fetch_is_retried_by_waiters():
+    calls = []
+
+    def fetch(*keys):
+        calls.append(keys)
+        time.sleep(0.1)
+        if len(calls) == 1:
+            raise ValueError("down")
+        return {"a": 1}
+    loader = RequestLoader(fetch)
+    errors = []
+
+    def first():
+        with pytest.raises(ValueError):
+            loader.get_many("a")
+        errors.append(True)
+    thread = threading.Thread(target=first)
+    thread.start()
+    time.sleep(0.05)
+    assert loader.get_many("a") == {"a": 1}
+    thread.join()
+    assert errors == [True]
+    assert len(calls) == 2
+
+
+def test_cache_reads_in_a_scope(cache):
+    cache.set_many({"a": 1, "b": [1, 2]})
+    with cache.batching() as loader:
+        deferred = cache.load("b")
+        assert cache.get("a") == 1
+        assert deferred.value == [1, 2]
+        assert cache.get_many("a", "b") == {"a": 1, "b": [1, 2]}
+        cache.get("b").append(3)
+        assert cache.get("b") == [1, 2]
+        assert loader.dispatches == 1
+
+
+def test_writes_in_a_scope_are_read_back(cache):
+    cache.set_many({"a": 1, "b": 2, "n": 1})
+    with cache.batching() as loader:
+        assert cache.get_many("a", "b", "n") == {"a": 1, "b": 2, "n": 1}
+        cache.set("a", 3)
+        cache.delete("b")
+        cache.incr("n")
+        assert cache.get_many("a", "b", "n") == {"a": 3, "n": 2}
+        assert loader.dispatches == 2
+        cache.flush()
+        assert cache.get("a") is None
+
+
+def test_scopes_are_isolated(cache):
+    cache.set("a", 1)
+    seen = {}
+
+    def outside():
+        seen["outside"] = current_loader(cache)
+    with batching_scope():
+        cache.get("a")
+        loader = current_loader(cache)
+        with batching_scope():
+            assert current_loader(cache) is loader
+        thread = threading.Thread(target=outside)
+        thread.start()
+        thread.join()
+        context = contextvars.copy_context()
+        shared = threading.Thread(target=context.run, args=(
+            lambda: seen.setdefault("shared", current_loader(cache)),))
+        shared.start()
+        shared.join()
+    assert seen == {"outside": None, "shared": loader}
+    assert current_loader(cache) is None
+
+
+def test_middleware_scopes_each_request(cache):
+    cache.set("a", 1)
+    loaders = []
+
+    def view(request):
+        cache.get("a")
+        cache.get("a")
+        loaders.append(current_loader(cache))
+        return request
+    middleware = CacheBatchingMiddleware(view)
+    assert middleware("request") == "request"
+    middleware("request")
+    assert loaders[0] is not loaders[1]
+    assert [loader.dispatches for loader in loaders] == [1, 1]
+    assert current_loader(cache) is None
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from py_redis_client.cache import Cache
+from py_redis_client.cache.local import LocalCache
+from py_redis_client.exceptions import InvalidFormatError
+
+
+def test_values_are_copies():
+    local = LocalCache()
+    value = {"a": [1]}
+    local.set("k", value)
+    value["a"].append(2)
+    found = local.get("k")
+    assert found == {"a": [1]}
+    found["a"].append(3)
+    assert local.get("k") == {"a": [1]}
+
+
+def test_lru_eviction():
+    local = LocalCache(max_entries=2)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1
+    local.set("c", 3)
+    assert local.get_many("a", "b", "c") == {"a": 1, "c": 3}
+    assert local.stats()["evictions"] == 1
+
+
+def test_byte_budget():
+    local = LocalCache(max_bytes=200)
+    local.set("big", "x" * 500)
+    assert local.get("big") is None
+    local.set("a", "x" * 60)
+    local.set("b", "x" * 60)
+    assert local.get_many("a", "b") == {"b": "x" * 60}
+    assert local.stats()["bytes"] <= 200
+
+
+def test_timeout():
+    local = LocalCache(timeout=1)
+    local.set("a", 1)
+    assert local.get("a") == 1
+    time.sleep(1.05)
+    assert local.get("a") is None
+
+
+def test_invalidated_keys_keep_their_redis_deadline():
+    local = LocalCache()
+    local.invalidate("a", timeout=1)
+    local.set("a", 1)
+    assert local.get("a") == 1
+    time.sleep(1.05)
+    assert local.get("a") is None
+
+
+def test_reads_issued_before_an_invalidation_are_dropped():
+    local = LocalCache()
+    generation = local.generation
+    local.invalidate("b")
+    local.set("a", 1, generation)
+    assert local.get("a") is None
+    stats = local.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 1)
+
+
+@pytest.mark.parametrize("options", [
+    {"max_entries": 0}, {"max_bytes": "1"}, {"timeout": 1.5}])
+def test_validation(options):
+    with pytest.raises(InvalidFormatError):
+        LocalCache(**options)
+
+
+@pytest.fixture
+def local(redis_conn):
+    return Cache("local")
+
+
+def test_reads_are_served_locally(local, redis_conn):
+    local.set("a", [1, 2])
+    assert local.get("a") == [1, 2]
+    redis_conn.delete("a", "a$addr")
+    assert local.get("a") == [1, 2]
+    assert local.local_cache.stats()["hits"] == 1
+
+
+def test_writes_invalidate(local):
+    local.set_many({"a": 1, "b": 2})
+    assert local.get_many("a", "b") == {"a": 1, "b": 2}
+    local.set("a", 3)
+    local.delete("b")
+    assert local.get_many("a", "b") == {"a": 3}
+    assert local.incr("n") == 1
+    assert local.get("n") == 1
+    assert local.incr("n") == 2
+    assert local.get("n") == 2
+    local.flush()
+    assert local.get_many("a", "n") == {}
+
+
+def test_expired_writes_are_not_served(local):
+    local.set("a", 1, timeout=1)
+    assert local.get("a") == 1
+    time.sleep(1.05)
+    assert local.get("a") is None
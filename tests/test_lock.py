@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from py_redis_client.cache.lock import Lock
+from py_redis_client.exceptions import (
+    InvalidFormatError, LockNotAcquiredError)
+
+
+def test_acquire_and_release(cache, redis_conn):
+    lock = cache.lock("job", ttl=5)
+    assert lock.acquire()
+    assert lock.locked
+    assert redis_conn.get("|lock|job").decode() == lock.token
+    assert 0 < redis_conn.pttl("|lock|job") <= 5000
+    other = cache.lock("job")
+    assert not other.acquire(blocking=False)
+    assert not other.acquire(wait_timeout=0.05)
+    assert lock.release()
+    assert not lock.locked
+    assert not lock.release()
+    assert other.acquire(blocking=False)
+    other.release()
+
+
+def test_only_the_holder_releases(redis_conn):
+    lock = Lock(redis_conn, "l", ttl=0.05)
+    assert lock.acquire()
+    time.sleep(0.1)
+    other = Lock(redis_conn, "l")
+    assert other.acquire(blocking=False)
+    # The expired holder neither releases nor extends the new holder's lock.
+    assert not lock.extend()
+    assert not lock.release()
+    assert redis_conn.get("l").decode() == other.token
+    other.release()
+
+
+def test_extend(redis_conn):
+    lock = Lock(redis_conn, "l", ttl=1)
+    assert not lock.extend()
+    lock.acquire()
+    assert lock.extend(10)
+    assert 1000 < redis_conn.pttl("l") <= 10000
+    lock.release()
+
+
+def test_release_wakes_a_waiter(redis_conn):
+    holder = Lock(redis_conn, "l", ttl=30)
+    holder.acquire()
+    waited = []
+
+    def wait():
+        start = time.monotonic()
+        waiter = Lock(redis_conn, "l", wait_timeout=5)
+        assert waiter.acquire()
+        waited.append(time.monotonic() - start)
+        waiter.release()
+    thread = threading.Thread(target=wait)
+    thread.start()
+    time.sleep(0.2)
+    holder.release()
+    thread.join()
+    # Woken by the release, well before the next check of the lock.
+    assert waited and waited[0] < 0.2 + Lock.BLOCK_LIMIT / 2
+
+
+def test_waiter_takes_an_expired_lock(redis_conn):
+    Lock(redis_conn, "l", ttl=0.1).acquire()
+    start = time.monotonic()
+    assert Lock(redis_conn, "l").acquire(wait_timeout=2)
+    assert time.monotonic() - start < 1
+
+
+def test_watchdog_keeps_the_lock(redis_conn):
+    lock = Lock(redis_conn, "l", ttl=0.3, watchdog=True)
+    lock.acquire()
+    time.sleep(0.6)
+    assert redis_conn.get("l").decode() == lock.token
+    assert not lock.lost
+    assert lock.release()
+    assert redis_conn.get("l") is None
+
+
+def test_watchdog_reports_a_lost_lock(redis_conn):
+    lock = Lock(redis_conn, "l", ttl=0.3, watchdog=True)
+    lock.acquire()
+    redis_conn.set("l", "other")
+    time.sleep(0.3)
+    assert lock.lost
+    assert not lock.release()
+
+
+def test_context_manager(cache):
+    with cache.lock("job", wait_timeout=0.05) as lock:
+        assert lock.locked
+        with pytest.raises(LockNotAcquiredError):
+            with cache.lock("job", wait_timeout=0.05):
+                pass
+    assert not lock.locked
+
+
+def test_validation(redis_conn):
+    with pytest.raises(InvalidFormatError):
+        Lock(redis_conn, "l", ttl=0)
+    with pytest.raises(InvalidFormatError):
+        Lock(redis_conn, "l", wait_timeout=-1)
+    lock = Lock(redis_conn, "l")
+    lock.acquire()
+    with pytest.raises(InvalidFormatError):
+        lock.acquire()
+    lock.release()
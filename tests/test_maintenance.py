@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.exceptions import InvalidFormatError
+
+
+VALUES = {
+    "price:1": 1,
+    "price:2": [1, 2],
+    "price:3": {"a": 1, "b": {2}},
+    "price:4": {"b": [1]},
+    "stock:1": 1,
+}
+
+
+def test_delete_pattern_removes_whole_values(any_cache, redis_conn):
+    any_cache.set_many(VALUES, tags=["t"])
+    any_cache.set("price:5", [1, 2], separator=",")
+    assert any_cache.delete_pattern("price:*") == 5
+    assert any_cache.get_many(*VALUES, "price:5") == {"stock:1": 1}
+    # Tag sets are internal keys, never matched by a pattern.
+    assert sorted(redis_conn.keys()) == [b"stock:1", b"|tag|t"]
+
+
+def test_delete_pattern_reports_progress(redis_conn):
+    from py_redis_client.cache import Cache
+    cache = Cache("chunked")
+    cache.set_many({"k{}".format(idx): [idx] for idx in range(1, 8)})
+    progress = []
+    assert cache.delete_pattern("k*", progress=progress.append) == 7
+    assert progress and progress[-1] == 7
+    assert progress == sorted(progress)
+    assert redis_conn.keys() == []
+
+
+def test_delete_pattern_evicts_the_local_cache(redis_conn):
+    from py_redis_client.cache import Cache
+    cache = Cache("local")
+    cache.set("price:1", 1)
+    assert cache.get("price:1") == 1
+    assert cache.delete_pattern("price:*") == 1
+    assert cache.get("price:1") is None
+
+
+def test_flush_async(any_cache, redis_conn):
+    any_cache.set_many(VALUES, tags=["t"])
+    progress = []
+    assert any_cache.flush(async_=True, progress=progress.append)
+    assert redis_conn.keys() == []
+    assert progress[-1] > len(VALUES)
+
+
+def test_throttle():
+    start = time.monotonic()
+    assert list(Mapper.throttle([[1, 2]] * 3, rate=40)) == [[1, 2]] * 3
+    assert time.monotonic() - start >= 0.1
+
+
+@pytest.mark.parametrize("rate", [0, -1, "1"])
+def test_invalid_rate(cache, rate):
+    with pytest.raises(InvalidFormatError):
+        cache.delete_pattern("a*", rate=rate)
+    with pytest.raises(InvalidFormatError):
+        cache.flush(async_=True, rate=rate)
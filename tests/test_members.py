@@ -0,0 +1,71 @@
+from unittest import mock
+
+import pytest
+
+from py_redis_client.cache import Cache
+from py_redis_client.cache.members import Members
+from py_redis_client.exceptions import InvalidFormatError
+
+
+ITEMS = list(range(30))
+
+
+@pytest.mark.parametrize("separator", ["", ","])
+@pytest.mark.parametrize("start,stop", [
+    (0, None), (5, 10), (-5, None), (0, -1), (3, 0), (40, None), (-3, -1)])
+def test_get_range_matches_slicing(any_cache, separator, start, stop):
+    any_cache.set("l", ITEMS, separator=separator)
+    any_cache.set("d", {"l": ITEMS, "x": 1}, separator=separator)
+    assert any_cache.get_range("l", start, stop) == ITEMS[start:stop]
+    assert any_cache.get_range("d", start, stop, path="l") == ITEMS[
+        start:stop]
+
+
+def test_len(any_cache):
+    any_cache.set_many({"l": ITEMS, "s": set(ITEMS[:7]),
+                        "d": {"l": [1, 2], "s": {3}}})
+    assert any_cache.len("l") == 30
+    assert any_cache.len("s") == 7
+    assert any_cache.len("d", "l") == 2
+    assert any_cache.len("d", ("s",)) == 1
+    assert any_cache.len("missing") == 0
+    assert any_cache.len("d", "missing") == 0
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 30, 1000])
+def test_iter_members(any_cache, chunk_size):
+    any_cache.set_many({"l": ITEMS, "s": set(ITEMS),
+                        "d": {"l": ITEMS, "x": 1}})
+    assert list(any_cache.iter_members("l", chunk_size)) == ITEMS
+    assert sorted(set(any_cache.iter_members("s", chunk_size))) == ITEMS
+    assert list(any_cache.iter_members("d", chunk_size, "l")) == ITEMS
+    assert list(any_cache.iter_members("missing", chunk_size)) == []
+
+
+def test_iter_members_defaults_to_cache_chunk_size(redis_conn):
+    cache = Cache("chunked")
+    cache.set("l", ITEMS)
+    with mock.patch.object(Members, "iterate", wraps=Members.iterate) as spy:
+        assert list(cache.iter_members("l")) == ITEMS
+    assert spy.call_args.args[2] == cache.chunk_size == 3
+
+
+def test_wrong_types_are_rejected(cache):
+    cache.set_many({"s": {1, 2}, "n": 5, "d": {"x": 1}})
+    with pytest.raises(InvalidFormatError):
+        cache.get_range("s")
+    with pytest.raises(InvalidFormatError):
+        cache.len("n")
+    with pytest.raises(InvalidFormatError):
+        list(cache.iter_members("d"))
+    with pytest.raises(InvalidFormatError):
+        cache.iter_members("s", chunk_size=0)
+    with pytest.raises(InvalidFormatError):
+        cache.iter_members("s", chunk_size="3")
+
+
+def test_dict_of_lists_and_sets_only(any_cache):
+    any_cache.set("d", {"l": [1, 2], "s": {3}})
+    assert any_cache.get("d") == {"l": [1, 2], "s": {3}}
+    assert any_cache.get_path("d", "l") == [1, 2]
+    assert list(any_cache.iter_members("d", path="s")) == [3]
@@ -0,0 +1,61 @@
+import pytest
+
+
+FALSY = [0, 0.0, False, "", [], set(), {}]
+
+
+@pytest.mark.parametrize("result", FALSY + [
+    7, "text", [1, 2], {"a": 0, "b": {"c": False}}, {3, 4}])
+def test_results_are_cached(any_cache, result):
+    calls = []
+
+    @any_cache.memoize(timeout=60)
+    def compute(value):
+        calls.append(value)
+        return result
+
+    assert compute(1) == result
+    assert compute(1) == result
+    assert compute(value=1) == result
+    assert calls == [1]
+
+
+def test_none_is_not_cached(cache):
+    calls = []
+
+    @cache.memoize()
+    def compute():
+        calls.append(1)
+
+    assert compute() is None
+    assert compute() is None
+    assert calls == [1, 1]
+
+
+def test_many_caches_falsy_results(cache):
+    calls = []
+
+    @cache.memoize()
+    def compute(value):
+        calls.append(value)
+        return FALSY[value]
+
+    indexes = [(idx,) for idx in range(len(FALSY))]
+    assert compute.many(indexes) == FALSY
+    assert compute.many(indexes) == FALSY
+    assert [compute(idx) for idx in range(len(FALSY))] == FALSY
+    assert calls == list(range(len(FALSY)))
+
+
+def test_invalidate(cache):
+    calls = []
+
+    @cache.memoize()
+    def compute(value):
+        calls.append(value)
+        return False
+
+    compute(2)
+    assert compute.invalidate(2)
+    compute(2)
+    assert calls == [2, 2]
@@ -0,0 +1,88 @@
+import copy
+
+import pytest
+
+from py_redis_client.exceptions import InvalidFormatError
+
+
+BASE = {"a": {"b": 1, "c": {"d": 2}}, "l": [1, 2], "s": {"x"}, "n": 5}
+
+
+def test_update_scalar_with_subtree(any_cache):
+    any_cache.set("e", {"a": 1, "x": 5})
+    any_cache.update_fields("e", {"a": {"b": 2}})
+    assert any_cache.get("e") == {"a": {"b": 2}, "x": 5}
+
+
+def test_update_subtree_with_scalar(any_cache):
+    any_cache.set("d", {"a": {"b": 1, "c": {"d": 2}}, "x": 5})
+    any_cache.update_fields("d", {"a": 7})
+    assert any_cache.get("d") == {"a": 7, "x": 5}
+    assert any_cache.get_path("d", "a|b") is None
+
+
+def test_update_list_with_scalar_and_back(any_cache):
+    any_cache.set("d", {"l": [1, 2], "x": 5})
+    any_cache.update_fields("d", {"l": 3})
+    assert any_cache.get("d") == {"l": 3, "x": 5}
+    any_cache.update_fields("d", {"l": [4]})
+    assert any_cache.get("d") == {"l": [4], "x": 5}
+
+
+def test_update_list_with_subtree_and_back(any_cache):
+    any_cache.set("d", {"l": [1, 2], "x": 5})
+    any_cache.update_fields("d", {"l": {"m": {1}}})
+    assert any_cache.get("d") == {"l": {"m": {1}}, "x": 5}
+    any_cache.update_fields("d", {"l": [3]})
+    assert any_cache.get("d") == {"l": [3], "x": 5}
+
+
+def test_update_separated_list_with_subtree(any_cache):
+    any_cache.set("d", {"a": {"l": [1, 2]}, "x": 5}, separator=",")
+    any_cache.update_fields("d", {"a": {"l": {"m": 1}}})
+    assert any_cache.get("d") == {"a": {"l": {"m": 1}}, "x": 5}
+    any_cache.update_fields("d", {"a": 0.5})
+    assert any_cache.get("d") == {"a": 0.5, "x": 5}
+
+
+def test_push_under_scalar_replaces_it(any_cache):
+    any_cache.set("d", {"a": 1, "x": 5})
+    assert any_cache.extend("d", [1, 2], path="a|l") == 2
+    assert any_cache.get("d") == {"a": {"l": [1, 2]}, "x": 5}
+
+
+def test_push_onto_subtree_is_rejected(any_cache):
+    any_cache.set("d", {"a": {"b": 1}, "x": 5})
+    with pytest.raises(InvalidFormatError):
+        any_cache.extend("d", [1], path="a")
+    with pytest.raises(InvalidFormatError):
+        any_cache.add_members("d", 1, path="a")
+    assert any_cache.get("d") == {"a": {"b": 1}, "x": 5}
+
+
+def test_operations_on_values(any_cache):
+    any_cache.set("l", [1, 2])
+    assert any_cache.append("l", 3, 4) == 4
+    any_cache.set("s", {"a"})
+    assert any_cache.add_members("s", "a", "b") == 1
+    assert any_cache.remove_members("s", "a") == 1
+    assert any_cache.get_many("l", "s") == {"l": [1, 2, 3, 4], "s": {"b"}}
+    assert any_cache.remove_members("s", "b") == 1
+    assert any_cache.get("s") is None
+
+
+def test_mixed_updates_match_a_rewrite(any_cache):
+    any_cache.set("d", copy.deepcopy(BASE))
+    any_cache.update_fields("d", {"a": {"c": 3, "e": [1]}, "n": {"m": 1}})
+    any_cache.add_members("d", "y", path="s")
+    any_cache.delete_fields("d", "l", ("a", "b"))
+    assert any_cache.get("d") == {
+        "a": {"c": 3, "e": [1]}, "s": {"x", "y"}, "n": {"m": 1}}
+
+
+def test_update_on_other_type_is_rejected(cache):
+    cache.set("l", [1])
+    with pytest.raises(InvalidFormatError):
+        cache.update_fields("l", {"a": 1})
+    with pytest.raises(InvalidFormatError):
+        cache.update_fields("l", [1])
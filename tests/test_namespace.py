@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from py_redis_client.exceptions import InvalidFormatError
+
+
+@pytest.fixture
+def store(cache):
+    return cache.namespace("store:1", generation_ttl=0)
+
+
+def test_keys_carry_the_generation(store, cache):
+    store.set("a", [1, 2])
+    assert store.key("a") == "ns:store:1#{}:a".format(store.generation)
+    assert cache.get(store.key("a")) == [1, 2]
+    assert store.get("a") == [1, 2]
+    assert cache.get("a") is None
+
+
+def test_invalidate_misses_every_key(store, cache):
+    store.set_many({"a": 1, "b": {"c": [1]}})
+    other = cache.namespace("store:2", generation_ttl=0)
+    other.set("a", 2)
+    generation = store.generation
+    assert store.invalidate() == generation + 1
+    assert store.get_many("a", "b") == {}
+    assert not store.exists("a")
+    assert other.get("a") == 2
+
+
+def test_operations_stay_in_the_namespace(store):
+    store.set_many({"a": 1, "b": 2}, timeout=100)
+    assert store.get_many("a", "b", "c") == {"a": 1, "b": 2}
+    assert store.exists("a", "b")
+    assert store.expire(50, "a")
+    assert store.incr("n", 2) == 2
+    assert store.decr("n") == 1
+    assert store.incr_many({"n": 1, "m": 1}) == {"n": 2, "m": 1}
+    assert store.get_or_set("g", lambda: 3) == 3
+    assert store.delete("a")
+    assert store.get_many("a", "b") == {"b": 2}
+
+
+def test_memoize_is_invalidated(store):
+    calls = []
+
+    @store.memoize(timeout=100)
+    def double(value):
+        calls.append(value)
+        return value * 2
+    assert double(2) == double(2) == 4
+    store.invalidate()
+    assert double(2) == 4
+    assert calls == [2, 2]
+
+
+def test_reap_removes_older_generations(store, redis_conn):
+    store.set_many({"a": [1, 2], "b": {"c": {1}}, "d": 1})
+    store.set("e", [1, 2], separator=",")
+    old = set(redis_conn.keys())
+    store.invalidate()
+    store.set("a", 1)
+    removed = []
+    assert store.reap(count=2, progress=removed.append) == len(
+        [key for key in old if not key.startswith(b"|ns|")])
+    assert removed
+    kept = {key.decode() for key in redis_conn.keys()}
+    assert kept == {"|ns|store:1", store.key("a")}
+    assert store.get("a") == 1
+
+
+def test_invalidate_reaps_in_the_background(store, redis_conn):
+    store.set("a", 1)
+    store.invalidate(reap=True)
+    for _ in range(100):
+        if redis_conn.keys("ns:*") == []:
+            break
+        time.sleep(0.01)
+    assert redis_conn.keys("ns:*") == []
+
+
+def test_cached_generation(cache):
+    first = cache.namespace("s", generation_ttl=60)
+    second = cache.namespace("s", generation_ttl=60)
+    first.set("a", 1)
+    assert second.get("a") == 1
+    second.invalidate()
+    assert second.get("a") is None
+    # The first view keeps its generation until the ttl runs out.
+    assert first.get("a") == 1
+
+
+@pytest.mark.parametrize("name", ["", "a#b", "a$b", "a|b", 1])
+def test_invalid_names(cache, name):
+    with pytest.raises(InvalidFormatError):
+        cache.namespace(name)
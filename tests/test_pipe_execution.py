@@ -0,0 +1,70 @@
+import threading
+
+from py_redis_client.cache.mapper import DBExecutions, Mapper
+from py_redis_client.db import RedisNative
+from py_redis_client.pipe_execution import Batch, Operation, PipeExecution
+
+
+THREADS = 8
+ROUNDS = 50
+
+
+def run_threads(target, count=THREADS):
+    errors = []
+
+    def wrapped(idx):
+        try:
+            target(idx)
+        except Exception as err:
+            errors.append(err)
+    threads = [threading.Thread(target=wrapped, args=(idx,))
+               for idx in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_executions_do_not_share_operations(redis_conn):
+    first = PipeExecution(redis_conn)
+    second = PipeExecution(redis_conn)
+    first.add_operation(Operation(
+        RedisNative, "execute_get_many", ["a"], args=["a"]))
+    assert len(first.operations) == 1
+    assert second.operations == []
+
+
+def test_batch_execution_does_not_mutate_operations(redis_conn):
+    redis_conn.set("a", "int1")
+    batch = Batch([Operation(
+        RedisNative, "execute_get_many", ["a"], args=["a"])])
+    assert batch.execute(redis_conn) == batch.execute(redis_conn)
+    assert [op.pipe for op in batch.operations] == [None]
+    assert len(batch) == 1
+
+
+def test_concurrent_executions_are_isolated(redis_conn):
+    def work(idx):
+        for round_ in range(ROUNDS):
+            key = "t{}:{}".format(idx, round_)
+            executions = DBExecutions(redis_conn)
+            executions.set_in_db(Mapper.format_to_db({key: [idx, round_]}))
+            assert Mapper.unmap_from_db(redis_conn, key) == {
+                key: [idx, round_]}
+    run_threads(work)
+    assert len(redis_conn.keys("t*$addr")) == THREADS * ROUNDS
+
+
+def test_shared_batch_executes_from_many_threads(redis_conn):
+    redis_conn.mset({"k{}".format(idx): "int{}".format(idx)
+                     for idx in range(10)})
+    batch = Batch([Operation(
+        RedisNative, "execute_get_many", ["k{}".format(idx)],
+        args=["k{}".format(idx)]) for idx in range(10)])
+    expected = batch.execute(redis_conn)
+
+    def work(idx):
+        for _ in range(ROUNDS):
+            assert batch.execute(redis_conn) == expected
+    run_threads(work)
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+import redis
+
+from py_redis_client.cache.mapper import Mapper
+from py_redis_client.constants import PIPELINE_ENGINE, SCRIPT_ENGINE
+from py_redis_client.exceptions import InvalidFormatError
+
+
+VALUES = {
+    "int": 1,
+    "float": 1.5,
+    "str": "text",
+    "list": [1, "a", 2.5],
+    "set": {1, "b"},
+    "nested": {"a": 1, "b": [1, 2], "c": {3}, "d": {"e": "x", "f": [4]}},
+    "lists": {"a": [1]},
+}
+
+
+@pytest.fixture
+def stored(redis_conn):
+    Mapper.map_to_db(redis_conn, VALUES)
+    Mapper.map_to_db(redis_conn, {"sep": [1, 2], "seps": {3}}, separator=",")
+    return [*VALUES, "sep", "seps", "missing"]
+
+
+def test_engines_agree(redis_conn, stored):
+    expected = {**VALUES, "sep": [1, 2], "seps": {3}}
+    for engine in [PIPELINE_ENGINE, SCRIPT_ENGINE]:
+        assert Mapper.unmap_from_db(
+            redis_conn, *stored, read_engine=engine) == expected
+
+
+def test_script_reads_in_one_round_trip(redis_conn, stored, monkeypatch):
+    sent = []
+    execute_command = redis.Redis.execute_command
+
+    def record(self, *args, **options):
+        sent.append(args[0])
+        return execute_command(self, *args, **options)
+    monkeypatch.setattr(redis.Redis, "execute_command", record)
+    Mapper.unmap_from_db(redis_conn, *stored, read_engine=SCRIPT_ENGINE)
+    assert [name for name in sent if name != "SCRIPT EXISTS"] == ["EVALSHA"]
+
+
+def test_invalid_engine(redis_conn):
+    with pytest.raises(InvalidFormatError):
+        Mapper.unmap_from_db(redis_conn, "a", read_engine="other")
+
+
+def test_async_script_engine(redis_conn, stored):
+    from py_redis_client.cache import AsyncCache
+
+    async def run():
+        cache = AsyncCache("script")
+        try:
+            return await cache.get_many(*stored)
+        finally:
+            await cache.redis_conn.aclose()
+    assert asyncio.run(run()) == {**VALUES, "sep": [1, 2], "seps": {3}}
@@ -0,0 +1,91 @@
+import pytest
+import redis
+
+from py_redis_client.cache.replicas import ReplicaRouter
+from py_redis_client.exceptions import InvalidFormatError
+
+from conftest import PORT
+
+
+class Replica(redis.Redis):
+    """
+    Client of the test server recording its commands, failing with a
+    connection error once fail_after commands were sent.
+    """
+
+    def __init__(self, fail_after: int = None) -> None:
+        super().__init__(port=PORT)
+        self.commands = []
+        self.fail_after = fail_after
+
+    def execute_command(self, *args, **options):
+        if self.fail_after is not None and (
+                len(self.commands) >= self.fail_after):
+            raise redis.ConnectionError("replica down")
+        self.commands.append(args[0])
+        return super().execute_command(*args, **options)
+
+
+def route(cache, replica):
+    cache.replicas = ReplicaRouter(
+        cache.redis_conn, [replica], check_interval=3600)
+    return cache.replicas
+
+
+def test_reads_go_to_the_replica(cache):
+    cache.set_many({"a": 1, "b": [1, 2]})
+    replica = Replica()
+    router = route(cache, replica)
+    assert cache.get("a") == 1
+    assert cache.get_many("a", "b") == {"a": 1, "b": [1, 2]}
+    assert router.fallbacks == 0
+    assert "INFO" in replica.commands and len(replica.commands) > 1
+
+
+def test_failing_replica_falls_back_to_the_primary(cache):
+    cache.set("a", 1)
+    router = route(cache, Replica(fail_after=1))
+    assert cache.get("a") == 1
+    assert cache.get("a") == 1
+    assert router.fallbacks == 2
+
+
+def test_iter_members_reads_each_chunk_on_the_replica(cache):
+    cache.set("l", list(range(25)))
+    replica = Replica()
+    route(cache, replica)
+    assert list(cache.iter_members("l", chunk_size=10)) == list(range(25))
+    assert replica.commands.count("LRANGE") == 3
+
+
+@pytest.mark.parametrize("value", [list(range(25)), set(range(25))])
+def test_iter_members_survives_a_replica_failing_midway(cache, value):
+    cache.set("v", value)
+    # INFO, the address read and a first chunk, then the replica fails.
+    router = route(cache, Replica(fail_after=3))
+    found = list(cache.iter_members("v", chunk_size=10))
+    if isinstance(value, list):
+        assert found == value
+    else:
+        assert set(found) == value
+    assert router.fallbacks >= 1
+
+
+def test_iteration_is_lazy(cache):
+    replica = Replica()
+    route(cache, replica)
+    members = cache.iter_members("missing")
+    assert replica.commands == []
+    assert list(members) == []
+
+
+def test_router_options(cache):
+    with pytest.raises(InvalidFormatError):
+        ReplicaRouter(cache.redis_conn, [])
+    with pytest.raises(InvalidFormatError):
+        ReplicaRouter(cache.redis_conn, [Replica()], selection="random")
+    assert ReplicaRouter.from_options(cache.redis_conn, None) is None
+    router = ReplicaRouter.from_options(cache.redis_conn, {
+        "LOCATIONS": "redis://127.0.0.1:{}/0".format(PORT),
+        "SELECTION": "least_latency"})
+    assert len(router.replicas) == 1
@@ -0,0 +1,18 @@
+from py_redis_client.scripts import LuaScript
+
+
+SOURCE = "return ARGV[1] .. redis.call('GET', KEYS[1])"
+
+
+def test_script_is_loaded_on_noscript(redis_conn):
+    script = LuaScript(SOURCE)
+    redis_conn.set("a", "b")
+    redis_conn.script_flush()
+    assert script(redis_conn, keys=["a"], args=["x"]) == b"xb"
+    redis_conn.script_flush()
+    assert not any(redis_conn.script_exists(
+        redis_conn.register_script(SOURCE).sha))
+    assert script(redis_conn, keys=["a"], args=["y"]) == b"yb"
+    assert all(redis_conn.script_exists(
+        redis_conn.register_script(SOURCE).sha))
+
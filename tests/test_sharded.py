@@ -0,0 +1,162 @@
+import threading
+
+import pytest
+
+from py_redis_client.cache import ShardedCache
+from py_redis_client.cache.sharded import HashRing
+from py_redis_client.exceptions import InvalidFormatError
+
+
+KEYS = ["key{}".format(idx) for idx in range(200)]
+
+
+@pytest.fixture
+def sharded(shard_conns):
+    cache = ShardedCache(["shard1", "shard2", "shard3"])
+    yield cache
+    cache.close()
+
+
+def test_ring_moves_a_share_of_keys_on_add():
+    ring = HashRing()
+    for node in ["a", "b", "c"]:
+        ring.add(node)
+    before = {key: ring.node(key) for key in KEYS}
+    assert set(before.values()) == {"a", "b", "c"}
+    ring.add("d")
+    moved = [key for key in KEYS if ring.node(key) != before[key]]
+    assert moved and all(ring.node(key) == "d" for key in moved)
+    assert len(moved) < len(KEYS) / 2
+    ring.remove("d")
+    assert {key: ring.node(key) for key in KEYS} == before
+
+
+def test_ring_weights():
+    ring = HashRing()
+    ring.add("large", 3)
+    ring.add("small")
+    owners = [ring.node("k{}".format(idx)) for idx in range(2000)]
+    assert owners.count("large") > 2 * owners.count("small")
+
+
+def test_ring_validation():
+    ring = HashRing()
+    with pytest.raises(InvalidFormatError):
+        ring.node("a")
+    ring.add("a")
+    with pytest.raises(InvalidFormatError):
+        ring.add("a")
+    with pytest.raises(InvalidFormatError):
+        ring.remove("b")
+    with pytest.raises(InvalidFormatError):
+        HashRing(0)
+
+
+def test_keys_are_stored_on_their_shard(sharded, shard_conns):
+    data = {key: {"a": [idx], "b": idx} for idx, key in enumerate(KEYS[:30])}
+    sharded.set_many(data, timeout=100)
+    assert sharded.get_many(*data, "missing") == data
+    for key in data:
+        name = sharded.ring.node(key)
+        assert sharded.shard(key).get(key) == data[key]
+        for other, conn in shard_conns.items():
+            assert bool(conn.exists(key + "$addr")) == (other == name)
+
+
+def test_multi_key_operations(sharded):
+    sharded.set_many({key: 1 for key in KEYS[:20]})
+    assert sharded.exists(*KEYS[:20])
+    assert not sharded.exists(*KEYS[:21])
+    assert sharded.expire(100, *KEYS[:20])
+    assert sharded.incr_many({"n1": 2, "n2": 1.5, "key0": 1}) == {
+        "n1": 2, "n2": 1.5, "key0": 2}
+    assert sharded.incr("n1") == 3
+    assert sharded.decr("n1", 2) == 1
+    assert sharded.delete(*KEYS[:10])
+    assert sharded.get_many(*KEYS[:20]) == {
+        key: 1 for key in KEYS[1:20] if key not in KEYS[:10]}
+    assert sharded.flush()
+    assert sharded.get_many(*KEYS[:20], "n1") == {}
+
+
+def test_single_key_operations(sharded):
+    sharded.set("a", {"b": [1, 2]}, timeout=100)
+    assert sharded.get("a") == {"b": [1, 2]}
+    assert sharded.get_or_set("g", lambda: 5, timeout=10) == 5
+    assert sharded.get_or_set("g", lambda: 6, timeout=10) == 5
+
+
+def test_memoize_fans_out(sharded):
+    calls = []
+
+    @sharded.memoize(timeout=100)
+    def square(value):
+        calls.append(value)
+        return value * value
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square.many([(2,), (3,), (4,)]) == [4, 9, 16]
+    assert calls == [3, 2, 4]
+
+
+def test_removed_shard_keys_miss(sharded):
+    sharded.set_many({key: 1 for key in KEYS[:30]})
+    owners = {key: sharded.ring.node(key) for key in KEYS[:30]}
+    sharded.remove_shard("shard2")
+    assert sharded.get_many(*KEYS[:30]) == {
+        key: 1 for key, name in owners.items() if name != "shard2"}
+    sharded.add_shard("shard2")
+    assert sharded.get_many(*KEYS[:30]) == dict.fromkeys(KEYS[:30], 1)
+
+
+def test_tags_are_invalidated_on_every_shard(sharded, shard_conns):
+    data = {key: 1 for key in KEYS[:30]}
+    sharded.set_many(data, timeout=100, tags=(tag for tag in ["t1", "t2"]))
+    sharded.set("other", 2, tags=["t2"])
+    sharded.set("kept", 3)
+    assert all(conn.exists("|tag|t1") for conn in shard_conns.values())
+    assert sharded.invalidate_tags("t1") == len(data)
+    assert sharded.get_many(*data, "other", "kept") == {"other": 2, "kept": 3}
+    assert sharded.invalidate_tags("t2") == 1
+    assert sharded.get_many("other", "kept") == {"kept": 3}
+
+
+def test_lookups_during_ring_changes(sharded):
+    sharded.set_many({key: 1 for key in KEYS[:30]})
+    done = threading.Event()
+    errors = []
+
+    def lookup():
+        try:
+            while not done.is_set():
+                for key in KEYS:
+                    sharded.shard(key)
+                sharded.get_many(*KEYS[:30])
+        except Exception as exc:
+            errors.append(exc)
+    readers = [threading.Thread(target=lookup) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(20):
+        sharded.remove_shard("shard2")
+        sharded.add_shard("shard2")
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
+    assert set(sharded.shards) == set(sharded.ring.weights) == {
+        "shard1", "shard2", "shard3"}
+
+
+def test_validation(shard_conns):
+    with pytest.raises(InvalidFormatError):
+        ShardedCache("shard1")
+    with pytest.raises(InvalidFormatError):
+        ShardedCache([])
+    cache = ShardedCache({"shard1": 1})
+    with pytest.raises(InvalidFormatError):
+        cache.set_many([("a", 1)])
+    with pytest.raises(InvalidFormatError):
+        cache.expire("1", "a")
+    with pytest.raises(InvalidFormatError):
+        cache.set_many({"a": 1}, tags="t1")
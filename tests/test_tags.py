@@ -0,0 +1,47 @@
+import pytest
+
+from py_redis_client.exceptions import (
+    InavlidRedisKeyError, InvalidFormatError)
+
+
+def test_invalidate_deletes_tagged_keys(any_cache, redis_conn):
+    any_cache.set_many({"a": 1, "b": [1, 2]}, tags=["t1", "t2"])
+    any_cache.set("c", {"d": [1], "e": 2}, tags=["t2"])
+    any_cache.set("f", 1)
+    assert any_cache.invalidate_tags("t1") == 2
+    assert any_cache.get_many("a", "b", "c", "f") == {
+        "c": {"d": [1], "e": 2}, "f": 1}
+    # Keys already deleted are dropped from the other tags.
+    assert any_cache.invalidate_tags("t2") == 1
+    assert any_cache.get_many("a", "b", "c", "f") == {"f": 1}
+    assert sorted(redis_conn.keys()) == [b"f"]
+
+
+def test_invalidate_in_chunks(redis_conn):
+    from py_redis_client.cache import Cache
+    cache = Cache("chunked")
+    data = {"k{}".format(idx): idx for idx in range(1, 11)}
+    cache.set_many(data, tags=["t"])
+    assert cache.invalidate_tags("t", "missing") == 10
+    assert cache.get_many(*data) == {}
+
+
+def test_tag_set_expires_with_its_keys(cache, redis_conn):
+    cache.set("a", 1, timeout=100, tags=["t"])
+    cache.set("b", 1, timeout=200, tags=["t"])
+    assert 100 < redis_conn.ttl("|tag|t") <= 200
+    cache.set("c", 1, tags=["t"])
+    assert redis_conn.ttl("|tag|t") == -1
+
+
+def test_expired_keys_are_skipped(cache):
+    cache.set_many({"a": 1, "b": 2}, tags=["t"])
+    cache.delete("a")
+    assert cache.invalidate_tags("t") == 1
+
+
+def test_tags_must_be_an_iterable_of_str(cache):
+    with pytest.raises(InvalidFormatError):
+        cache.set("a", 1, tags="t")
+    with pytest.raises(InavlidRedisKeyError):
+        cache.set("a", 1, tags=[1])
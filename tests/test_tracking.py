@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from py_redis_client.cache import Cache
+from py_redis_client.cache.local import LocalCache
+from py_redis_client.cache.tracking import (
+    InvalidationListener, INVALIDATE_CHANNEL)
+from py_redis_client.exceptions import InvalidFormatError
+
+
+def test_untracked_reads_bypass_the_local_cache(redis_conn):
+    # The fake server lacks CLIENT TRACKING, so the listener never becomes
+    # active and the local cache is not trusted.
+    cache = Cache("tracking")
+    try:
+        cache.set("t:a", 1)
+        assert cache.get("t:a") == 1
+        redis_conn.delete("t:a")
+        assert cache.get("t:a") is None
+        assert not cache.tracking.active
+    finally:
+        cache.tracking.stop()
+
+
+def wait_for(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_notifications_invalidate_logical_keys(redis_conn):
+    local = LocalCache()
+    listener = InvalidationListener(redis_conn, local)
+    try:
+        wait_for(lambda: listener.active)
+        local.set_many({"a": 1, "b": [1], "c": 2})
+        redis_conn.publish(INVALIDATE_CHANNEL, "a$addr")
+        redis_conn.publish(INVALIDATE_CHANNEL, "|lsep|b")
+        wait_for(lambda: local.get_many("a", "b", "c") == {"c": 2})
+    finally:
+        listener.stop()
+
+
+def test_tracking_validation(redis_conn):
+    with pytest.raises(InvalidFormatError):
+        InvalidationListener(redis_conn, LocalCache(), "other")
+    with pytest.raises(InvalidFormatError):
+        InvalidationListener(
+            redis_conn, LocalCache(), "default", prefixes=["a"])